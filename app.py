@@ -3,7 +3,8 @@ import sys
 import streamlit as st
 from dotenv import load_dotenv
 import re
-import time
+import queue
+import threading
 
 # Load environment variables
 load_dotenv()
@@ -14,11 +15,17 @@ sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "src")))
 
 
 try:
-    from fact_checker.crew import FactChecker
+    from fact_checker.warm import fact_check
+    from fact_checker.service import ServiceClient
+    from fact_checker.documents import open_document
+    from fact_checker.progress import TASK_FINISHED, RunProgress, listen
 except ImportError as e:
     st.error(f"Could not import FactChecker: {e}")
     st.stop()
 
+# When set, analyses are submitted to the job API instead of run in-process
+API_URL = os.getenv("FACT_CHECKER_API_URL")
+
 # Page configuration
 st.set_page_config(
     page_title="VERIFACT - AI Truth-O-Meter",
@@ -442,6 +449,40 @@ div[role="radiogroup"] div:has(input:checked) label {
 """, unsafe_allow_html=True)
 
 
+# Task outputs shown as soon as they are ready, before the final verdict
+PARTIAL_RESULTS = {
+    'research_task': "🔎 Research findings",
+    'content_analysis_task': "🧠 Claims identified",
+}
+
+
+def run_with_progress(input_content, progress_bar, partial_area):
+    """Run the check on a worker thread, driving the UI from its progress events"""
+    events = queue.Queue()
+    outcome = {}
+
+    def work():
+        with listen(events.put):
+            try:
+                outcome['result'] = fact_check(input_content)
+            except Exception as e:
+                outcome['error'] = e
+        events.put(None)
+
+    threading.Thread(target=work, name="fact-check", daemon=True).start()
+    tracker = RunProgress()
+    progress_bar.progress(tracker.percent, text=tracker.status)
+    while (event := events.get()) is not None:
+        percent, text = tracker.update(event)
+        progress_bar.progress(percent, text=text)
+        if event.kind == TASK_FINISHED and event.label in PARTIAL_RESULTS and event.detail:
+            with partial_area.expander(PARTIAL_RESULTS[event.label], expanded=False):
+                st.markdown(event.detail)
+    if 'error' in outcome:
+        raise outcome['error']
+    return outcome['result']
+
+
 # Function to determine verdict based on analysis
 def determine_verdict(result_text):
     """Determine the verdict based on the analysis result"""
@@ -474,8 +515,8 @@ st.markdown("""
 </div>
 """, unsafe_allow_html=True)
 
-# Environment check
-if not os.getenv("OPENAI_API_KEY"):
+# Environment check (the job API holds the keys in thin-client mode)
+if not API_URL and not os.getenv("OPENAI_API_KEY"):
     st.error("⚠️ **Configuration Error:** Please set your OPENAI_API_KEY in the .env file")
     st.stop()
 
@@ -571,70 +612,51 @@ if analyze_button:
 
     # Enhanced processing indicator
     with st.spinner("🔍 **VERIFACT Analysis in Progress** - Multi-agent AI system working..."):
-        # Progress bar
+        # Progress bar, driven by the crew's own task and tool events
         progress_bar = st.progress(0)
         status_text = st.empty()
-
-        # Simulate realistic progress
-        progress_bar.progress(10, text="🤖 Initializing AI agents...")
-        time.sleep(0.5)
-
-        progress_bar.progress(25, text="📊 Processing input content...")
-        time.sleep(0.3)
+        partial_area = st.container()
 
         input_content = ""
+        document = None
 
-        # Enhanced file processing
+        # Enhanced file processing: a PDF's pages are extracted as the check reads them
         if uploaded_file:
-            progress_bar.progress(40, text="📄 Extracting document content...")
-            from pathlib import Path
-
-            suffix = Path(uploaded_file.name).suffix.lower()
+            progress_bar.progress(2, text="📄 Extracting document content...")
             try:
-                if suffix == ".pdf":
-                    import PyPDF2
-
-                    reader = PyPDF2.PdfReader(uploaded_file)
-                    input_content = "".join([page.extract_text() for page in reader.pages])
-                elif suffix == ".docx":
-                    from docx import Document
-
-                    doc = Document(uploaded_file)
-                    input_content = "\n".join([p.text for p in doc.paragraphs])
-                elif suffix == ".txt":
-                    raw = uploaded_file.read()
-                    for enc in ["utf-8", "utf-16", "latin-1", "cp1252"]:
-                        try:
-                            input_content = raw.decode(enc)
-                            break
-                        except UnicodeDecodeError:
-                            continue
-                    else:
-                        st.error(
-                            "❌ **File Processing Error:** Unable to decode text file. Please ensure UTF-8 encoding.")
-                        st.stop()
+                document, input_content = open_document(uploaded_file, uploaded_file.name)
             except Exception as e:
                 st.error(f"❌ **File Processing Error:** {e}")
                 st.stop()
         else:
             input_content = claim or url or youtube_url
 
-        progress_bar.progress(60, text="🧠 Running multi-agent analysis...")
-        time.sleep(0.5)
-
         # Run analysis
         try:
-            progress_bar.progress(80, text="🔍 Cross-referencing sources...")
-            checker = FactChecker()
-            result = checker.crew().kickoff(inputs={"input_content": input_content})
+            if API_URL:
+                # Thin client: the job API's workers run the crew, and take the text whole
+                if document is not None:
+                    input_content = "\n".join(input_content)
+                client = ServiceClient(API_URL)
+                progress_bar.progress(5, text="📨 Submitted to the fact-check service...")
+                result = client.wait(
+                    client.submit(input_content),
+                    on_poll=lambda job: status_text.caption(f"⏳ Job {job['status']}..."),
+                )["report"]
+            else:
+                result = run_with_progress(input_content, progress_bar, partial_area)
             progress_bar.progress(100, text="✅ Analysis complete!")
-            time.sleep(0.3)
             progress_bar.empty()
             status_text.empty()
         except Exception as e:
             st.error(f"❌ **Analysis Error:** {e}")
             st.stop()
 
+        if document is not None and document.truncated:
+            st.warning(f"✂️ **Long Document:** {document.notice}")
+        if document is not None and document.unreadable:
+            st.warning(f"⚠️ **Unreadable Pages:** {document.unreadable_notice}")
+
     # Success notification with confetti
     # Professional success notification
     st.markdown(f"""
@@ -0,0 +1,53 @@
+"""Tokens handed to verification_task with and without context compaction.
+
+Builds a research report from ``html_corpus`` article paragraphs plus
+source URLs. The analysis report restates a share of those paragraphs
+(``--overlap``) and adds claim lines. Then it measures the verifier's
+context as crewai would join it, raw and compacted, at several sizes.
+The prompt tokens saved are what the verifier's LLM call stops paying
+for, in both cost and time to first token.
+
+    python benchmarks/bench_context_compaction.py --budget 6000
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+sys.path.insert(0, os.path.dirname(__file__))
+
+from html_corpus import make_page  # noqa: E402
+from fact_checker.context import DIVIDER, compact_context, count_tokens  # noqa: E402
+
+
+def reports(paragraphs: int, overlap: float, seed: int):
+    rng = random.Random(seed)
+    _, article = make_page(seed, paragraphs=paragraphs)
+    research = "\n\n".join(f"{p} (source: https://news.example/{seed}/{i})" for i, p in enumerate(article))
+    restated = [p for p in article if rng.random() < overlap]
+    claims = "\n".join(f"{i}. {p.split('.')[0]}." for i, p in enumerate(restated[:15], 1))
+    analysis = f"Claims identified:\n{claims}\n\nSupporting evidence:\n\n" + "\n\n".join(restated)
+    return research, analysis
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--budget", type=int, default=6000)
+    parser.add_argument("--overlap", type=float, default=0.6)
+    args = parser.parse_args()
+
+    print(f"{'paragraphs':>10}{'raw tokens':>12}{'compacted':>11}{'saved':>8}{'dupes':>7}{'trimmed':>9}{'ms':>8}")
+    for paragraphs in (20, 60, 150, 400):
+        research, analysis = reports(paragraphs, args.overlap, seed=paragraphs)
+        context = DIVIDER.join([research, analysis])
+        start = time.perf_counter()
+        compacted, dropped, trimmed = compact_context(context, args.budget, "make final fact-check determinations")
+        elapsed = (time.perf_counter() - start) * 1000
+        raw, out = count_tokens(context), count_tokens(compacted)
+        print(f"{paragraphs:>10}{raw:>12}{out:>11}{1 - out / raw:>8.0%}{dropped:>7}{trimmed:>9}{elapsed:>8.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,52 @@
+"""Per-request crew setup overhead: rebuild every time vs. warm template copy.
+
+Measures only construction (no LLM calls are made), so it runs offline.
+A placeholder OPENAI_API_KEY is set if none is present because FactChecker
+refuses to build without one.
+
+    python benchmarks/bench_crew_setup.py --runs 50
+"""
+import argparse
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+os.environ.setdefault("OPENAI_API_KEY", "sk-offline-benchmark")
+
+from fact_checker.crew import FactChecker  # noqa: E402
+from fact_checker.warm import CrewTemplate  # noqa: E402
+
+
+def timed(fn, runs):
+    samples = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    return samples
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=50)
+    args = parser.parse_args()
+
+    FactChecker().crew()  # import-time and first-use costs out of the way
+    cold = timed(lambda: FactChecker().crew(), args.runs)
+
+    start = time.perf_counter()
+    template = CrewTemplate()
+    build_ms = (time.perf_counter() - start) * 1000
+    warm = timed(template.new_crew, args.runs)
+
+    print(f"{'path':<24}{'median ms':>12}{'p95 ms':>10}")
+    for label, samples in (("FactChecker().crew()", cold), ("template.new_crew()", warm)):
+        p95 = sorted(samples)[int(len(samples) * 0.95) - 1]
+        print(f"{label:<24}{statistics.median(samples):>12.2f}{p95:>10.2f}")
+    print(f"one-off template build: {build_ms:.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,160 @@
+"""PDF extraction throughput and peak memory, old join versus ``documents``.
+
+Inputs are the sample verdict PDFs at the repository root, a long scan
+made of their pages repeated to ``--pages`` pages, and a generated
+text-heavy report of ``--pages`` pages. Every measurement runs in a fresh
+subprocess so peak RSS belongs to that run alone. Memory is reported as the growth of the process's
+peak RSS over its peak after imports (which include CrewAI, through the
+pipeline module), and as the largest extraction worker's peak (read from
+``/proc``, so Linux only).
+
+- ``join``: ``"".join(page.extract_text() for page in reader.pages)``, as
+  the apps did
+- ``stream``: ``documents.iter_pdf_pages`` consumed by
+  ``pipeline.iter_segments``, never holding the whole text
+- ``read wN``: ``documents.read_document`` with N extraction workers
+
+    python benchmarks/bench_documents.py --pages 500 --workers 1 2 4
+"""
+import argparse
+import glob
+import json
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+ROOT = os.path.join(os.path.dirname(__file__), "..")
+SENTENCE = ("In {year} the ministry reported that spending on public transport rose by {pct} percent, "
+            "while the number of passengers grew to {n} million according to the annual survey. ")
+
+
+def text_pdf(path, pages, lines=45):
+    """Write a ``pages``-page PDF of plain Helvetica text lines."""
+    objects = ["<< /Type /Catalog /Pages 2 0 R >>", None, "<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>"]
+    kids = []
+    for page in range(pages):
+        rows = []
+        for line in range(lines):
+            sentence = SENTENCE.format(year=1990 + (page + line) % 35, pct=(page * 7 + line) % 90, n=page + line)
+            rows.append(f"BT /F1 9 Tf 40 {760 - line * 16} Td ({sentence[:110]}) Tj ET")
+        stream = "\n".join(rows)
+        objects.append(f"<< /Length {len(stream)} >>\nstream\n{stream}\nendstream")
+        objects.append(f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] "
+                       f"/Resources << /Font << /F1 3 0 R >> >> /Contents {len(objects)} 0 R >>")
+        kids.append(f"{len(objects)} 0 R")
+    objects[1] = f"<< /Type /Pages /Kids [{' '.join(kids)}] /Count {pages} >>"
+    out, offsets = bytearray(b"%PDF-1.4\n"), []
+    for number, body in enumerate(objects, 1):
+        offsets.append(len(out))
+        out += f"{number} 0 obj\n{body}\nendobj\n".encode("latin-1")
+    xref = len(out)
+    out += f"xref\n0 {len(objects) + 1}\n0000000000 65535 f \n".encode()
+    out += "".join(f"{offset:010d} 00000 n \n" for offset in offsets).encode()
+    out += f"trailer\n<< /Size {len(objects) + 1} /Root 1 0 R >>\nstartxref\n{xref}\n%%EOF\n".encode()
+    with open(path, "wb") as handle:
+        handle.write(out)
+
+
+def repeated_pdf(path, sources, pages):
+    """Write a ``pages``-page PDF cycling through the pages of ``sources``."""
+    from fact_checker.documents import _pdf_reader
+
+    try:
+        from pypdf import PdfWriter
+    except ImportError:
+        from PyPDF2 import PdfWriter
+    originals = [page for source in sources for page in _pdf_reader(source).pages]
+    writer = PdfWriter()
+    for i in range(pages):
+        writer.add_page(originals[i % len(originals)])
+    with open(path, "wb") as handle:
+        writer.write(handle)
+
+
+def worker_peak_mb(documents):
+    peaks = [0]
+    for pid in [pid for pool in documents._pools.values() for pid in pool._processes or {}]:
+        try:
+            with open(f"/proc/{pid}/status") as status:
+                peaks += [int(line.split()[1]) for line in status if line.startswith("VmHWM:")]
+        except OSError:
+            pass
+    return max(peaks) / 1024
+
+
+def measure(mode, path):
+    """Run in a subprocess: extract ``path`` one way and print a JSON result."""
+    from fact_checker import documents
+    from fact_checker.pipeline import iter_segments
+
+    baseline = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    start = time.perf_counter()
+    if mode == "join":
+        reader = documents._pdf_reader(path)
+        pages = len(reader.pages)
+        chars = len("".join([page.extract_text() for page in reader.pages]))
+    elif mode == "stream":
+        pages = chars = 0
+
+        def texts():
+            nonlocal pages
+            for pages, text in documents.iter_pdf_pages(path, workers=1):
+                yield text or ""
+
+        for segment in iter_segments(texts()):
+            chars += len(segment)
+    else:
+        os.environ["FACT_CHECKER_DOC_MAX_MB"] = "100000"
+        os.environ["FACT_CHECKER_DOC_MAX_PAGES"] = "1000000"
+        os.environ["FACT_CHECKER_DOC_MAX_CHARS"] = str(10 ** 10)
+        document = documents.read_document(path, workers=int(mode[len("read w"):]))
+        pages, chars = document.pages, len(document.text)
+    elapsed = time.perf_counter() - start
+    growth = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss - baseline
+    print(json.dumps({"pages": pages, "chars": chars, "seconds": elapsed,
+                      "growth_mb": growth / 1024, "worker_mb": worker_peak_mb(documents)}))
+
+
+def run(mode, path):
+    done = subprocess.run([sys.executable, __file__, "--measure", mode, path], capture_output=True, text=True)
+    if done.returncode:
+        raise RuntimeError(f"{mode} on {path} failed:\n{done.stderr}")
+    return json.loads(done.stdout.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--pages", type=int, default=200)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4])
+    parser.add_argument("--measure", nargs=2, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    if args.measure:
+        measure(*args.measure)
+        return
+
+    samples = sorted(glob.glob(os.path.join(ROOT, "*_verdict.pdf")))
+    work = tempfile.mkdtemp(prefix="documents-bench-")
+    scan, report = os.path.join(work, "scan.pdf"), os.path.join(work, "report.pdf")
+    repeated_pdf(scan, samples, args.pages)
+    text_pdf(report, args.pages)
+    inputs = [(os.path.basename(path), path) for path in samples]
+    inputs += [(f"samples x{args.pages} pages", scan), (f"text report {args.pages} pages", report)]
+    modes = ["join", "stream"] + [f"read w{n}" for n in args.workers]
+
+    print(f"{os.cpu_count()} CPUs")
+    print(f"{'input':<28}{'mode':<10}{'pages':>7}{'chars':>11}{'pages/s':>10}{'RSS +MB':>9}{'worker MB':>11}")
+    for label, path in inputs:
+        for mode in modes:
+            result = run(mode, path)
+            print(f"{label:<28}{mode:<10}{result['pages']:>7}{result['chars']:>11,}"
+                  f"{result['pages'] / result['seconds']:>10.1f}{result['growth_mb']:>9.0f}"
+                  f"{result['worker_mb']:>11.0f}")
+
+
+if __name__ == "__main__":
+    main()
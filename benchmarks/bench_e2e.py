@@ -0,0 +1,460 @@
+"""Offline end-to-end benchmark of the real FactChecker crew.
+
+Runs ``warm.fact_check`` over a fixed corpus with one input of each kind:
+a plain claim, a claim with figures, a web page, a YouTube video and a
+long document. Everything runs against local stand-ins, so a run costs
+nothing and has no network noise:
+
+- ``stub_llm_server`` plays every agent from a script. Agents call their
+  tools in ReAct steps and then answer. Structured steps get JSON.
+- ``stub_serper_server`` answers searches. It is used when the search
+  tool is available.
+- ``fixture_server`` serves the pages that routing and the Web Scraping
+  Tool fetch.
+- The video's transcript is seeded into the transcript cache, so the
+  YouTube Transcript Tool never calls YouTube.
+
+For each input it reports:
+
+- wall time
+- time per stage (routing/setup, then each crew task)
+- tool calls and tool time
+- LLM, search and page requests
+- bytes fetched
+- peak memory
+
+``--json`` writes the results as JSON. ``--compare`` checks a run
+against a saved one and exits 1 on a regression. Caches start empty in a
+temporary directory, so the first pass is cold. ``--passes 2`` adds a
+warm pass.
+
+    python benchmarks/bench_e2e.py --json e2e_base.json
+    python benchmarks/bench_e2e.py --compare e2e_base.json --threshold 0.15
+    python benchmarks/bench_e2e.py --load e2e_new.json --compare e2e_base.json
+"""
+import argparse
+import contextlib
+import hashlib
+import io
+import json
+import os
+import platform
+import re
+import resource
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import tracemalloc
+from collections import defaultdict
+from typing import Dict, List, Optional
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+sys.path.insert(0, os.path.dirname(__file__))
+
+from fixture_server import FixtureServer, article_text  # noqa: E402
+from html_corpus import WORDS  # noqa: E402
+from stub_llm_server import StubLLMServer  # noqa: E402
+from stub_serper_server import StubSerperServer  # noqa: E402
+
+VIDEO_ID = "benchvideo01"
+FINAL = "Thought: I now know the final answer\nFinal Answer: {answer}"
+ACTION = "Thought: I need more evidence\nAction: {tool}\nAction Input: {args}"
+JSON_FORMAT = "Ensure your final answer contains only the content in the following format"
+_OFFERED_TOOLS = re.compile(r"only one name of \[(.*?)\]")
+_CORPUS_SENTENCE = re.compile(r"[A-Z][a-z]+(?: [a-z]+){6,}\.")
+_VOCABULARY = set(WORDS)
+
+# Prompt markers of each task in config/tasks.yaml.
+RESEARCH = "Research the given claim or content:"
+ANALYSIS = "Analyze the content and research findings"
+VERIFICATION = "make final fact-check determinations"
+EXTRACTION = "Extract the specific, verifiable factual claims"
+CLAIM_VERIFICATION = "determination for this single claim"
+
+
+def transcript_segments(minutes: int = 20, seed: int = 0) -> List[dict]:
+    """A deterministic transcript of corpus sentences, one every four seconds."""
+    text = " ".join(article_text(seed + i) for i in range(6)).split(". ")
+    return [
+        {"text": text[i % len(text)].strip() + ".", "start": i * 4.0, "duration": 4.0}
+        for i in range(minutes * 15)
+    ]
+
+
+def document_text(pages: int = 4) -> str:
+    """A long uploaded document: enough text to take the chunked path."""
+    return "\n\n".join(article_text(1000 + i) for i in range(pages))
+
+
+def build_corpus(fixtures: FixtureServer) -> List[tuple]:
+    return [
+        ("text", "The Great Wall of China is visible from space with the naked eye."),
+        ("text_figures", "The Eiffel Tower is 330 metres tall and was completed in 1889."),
+        ("url", fixtures.url(7)),
+        ("youtube", f"https://www.youtube.com/watch?v={VIDEO_ID}"),
+        ("document", document_text()),
+    ]
+
+
+class ScriptedAgents:
+    """``StubLLMServer`` responder that plays all five crewai tasks.
+
+    The reply depends only on the prompt, so runs are reproducible. Each
+    agent takes the tool steps of its plan that it was offered, one per
+    turn. Then it gives a final answer built from the prompt and what
+    the tools returned.
+    """
+
+    def __init__(self, fixtures: FixtureServer, excerpt_chars: int = 1500):
+        self.fixtures = fixtures
+        self.excerpt_chars = excerpt_chars
+
+    def __call__(self, model: str, messages: list) -> str:
+        system = next((m.get("content") or "" for m in messages if m.get("role") == "system"), "")
+        prompt = "\n".join(str(m.get("content") or "") for m in messages if m.get("role") == "user")
+        # The fixture port changes per run; keep it out of anything hashed.
+        prompt = prompt.replace(self.fixtures.base_url, "http://fixtures.invalid")
+        observations = [str(m.get("content") or "") for m in messages if m.get("role") == "assistant"]
+        offered = _OFFERED_TOOLS.search(system)
+        tools = [t.strip() for t in offered.group(1).split(",")] if offered else []
+
+        plan = self._plan(prompt, tools)
+        if len(observations) < len(plan):
+            tool, args = plan[len(observations)]
+            return ACTION.format(tool=tool, args=json.dumps(args))
+        return FINAL.format(answer=self._answer(prompt, observations))
+
+    def _plan(self, prompt: str, tools: List[str]) -> List[tuple]:
+        search = next((t for t in tools if "search" in t.lower()), None)
+        plan = []
+        if RESEARCH in prompt:
+            claim = prompt.split(RESEARCH, 1)[1].strip().split("\n", 1)[0][:120]
+            if search:
+                # One batched call: two phrasings, best two pages read.
+                plan.append((search, {"queries": [claim, f"{claim} evidence"], "fetch_top": 2, "claim": claim}))
+            if "YouTube Transcript Tool" in tools and "youtube.com/watch" in prompt:
+                plan.append(("YouTube Transcript Tool", {
+                    "youtube_url": f"https://www.youtube.com/watch?v={VIDEO_ID}", "query": claim}))
+            if "Web Scraping Tool" in tools and not search:
+                seed = _seed(claim)
+                plan.append(("Web Scraping Tool", {
+                    "urls": [self.fixtures.url(seed % 50), self.fixtures.url((seed + 1) % 50)],
+                    "claim": claim}))
+        elif (VERIFICATION in prompt or CLAIM_VERIFICATION in prompt) and search:
+            plan.append((search, {"search_query": _claims(prompt, 1)[0] if _claims(prompt, 1) else "claim"}))
+        return plan
+
+    def _answer(self, prompt: str, observations: List[str]) -> str:
+        structured = JSON_FORMAT in prompt
+        if EXTRACTION in prompt:
+            return json.dumps({"claims": _claims(prompt.split(EXTRACTION, 1)[1], 8)})
+        if CLAIM_VERIFICATION in prompt:
+            claim = (_claims(prompt, 1) or ["the claim"])[0]
+            return json.dumps({"claim": claim, "verdict": _verdict(claim), "confidence": "Medium",
+                               "explanation": "Scripted verdict.", "sources": [self.fixtures.url(_seed(claim) % 50)]})
+        if ANALYSIS in prompt:
+            claims = _claims(prompt, 6)
+            if structured:
+                return json.dumps({"claims": [{"claim": c, "context": "", "evidence": ""} for c in claims]})
+            return "Claims identified:\n" + "\n".join(f"Claim: {c}" for c in claims)
+        if VERIFICATION in prompt:
+            claims = _claims(prompt, 6)
+            return "\n\n".join(f"Claim {i}: {c}\nVerdict: {_verdict(c)}\nExplanation: Scripted verdict."
+                               for i, c in enumerate(claims, 1)) or "Verdict: UNVERIFIABLE"
+        if RESEARCH in prompt:
+            claim = prompt.split(RESEARCH, 1)[1].strip().split("\n", 1)[0][:200]
+            evidence = "\n\n".join(obs.split("Observation:", 1)[-1].strip()[:self.excerpt_chars]
+                                   for obs in observations)
+            return f"Claim: {claim}\n\nEvidence gathered:\n\n{evidence}"
+        return "Scripted answer."
+
+
+def _seed(text: str) -> int:
+    return int(hashlib.sha1(text.encode("utf-8")).hexdigest()[:8], 16)
+
+
+def _verdict(claim: str) -> str:
+    return ("TRUE", "FALSE", "MISLEADING")[_seed(claim) % 3]
+
+
+def _claims(text: str, limit: int) -> List[str]:
+    """Claims an agent would pick from ``text``: ``Claim:`` lines, then corpus sentences."""
+    found = [line.split("Claim:", 1)[1].strip() for line in text.splitlines() if "Claim:" in line]
+    found += [s for s in _CORPUS_SENTENCE.findall(text) if set(s.lower().rstrip(".").split()) <= _VOCABULARY]
+    seen, claims = set(), []
+    for claim in found:
+        if claim and claim not in seen:
+            seen.add(claim)
+            claims.append(claim)
+    return claims[:limit]
+
+
+class Recorder:
+    """Collects crewai task and tool events for the input being run."""
+
+    def __init__(self, stage_prefixes: Dict[str, str]):
+        self.stage_prefixes = stage_prefixes
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        self.first_task: Optional[float] = None
+        self.started: Dict[int, float] = {}
+        self.stages = defaultdict(lambda: {"count": 0, "seconds": 0.0})
+        self.tools = defaultdict(lambda: {"calls": 0, "errors": 0, "seconds": 0.0})
+
+    def stage(self, task) -> str:
+        description = (getattr(task, "description", "") or "").strip()
+        for name, prefix in self.stage_prefixes.items():
+            if description.startswith(prefix):
+                return name
+        return getattr(task, "name", None) or "other"
+
+    def task_started(self, source, event):
+        with self._lock:
+            now = time.perf_counter()
+            self.first_task = self.first_task or now
+            self.started[id(event.task or source)] = now
+
+    def task_finished(self, source, event):
+        task = event.task or source
+        with self._lock:
+            started = self.started.pop(id(task), None)
+            if started is not None:
+                stage = self.stages[self.stage(task)]
+                stage["count"] += 1
+                stage["seconds"] += time.perf_counter() - started
+
+    def tool_finished(self, source, event):
+        with self._lock:
+            tool = self.tools[event.tool_name]
+            tool["calls"] += 1
+            tool["seconds"] += (event.finished_at - event.started_at).total_seconds()
+
+    def tool_failed(self, source, event):
+        with self._lock:
+            self.tools[event.tool_name]["errors"] += 1
+
+
+def _install(recorder: Recorder):
+    from crewai.utilities.events import (
+        TaskCompletedEvent, TaskFailedEvent, TaskStartedEvent, ToolUsageErrorEvent,
+        ToolUsageFinishedEvent, crewai_event_bus,
+    )
+
+    crewai_event_bus.register_handler(TaskStartedEvent, recorder.task_started)
+    crewai_event_bus.register_handler(TaskCompletedEvent, recorder.task_finished)
+    crewai_event_bus.register_handler(TaskFailedEvent, recorder.task_finished)
+    crewai_event_bus.register_handler(ToolUsageFinishedEvent, recorder.tool_finished)
+    crewai_event_bus.register_handler(ToolUsageErrorEvent, recorder.tool_failed)
+
+
+def _stage_prefixes() -> Dict[str, str]:
+    import yaml
+
+    path = os.path.join(os.path.dirname(__file__), "..", "src", "fact_checker", "config", "tasks.yaml")
+    with open(path, encoding="utf-8") as f:
+        tasks = yaml.safe_load(f)
+    # Text before the first placeholder survives interpolation.
+    return {name: task["description"].split("{", 1)[0].strip()[:60] for name, task in tasks.items()}
+
+
+def _peak_rss_mb() -> float:
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def run_input(kind: str, content: str, recorder: Recorder, servers: dict, trace_memory: bool,
+              verbose: bool) -> dict:
+    from fact_checker.tools import http_client
+    from fact_checker.warm import fact_check
+
+    llm, serper, fixtures = servers["llm"], servers["serper"], servers["fixtures"]
+    before = (llm.calls, serper.calls, fixtures.requests, http_client.stats()["bytes_received"])
+    recorder.reset()
+    if trace_memory:
+        tracemalloc.reset_peak()
+    error = None
+    start = time.perf_counter()
+    sink = contextlib.nullcontext() if verbose else contextlib.redirect_stdout(io.StringIO())
+    try:
+        with sink:
+            fact_check(content)
+    except Exception as e:
+        error = f"{type(e).__name__}: {e}"
+    wall = time.perf_counter() - start
+
+    stages = {"route+setup": {"count": 1, "seconds": (recorder.first_task or start + wall) - start}}
+    stages.update(recorder.stages)
+    result = {
+        "kind": kind,
+        "wall_s": round(wall, 4),
+        "stages": {name: {"count": s["count"], "seconds": round(s["seconds"], 4)} for name, s in stages.items()},
+        "tools": {name: {k: round(v, 4) if isinstance(v, float) else v for k, v in t.items()}
+                  for name, t in recorder.tools.items()},
+        "tool_calls": sum(t["calls"] for t in recorder.tools.values()),
+        "llm_calls": llm.calls - before[0],
+        "search_calls": serper.calls - before[1],
+        "pages_fetched": fixtures.requests - before[2],
+        "bytes_fetched": http_client.stats()["bytes_received"] - before[3],
+    }
+    if trace_memory:
+        result["heap_peak_mb"] = round(tracemalloc.get_traced_memory()[1] / 1e6, 2)
+    if error:
+        result["error"] = error
+    return result
+
+
+def _git_commit() -> Optional[str]:
+    try:
+        return subprocess.check_output(["git", "rev-parse", "--short", "HEAD"], text=True,
+                                       cwd=os.path.dirname(os.path.abspath(__file__)),
+                                       stderr=subprocess.DEVNULL).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run(args) -> dict:
+    cache_dir = tempfile.mkdtemp(prefix="fact_checker_e2e_")
+    fixtures = FixtureServer(latency=args.fetch_latency).start()
+    serper = StubSerperServer(latency=args.search_latency, link_base=fixtures.base_url).start()
+    llm = StubLLMServer(latency=args.llm_latency, responder=ScriptedAgents(fixtures)).start()
+    os.environ.update({
+        "FACT_CHECKER_CACHE_DIR": cache_dir,
+        "FACT_CHECKER_LLM_BASE_URL": llm.base_url,
+        "FACT_CHECKER_SERPER_URL": serper.base_url,
+        "FACT_CHECKER_VERIFY_MODE": args.mode,
+        "OPENAI_API_KEY": os.environ.get("OPENAI_API_KEY") or "sk-offline-benchmark",
+        "SERPER_API_KEY": os.environ.get("SERPER_API_KEY") or "offline-benchmark",
+    })
+    # Routing never leaves the machine: the video is already "cached".
+    from fact_checker.tools.youtube_tool import transcript_cache
+    transcript_cache().put(VIDEO_ID, json.dumps(transcript_segments()),
+                           meta={"language": "en", "fetched_at": time.time()})
+
+    recorder = Recorder(_stage_prefixes())
+    _install(recorder)
+    from fact_checker.warm import get_template
+
+    servers = {"llm": llm, "serper": serper, "fixtures": fixtures}
+    setup = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        template = get_template()
+        # The first completion pays for litellm's lazy imports; keep that
+        # out of whichever input happens to run first.
+        template.checker._llm('content_analyzer').call([{"role": "user", "content": "warm up"}])
+    setup = time.perf_counter() - setup
+    if args.trace_memory:
+        tracemalloc.start()
+
+    passes = []
+    corpus = build_corpus(fixtures)
+    for n in range(args.passes):
+        inputs = {}
+        for kind, content in corpus:
+            inputs[kind] = run_input(kind, content, recorder, servers, args.trace_memory, args.verbose)
+        passes.append({"pass": n + 1, "inputs": inputs,
+                       "wall_s": round(sum(r["wall_s"] for r in inputs.values()), 4)})
+    return {
+        "meta": {
+            "commit": _git_commit(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "mode": args.mode,
+            "search_tool": template.checker.search_tool is not None,
+            "latency": {"llm": args.llm_latency, "search": args.search_latency, "fetch": args.fetch_latency},
+        },
+        "template_setup_s": round(setup, 4),
+        "passes": passes,
+        "peak_rss_mb": round(_peak_rss_mb(), 1),
+    }
+
+
+def report(results: dict):
+    meta = results["meta"]
+    print(f"commit {meta['commit'] or '?'}, mode {meta['mode']}, search tool "
+          f"{'on' if meta['search_tool'] else 'unavailable'}, template setup and warm-up "
+          f"{results['template_setup_s']:.2f}s")
+    for p in results["passes"]:
+        print(f"\npass {p['pass']} ({'cold' if p['pass'] == 1 else 'warm'} caches): {p['wall_s']:.2f}s")
+        print(f"{'input':<14}{'wall s':>8}{'llm':>6}{'tools':>7}{'search':>8}{'pages':>7}{'KB':>9}"
+              f"{'heap MB':>9}  stages")
+        for kind, r in p["inputs"].items():
+            stages = ", ".join(f"{name} {s['seconds']:.2f}s" + (f"×{s['count']}" if s["count"] > 1 else "")
+                               for name, s in r["stages"].items())
+            heap = f"{r['heap_peak_mb']:>9.1f}" if "heap_peak_mb" in r else f"{'-':>9}"
+            print(f"{kind:<14}{r['wall_s']:>8.2f}{r['llm_calls']:>6}{r['tool_calls']:>7}{r['search_calls']:>8}"
+                  f"{r['pages_fetched']:>7}{r['bytes_fetched'] / 1024:>9.0f}{heap}  {stages}")
+            if r.get("error"):
+                print(f"{'':<14}❌ {r['error']}")
+    print(f"\npeak RSS {results['peak_rss_mb']:.0f} MB")
+
+
+COUNTERS = ("llm_calls", "tool_calls", "search_calls", "pages_fetched", "bytes_fetched")
+
+
+def compare(base: dict, new: dict, threshold: float) -> int:
+    """Print per-input deltas; return how many metrics regressed."""
+    regressions = 0
+    print(f"\ncompare {base['meta']['commit'] or '?'} → {new['meta']['commit'] or '?'} "
+          f"(wall threshold {threshold:.0%})")
+    for old_pass, new_pass in zip(base["passes"], new["passes"]):
+        for kind, r in new_pass["inputs"].items():
+            old = old_pass["inputs"].get(kind)
+            if old is None:
+                continue
+            change = (r["wall_s"] - old["wall_s"]) / old["wall_s"] if old["wall_s"] else 0.0
+            flags = []
+            if change > threshold:
+                flags.append("wall")
+            flags += [name for name in COUNTERS if r.get(name, 0) > old.get(name, 0)]
+            if old.get("heap_peak_mb") and r.get("heap_peak_mb", 0) > old["heap_peak_mb"] * (1 + threshold):
+                flags.append("heap")
+            if r.get("error") and not old.get("error"):
+                flags.append("error")
+            regressions += len(flags)
+            counts = " ".join(f"{name.split('_')[0]} {old.get(name, 0)}→{r.get(name, 0)}"
+                              for name in COUNTERS if r.get(name, 0) != old.get(name, 0))
+            print(f"pass {new_pass['pass']} {kind:<14}{old['wall_s']:>7.2f}s → {r['wall_s']:>6.2f}s "
+                  f"({change:+.0%}) {counts}{'  ⚠️ ' + ', '.join(flags) if flags else ''}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--llm-latency", type=float, default=0.2, help="stub seconds per completion")
+    parser.add_argument("--search-latency", type=float, default=0.15, help="stub seconds per search")
+    parser.add_argument("--fetch-latency", type=float, default=0.05, help="fixture seconds per page")
+    parser.add_argument("--mode", choices=("sequential", "fanout"), default="sequential",
+                        help="FACT_CHECKER_VERIFY_MODE for the run")
+    parser.add_argument("--passes", type=int, default=1, help="corpus passes; later ones run on warm caches")
+    parser.add_argument("--trace-memory", action="store_true",
+                        help="per-input Python heap peaks via tracemalloc (slows the run)")
+    parser.add_argument("--verbose", action="store_true", help="show the crew's own output")
+    parser.add_argument("--json", metavar="FILE", help="write the results here")
+    parser.add_argument("--load", metavar="FILE", help="report saved results instead of running")
+    parser.add_argument("--compare", metavar="BASELINE", help="saved results to compare against")
+    parser.add_argument("--threshold", type=float, default=0.15, help="wall/heap growth counted as a regression")
+    args = parser.parse_args()
+
+    if args.load:
+        with open(args.load, encoding="utf-8") as f:
+            results = json.load(f)
+    else:
+        results = run(args)
+    report(results)
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            baseline = json.load(f)
+        if compare(baseline, results, args.threshold):
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
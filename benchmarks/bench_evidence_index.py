@@ -0,0 +1,119 @@
+"""Evidence index ingestion throughput, size on disk and query latency.
+
+Feeds ``--passages`` synthetic passages through ``EvidenceIndex.add`` as
+pages of ``--per-page`` passages. Words are drawn from a Zipf-distributed
+vocabulary, so common terms have long postings lists as they do in real
+text. It reports:
+
+- ingestion rate, including flushes and merges
+- the index's size on disk and bytes per posting
+- the time to reopen the index
+- query latency for queries taken from a stored passage (reporting
+  recall@1) and for queries made only of frequent words (the worst case)
+
+    python benchmarks/bench_evidence_index.py --passages 2000000
+"""
+import argparse
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from fact_checker.tools.evidence_index import EvidenceIndex  # noqa: E402
+from fact_checker.tools.relevance import tokenize  # noqa: E402
+
+SYLLABLES = ["ka", "lo", "mi", "ser", "tan", "vu", "re", "po", "lin", "da", "qu", "an", "tor", "bel", "us", "ne"]
+
+
+def vocabulary(size, rng):
+    words = set()
+    while len(words) < size:
+        words.add("".join(rng.choice(SYLLABLES) for _ in range(rng.randint(2, 4))))
+    return sorted(words)
+
+
+def pages(count, per_page, words, seed):
+    """Yield ``(url, text)`` pages whose sentences are Zipf-sampled words."""
+    gen = np.random.default_rng(seed)
+    vocab = np.array(words, dtype=object)
+    for page in range(count):
+        # Wrap the unbounded tail instead of clipping it, so the last word
+        # isn't the most frequent one.
+        ids = (gen.zipf(1.2, size=per_page * 60) - 1) % len(words)
+        sentences = [" ".join(vocab[ids[i:i + 12]]).capitalize() + "." for i in range(0, len(ids), 12)]
+        yield f"https://example.org/{page}", " ".join(sentences)
+
+
+def timed(index, queries):
+    samples, results = [], []
+    for q in queries:
+        start = time.perf_counter()
+        results.append(index.search(q, k=5))
+        samples.append((time.perf_counter() - start) * 1000)
+    samples.sort()
+    return results, statistics.median(samples), samples[int(len(samples) * 0.95) - 1]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--passages", type=int, default=200_000)
+    parser.add_argument("--per-page", type=int, default=10)
+    parser.add_argument("--vocabulary", type=int, default=50_000)
+    parser.add_argument("--queries", type=int, default=500)
+    parser.add_argument("--flush-every", type=int, default=20_000)
+    args = parser.parse_args()
+    rng = random.Random(7)
+    root = tempfile.mkdtemp(prefix="evidence-bench-")
+    words = vocabulary(args.vocabulary, rng)
+
+    index = EvidenceIndex(root, flush_every=args.flush_every)
+    start = time.perf_counter()
+    chars = 0
+    for url, text in pages(args.passages // args.per_page, args.per_page, words, seed=7):
+        index.add(url, text)
+        chars += len(text)
+    index.flush()
+    ingest = time.perf_counter() - start
+    stats = index.stats()
+    postings = sum(len(segment.docs) for segment in index.segments)
+    print(f"ingested {stats['passages']:,} passages ({chars / 1e6:.0f} MB of text) in {ingest:.1f}s: "
+          f"{stats['passages'] / ingest:,.0f} passages/s, {chars / 1e6 / ingest:.1f} MB/s "
+          f"({stats['flushes']} flushes, {stats['merges']} merges, {stats['segments']} segments)")
+    size = index.size_bytes()
+    text_db = os.path.getsize(os.path.join(root, "passages.sqlite3"))
+    print(f"index {size / 1e6:.1f} MB for {postings:,} postings ({size / postings:.2f} bytes/posting); "
+          f"passage store {text_db / 1e6:.0f} MB")
+
+    start = time.perf_counter()
+    index = EvidenceIndex(root)
+    print(f"reopened (memory-mapped) in {(time.perf_counter() - start) * 1000:.1f} ms")
+
+    sampled_ids = rng.sample(range(1, stats["passages"] + 1), args.queries)
+    placeholders = ",".join("?" * len(sampled_ids))
+    rows = index._connect().execute(
+        f"SELECT id, text FROM passages WHERE id IN ({placeholders})", sampled_ids
+    ).fetchall()
+    rank = {word: i for i, word in enumerate(words)}
+    from_passage, expected = [], []
+    for passage_id, text in rows:
+        terms = sorted(set(tokenize(text)), key=lambda t: -rank.get(t, 0))
+        from_passage.append(" ".join(terms[:5]))
+        expected.append(passage_id)
+    frequent = [" ".join(rng.sample(words[:50], 4)) for _ in range(args.queries)]
+
+    print(f"\n{'queries':<28}{'recall@1':>10}{'p50 ms':>10}{'p95 ms':>10}")
+    results, p50, p95 = timed(index, from_passage)
+    recall = sum(bool(r) and r[0].passage_id == e for r, e in zip(results, expected)) / len(expected)
+    print(f"{'rare terms of one passage':<28}{recall:>10.2f}{p50:>10.2f}{p95:>10.2f}")
+    _, p50, p95 = timed(index, frequent)
+    print(f"{'four frequent terms':<28}{'-':>10}{p50:>10.2f}{p95:>10.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+"""Throughput and article-token share for each WebScrapingTool backend.
+
+Runs every extraction backend over a generated corpus of news-like pages
+(see ``html_corpus.py``) and reports pages/sec plus the share of output
+tokens that come from the article body rather than navigation, banners,
+related-link rails and footers.
+
+    python benchmarks/bench_extraction_backends.py --pages 200 --max-chars 5000
+"""
+import argparse
+import os
+import sys
+import time
+from collections import Counter
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+sys.path.insert(0, os.path.dirname(__file__))
+
+from html_corpus import make_page  # noqa: E402
+from fact_checker.tools.web_scraping_tool import EXTRACTION_BACKENDS  # noqa: E402
+
+
+def article_share(output: str, article: Counter) -> float:
+    tokens = output.lower().replace("...", " ").split()
+    if not tokens:
+        return 0.0
+    remaining = Counter(article)
+    matched = 0
+    for token in tokens:
+        if remaining[token] > 0:
+            remaining[token] -= 1
+            matched += 1
+    return matched / len(tokens)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--pages", type=int, default=200)
+    parser.add_argument("--max-chars", type=int, default=5000)
+    parser.add_argument("--max-bytes", type=int, default=2 * 1024 * 1024)
+    args = parser.parse_args()
+
+    corpus = []
+    for seed in range(args.pages):
+        html, paragraphs = make_page(seed, paragraphs=10 + seed % 40, clutter=10 + seed % 30)
+        corpus.append((html.encode("utf-8"), Counter(" ".join(paragraphs).lower().split())))
+
+    print(f"{'backend':<10}{'pages/s':>10}{'article share':>16}{'avg chars':>12}")
+    for name, backend in EXTRACTION_BACKENDS.items():
+        if not backend.available():
+            print(f"{name:<10}{'n/a (missing ' + backend.requires + ')':>38}")
+            continue
+        shares, chars = [], 0
+        start = time.perf_counter()
+        for html, article in corpus:
+            text = backend.extract(iter([html]), args.max_chars, args.max_bytes)
+            shares.append(article_share(text, article))
+            chars += len(text)
+        elapsed = time.perf_counter() - start
+        print(f"{name:<10}{len(corpus) / elapsed:>10.1f}{sum(shares) / len(shares):>16.1%}"
+              f"{chars / len(corpus):>12.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+"""Compare bare ``requests.get`` against the shared pooled session.
+
+Runs against a local keep-alive HTTP server that counts accepted TCP
+connections. ``--connect-delay`` adds a per-connection pause to stand in for
+the TCP/TLS handshake round-trips a real news site would cost.
+
+    python benchmarks/bench_http_pool.py --requests 200 --connect-delay 0.02
+"""
+import argparse
+import os
+import socket
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import requests
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from fact_checker.tools.http_client import get_session  # noqa: E402
+
+BODY = b"<html><body>" + b"<p>fact checking fixture</p>" * 200 + b"</body></html>"
+
+
+class CountingServer(ThreadingHTTPServer):
+    daemon_threads = True
+    connections = 0
+    connect_delay = 0.0
+
+
+class Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def setup(self):
+        super().setup()
+        # Headers and body go out in separate writes; without NODELAY the
+        # kept-alive socket stalls on delayed ACKs and skews the comparison.
+        self.connection.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        self.server.connections += 1
+        if self.server.connect_delay:
+            time.sleep(self.server.connect_delay)
+
+    def do_GET(self):
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html")
+        self.send_header("Content-Length", str(len(BODY)))
+        self.end_headers()
+        self.wfile.write(BODY)
+
+    def log_message(self, *args):
+        pass
+
+
+def run(label, fetch, server, url, count):
+    server.connections = 0
+    start = time.perf_counter()
+    for _ in range(count):
+        fetch(url).raise_for_status()
+    elapsed = time.perf_counter() - start
+    print(f"{label:<14} {count:>6} requests  {elapsed:8.3f}s  "
+          f"{count / elapsed:8.1f} req/s  {server.connections:>6} connections")
+    return elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--connect-delay", type=float, default=0.0,
+                        help="seconds added per new TCP connection")
+    args = parser.parse_args()
+
+    server = CountingServer(("127.0.0.1", 0), Handler)
+    server.connect_delay = args.connect_delay
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    url = f"http://127.0.0.1:{server.server_address[1]}/article"
+
+    session = get_session()
+    session.get(url)  # warm the pool so both runs measure steady state
+
+    bare = run("requests.get", lambda u: requests.get(u, timeout=10), server, url, args.requests)
+    pooled = run("pooled", lambda u: session.get(u, timeout=10), server, url, args.requests)
+    print(f"speedup: {bare / pooled:.2f}x")
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+"""LLM response cache: uncached vs. exact vs. semantic on a repetitive workload.
+
+Replays verifier-style prompts against the local stub LLM server. The
+workload mixes first-time claims, verbatim repeats (e.g. the same viral
+claim checked twice) and trivially reworded repeats (spacing, casing,
+punctuation). Each mode uses a fresh cache directory.
+
+    python benchmarks/bench_llm_cache.py --claims 40 --repeats 2 --latency 0.3
+"""
+import argparse
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+sys.path.insert(0, os.path.dirname(__file__))
+os.environ.setdefault("OPENAI_API_KEY", "sk-offline-benchmark")
+
+from stub_llm_server import StubLLMServer  # noqa: E402
+
+SYSTEM = ("You are Fact Verification Specialist. You are the final authority on fact verification. "
+          "Your personal goal is: Make final determinations on whether claims are TRUE or FALSE.")
+SUBJECTS = ["The Eiffel Tower", "Mount Everest", "The Amazon river", "The Great Wall", "Lake Baikal",
+            "The Sahara", "The Moon", "Jupiter", "The Pacific Ocean", "The Nile"]
+FACTS = ["is {n} metres tall", "was completed in {n}", "covers {n} square kilometres",
+         "has {n} visitors a year", "is {n} kilometres long"]
+
+
+def workload(claims: int, repeats: int, seed: int = 7):
+    rng = random.Random(seed)
+    base = [f"{rng.choice(SUBJECTS)} {rng.choice(FACTS).format(n=rng.randint(100, 9999))}."
+            for _ in range(claims)]
+    prompts = list(base)
+    for _ in range(repeats):
+        for claim in base:
+            variant = claim
+            if rng.random() < 0.5:
+                variant = "  " + claim.lower().rstrip(".") + " !"
+            prompts.append(variant)
+    rng.shuffle(prompts)
+    return [[{"role": "system", "content": SYSTEM},
+             {"role": "user", "content": f"Verify this claim and give a verdict.\nClaim: {p}"}]
+            for p in prompts]
+
+
+def run_mode(mode: str, base_url: str, prompts):
+    os.environ["FACT_CHECKER_CACHE_DIR"] = tempfile.mkdtemp(prefix=f"llm-bench-{mode}-")
+    import fact_checker.llm as llm_module
+    import fact_checker.tools.disk_cache as disk_cache
+
+    disk_cache._registry.clear()
+    llm_module._response_cache = None
+    config = {"llm": "openai/gpt-4o", "temperature": 0, "llm_cache": mode}
+    llm = llm_module.build_llm(config)
+    llm.base_url = base_url
+
+    samples = []
+    start = time.perf_counter()
+    for messages in prompts:
+        t0 = time.perf_counter()
+        llm.call(messages)
+        samples.append((time.perf_counter() - t0) * 1000)
+    total = time.perf_counter() - start
+    stats = disk_cache._registry["llm"].stats() if "llm" in disk_cache._registry else {}
+    return total, samples, stats
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--claims", type=int, default=40)
+    parser.add_argument("--repeats", type=int, default=2)
+    parser.add_argument("--latency", type=float, default=0.3)
+    args = parser.parse_args()
+
+    server = StubLLMServer(latency=args.latency).start()
+    prompts = workload(args.claims, args.repeats)
+    print(f"{len(prompts)} prompts, stub latency {args.latency * 1000:.0f} ms\n")
+    print(f"{'mode':<10}{'upstream':>10}{'hit rate':>10}{'p50 ms':>10}{'p95 ms':>10}{'total s':>10}")
+    for mode in ("off", "exact", "semantic"):
+        before = server.calls
+        total, samples, stats = run_mode(mode, server.base_url, prompts)
+        served = len(prompts) - (server.calls - before)
+        p95 = sorted(samples)[int(len(samples) * 0.95) - 1]
+        print(f"{mode:<10}{server.calls - before:>10}{served / len(prompts):>10.0%}"
+              f"{statistics.median(samples):>10.1f}{p95:>10.1f}{total:>10.2f}")
+        if stats:
+            print(f"{'':<10}cache: {stats['hits']} hits, {stats['misses']} misses, {stats['writes']} writes")
+
+
+if __name__ == "__main__":
+    main()
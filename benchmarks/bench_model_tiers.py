@@ -0,0 +1,213 @@
+"""Per-agent model tier harness: latency, tokens and agreement per model.
+
+Replays a fixed claim set through each agent's prompt on every candidate
+model, then reports per model:
+
+- p50/p95 latency
+- mean prompt and completion tokens
+- agreement with the gold answers. For ``fact_verifier`` that is the
+  share of verdicts matching the label. For ``content_analyzer`` it is
+  the mean Jaccard overlap between the extracted claims and the expected
+  ones.
+
+Responses come from one of three places:
+
+* ``--stub`` (default): the local stub server. Each tier gets a simulated
+  latency and error rate.
+* ``--replay FILE``: responses recorded in an earlier run, served by the
+  stub with their recorded latency.
+* ``--live``: the real API, using ``OPENAI_API_KEY``. Add ``--record FILE``
+  to save the responses for later replays.
+
+A final check makes the primary model slower than ``llm_timeout`` to
+confirm that ``FallbackLLM`` moves on to the next tier.
+
+    python benchmarks/bench_model_tiers.py --stub
+    python benchmarks/bench_model_tiers.py --live --record tiers.jsonl
+    python benchmarks/bench_model_tiers.py --replay tiers.jsonl
+"""
+import argparse
+import hashlib
+import json
+import os
+import re
+import statistics
+import sys
+import time
+
+import yaml
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+sys.path.insert(0, os.path.dirname(__file__))
+os.environ.setdefault("OPENAI_API_KEY", "sk-offline-benchmark")
+os.environ["FACT_CHECKER_LLM_CACHE"] = "0"
+
+from crewai import LLM  # noqa: E402
+from stub_llm_server import StubLLMServer  # noqa: E402
+from fact_checker.context import count_tokens  # noqa: E402
+from fact_checker.llm import build_llm  # noqa: E402
+
+AGENTS_YAML = os.path.join(os.path.dirname(__file__), "..", "src", "fact_checker", "config", "agents.yaml")
+
+VERIFY_SET = [
+    ("The Eiffel Tower is about 330 metres tall.", "TRUE"),
+    ("The Great Wall of China is visible from the Moon with the naked eye.", "FALSE"),
+    ("Water boils at 100 degrees Celsius at sea level.", "TRUE"),
+    ("Humans only use 10 percent of their brains.", "FALSE"),
+    ("Mount Everest is the tallest mountain above sea level.", "TRUE"),
+    ("Lightning never strikes the same place twice.", "FALSE"),
+    ("The Amazon is the largest rainforest on Earth.", "TRUE"),
+    ("Goldfish have a three-second memory.", "FALSE"),
+    ("Venus is the hottest planet in the Solar System.", "TRUE"),
+    ("Bats are blind.", "FALSE"),
+    ("The human body has 206 bones in adulthood.", "TRUE"),
+    ("Napoleon Bonaparte was unusually short for his time.", "FALSE"),
+]
+EXTRACT_SET = [
+    ("The city council said unemployment fell to 4.1 percent in March. The mayor, who took office in 2019, "
+     "also claimed crime dropped by a third. Residents seemed pleased with the new park.",
+     ["unemployment fell to 4.1 percent in march", "crime dropped by a third"]),
+    ("Officials reported 12,000 new homes were built last year, double the previous year. The report was "
+     "released on Tuesday. Critics argue rents still rose 8 percent.",
+     ["12,000 new homes were built last year", "double the previous year", "rents still rose 8 percent"]),
+    ("The company's revenue reached 3 billion dollars, and it now employs 15,000 people. Its chief executive "
+     "described the results as encouraging.",
+     ["revenue reached 3 billion dollars", "employs 15,000 people"]),
+]
+LABELS = ("TRUE", "FALSE", "UNCERTAIN", "UNVERIFIABLE")
+_WORD = re.compile(r"[a-z0-9][a-z0-9,.]*")
+
+
+def system_prompt(cfg):
+    return (f"You are {cfg['role'].strip()}. {cfg['backstory'].strip()}\n"
+            f"Your personal goal is: {cfg['goal'].strip()}")
+
+
+def cases(agent):
+    if agent == "fact_verifier":
+        return [(f"Verify this claim. Start your answer with exactly one of {', '.join(LABELS)}.\nClaim: {c}", v)
+                for c, v in VERIFY_SET]
+    return [(f"List each verifiable factual claim in this text, one per line, nothing else.\n\n{t}", g)
+            for t, g in EXTRACT_SET]
+
+
+def score(agent, response, gold):
+    if agent == "fact_verifier":
+        found = re.search("|".join(LABELS), response.upper())
+        return float(bool(found) and found.group(0) == gold)
+    lines = [set(_WORD.findall(line.lower())) for line in response.splitlines() if line.strip()]
+    best = []
+    for claim in gold:
+        terms = set(_WORD.findall(claim))
+        best.append(max((len(terms & l) / len(terms | l) for l in lines), default=0.0))
+    return statistics.mean(best)
+
+
+def _key(model, messages):
+    return hashlib.sha256(json.dumps([model, messages]).encode()).hexdigest()
+
+
+def stub_responder(error_rates):
+    """Right answers, wrong for a deterministic ``error_rates[model]`` share of prompts."""
+    def respond(model, messages):
+        prompt = messages[-1]["content"]
+        wrong = int(_key(model, prompt)[:4], 16) / 0xFFFF < error_rates.get(model, 0.0)
+        if prompt.startswith("Verify"):
+            claim = prompt.split("Claim: ", 1)[1]
+            gold = dict(VERIFY_SET)[claim]
+            verdict = ("FALSE" if gold == "TRUE" else "TRUE") if wrong else gold
+            return f"{verdict}. Explanation of the evidence for: {claim}"
+        text = prompt.split("\n\n", 1)[1]
+        claims = dict(EXTRACT_SET)[text]
+        return "\n".join(claims[:-1] if wrong else claims)
+    return respond
+
+
+def replay_responder(records):
+    def respond(model, messages):
+        return records[_key(model, messages)]["response"]
+    return respond
+
+
+def run(agent, cfg, model, base_url, recorder=None):
+    kwargs = {"temperature": cfg.get("temperature")} if cfg.get("temperature") is not None else {}
+    llm = LLM(model=f"openai/{model}", base_url=base_url, **kwargs) if base_url else LLM(model=model, **kwargs)
+    latencies, tokens_in, tokens_out, scores = [], [], [], []
+    for prompt, gold in cases(agent):
+        messages = [{"role": "system", "content": system_prompt(cfg)}, {"role": "user", "content": prompt}]
+        start = time.perf_counter()
+        response = llm.call(messages)
+        latencies.append(time.perf_counter() - start)
+        tokens_in.append(count_tokens(messages[0]["content"] + messages[1]["content"]))
+        tokens_out.append(count_tokens(response))
+        scores.append(score(agent, response, gold))
+        if recorder is not None:
+            recorder.write(json.dumps({"key": _key(model, messages), "model": model,
+                                       "latency": latencies[-1], "response": response}) + "\n")
+    latencies.sort()
+    return (statistics.median(latencies) * 1000, latencies[int(len(latencies) * 0.95) - 1] * 1000,
+            statistics.mean(tokens_in), statistics.mean(tokens_out), statistics.mean(scores))
+
+
+def fallback_check(server, cfg):
+    primary, fallback = cfg["llm"], (cfg.get("fallback_llms") or ["gpt-4o"])[0]
+    config = {**cfg, "llm": f"openai/{primary}", "fallback_llms": [f"openai/{fallback}"], "llm_timeout": 0.5}
+    os.environ["FACT_CHECKER_LLM_BASE_URL"] = server.base_url
+    saved = server.latency
+    server.latency = {primary: 5.0, "*": 0.1}
+    llm = build_llm(config)
+    start = time.perf_counter()
+    answer = llm.call([{"role": "user", "content": f"Verify this claim. Claim: {VERIFY_SET[0][0]}"}])
+    elapsed = time.perf_counter() - start
+    server.latency = saved
+    print(f"\nfallback: {primary} held for 5 s with llm_timeout=0.5 s -> answered by the fallback in "
+          f"{elapsed:.2f} s ({llm.fallbacks_used} fallback): {answer[:40]!r}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    mode = parser.add_mutually_exclusive_group()
+    mode.add_argument("--stub", action="store_true", default=True)
+    mode.add_argument("--live", action="store_true")
+    mode.add_argument("--replay", metavar="FILE")
+    parser.add_argument("--record", metavar="FILE", help="save responses for --replay")
+    parser.add_argument("--tiers", default="gpt-4o,gpt-4o-mini", help="comma-separated candidate models")
+    parser.add_argument("--stub-latency", default="gpt-4o=1.2,gpt-4o-mini=0.5",
+                        help="simulated seconds per model")
+    parser.add_argument("--stub-errors", default="gpt-4o=0.0,gpt-4o-mini=0.15",
+                        help="simulated wrong-answer rate per model")
+    args = parser.parse_args()
+
+    with open(AGENTS_YAML, encoding="utf-8") as f:
+        agents = yaml.safe_load(f)
+    tiers = args.tiers.split(",")
+
+    server = None
+    if not args.live:
+        pairs = lambda spec: {k: float(v) for k, v in (p.split("=") for p in spec.split(","))}  # noqa: E731
+        if args.replay:
+            with open(args.replay, encoding="utf-8") as f:
+                records = {r["key"]: r for r in map(json.loads, f)}
+            latency = {r["model"]: r["latency"] for r in records.values()}
+            server = StubLLMServer(latency=latency, responder=replay_responder(records)).start()
+        else:
+            server = StubLLMServer(latency=pairs(args.stub_latency),
+                                   responder=stub_responder(pairs(args.stub_errors))).start()
+    recorder = open(args.record, "w", encoding="utf-8") if args.record else None
+
+    print(f"{'agent':<18}{'model':<14}{'configured':<12}{'p50 ms':>9}{'p95 ms':>9}"
+          f"{'tok in':>8}{'tok out':>8}{'agreement':>11}")
+    for agent in ("content_analyzer", "fact_verifier"):
+        cfg = agents[agent]
+        for model in tiers:
+            role = "primary" if model == cfg["llm"] else ("fallback" if model in (cfg.get("fallback_llms") or []) else "")
+            p50, p95, t_in, t_out, agreement = run(agent, cfg, model, server and server.base_url, recorder)
+            print(f"{agent:<18}{model:<14}{role:<12}{p50:>9.0f}{p95:>9.0f}{t_in:>8.0f}{t_out:>8.0f}{agreement:>11.0%}")
+    if recorder:
+        recorder.close()
+    if server is not None and not args.replay:
+        fallback_check(server, agents["content_analyzer"])
+
+
+if __name__ == "__main__":
+    main()
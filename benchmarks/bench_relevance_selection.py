@@ -0,0 +1,70 @@
+"""How often does the gold evidence passage survive the 5000-character cut?
+
+Builds long synthetic pages (``html_corpus``) and plants one evidence
+sentence at a random depth. The claim paraphrases the evidence, sharing its
+key terms but not its wording. Compares plain first-N truncation with BM25
+passage selection on survival rate and output size.
+
+    python benchmarks/bench_relevance_selection.py --pages 500
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+sys.path.insert(0, os.path.dirname(__file__))
+
+from html_corpus import make_page  # noqa: E402
+from fact_checker.tools.relevance import select_passages  # noqa: E402
+
+FACTS = [
+    ("Norway", "unemployment", "fell to 3.2 percent in 2023",
+     "Norwegian unemployment dropped to 3.2 percent in 2023"),
+    ("Kenya", "tea exports", "rose by 14 percent to 1.2 billion dollars",
+     "Kenya tea exports grew 14 percent reaching 1.2 billion"),
+    ("Brazil", "deforestation", "in the Amazon declined 22 percent year on year",
+     "Amazon deforestation in Brazil declined 22 percent"),
+    ("Japan", "birth rate", "hit a record low of 1.2 children per woman",
+     "Japan birth rate record low 1.2 children per woman"),
+    ("Germany", "coal plants", "supplied 26 percent of electricity last winter",
+     "German coal plants supplied 26 percent of electricity"),
+]
+
+
+def build_case(seed: int):
+    rng = random.Random(seed)
+    _, paragraphs = make_page(seed, paragraphs=rng.randint(30, 120))
+    country, topic, detail, claim = FACTS[seed % len(FACTS)]
+    gold = f"Official figures show {country} {topic} {detail}."
+    paragraphs.insert(rng.randrange(len(paragraphs)), gold)
+    return " ".join(paragraphs), claim, gold
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--pages", type=int, default=500)
+    parser.add_argument("--budget", type=int, default=5000)
+    args = parser.parse_args()
+
+    cases = [build_case(seed) for seed in range(args.pages)]
+    strategies = {
+        "truncate": lambda text, claim: text[:args.budget],
+        "bm25": lambda text, claim: select_passages(text, claim, args.budget),
+    }
+    print(f"{'strategy':<10}{'gold survives':>15}{'avg chars':>12}{'ms/page':>10}")
+    for name, select in strategies.items():
+        kept = chars = 0
+        start = time.perf_counter()
+        for text, claim, gold in cases:
+            out = select(text, claim)
+            kept += gold in out
+            chars += len(out)
+        elapsed = time.perf_counter() - start
+        print(f"{name:<10}{kept / len(cases):>15.1%}{chars / len(cases):>12.0f}"
+              f"{elapsed * 1000 / len(cases):>10.2f}")
+
+
+if __name__ == "__main__":
+    main()
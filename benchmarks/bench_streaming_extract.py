@@ -0,0 +1,71 @@
+"""Peak RSS and wall time: full-soup extraction vs. streaming budgeted extraction.
+
+Each measurement runs in a fresh subprocess so ``ru_maxrss`` reflects only
+that path. The soup path reads the whole file first, as ``response.content``
+does; the streaming path reads 16 KiB chunks until its budget is filled.
+
+    python benchmarks/bench_streaming_extract.py --sizes 1 5 20
+"""
+import argparse
+import json
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+sys.path.insert(0, os.path.dirname(__file__))
+
+
+def _maxrss_mb():
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def worker(mode, path, max_chars):
+    from fact_checker.tools.html_extract import extract_text_soup, extract_text_stream
+
+    baseline = _maxrss_mb()
+    start = time.perf_counter()
+    with open(path, "rb") as f:
+        if mode == "soup":
+            text = extract_text_soup(f.read(), max_chars)
+        else:
+            text = extract_text_stream(iter(lambda: f.read(16384), b""), max_chars=max_chars,
+                                       max_bytes=os.path.getsize(path))
+    elapsed = time.perf_counter() - start
+    print(json.dumps({"elapsed": elapsed, "peak_rss_mb": _maxrss_mb() - baseline, "chars": len(text)}))
+
+
+def measure(mode, path, max_chars):
+    out = subprocess.run(
+        [sys.executable, __file__, "--worker", mode, path, "--max-chars", str(max_chars)],
+        check=True, capture_output=True, text=True,
+    ).stdout
+    return json.loads(out.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1, 5, 20], help="fixture sizes in MB")
+    parser.add_argument("--max-chars", type=int, default=5000)
+    parser.add_argument("--fixtures", default=os.path.join(tempfile.gettempdir(), "fact_checker_html"))
+    parser.add_argument("--worker", nargs=2, metavar=("MODE", "PATH"), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        worker(args.worker[0], args.worker[1], args.max_chars)
+        return
+
+    from html_corpus import write_fixtures
+
+    print(f"{'fixture':<18}{'mode':<10}{'wall s':>10}{'peak RSS MB':>14}")
+    for path in write_fixtures(args.fixtures, args.sizes):
+        for mode in ("soup", "stream"):
+            r = measure(mode, path, args.max_chars)
+            print(f"{os.path.basename(path):<18}{mode:<10}{r['elapsed']:>10.3f}{r['peak_rss_mb']:>14.1f}")
+
+
+if __name__ == "__main__":
+    main()
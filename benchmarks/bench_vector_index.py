@@ -0,0 +1,126 @@
+"""Vector index build time, memory footprint and query latency.
+
+Two parts:
+
+- embedding throughput of the configured embedder (``get_embedder()``:
+  hashing, or ``FACT_CHECKER_EMBEDDING_MODEL``) on passage-sized texts,
+  at several batch sizes
+- ``--rows`` synthetic unit vectors of ``--dim`` dimensions, drawn around
+  ``--clusters`` centres the way topical passages are, appended in batches
+  of ``--batch``. It reports append throughput, IVF training time, the
+  size on disk, the process's resident memory, and query latency and
+  recall@10 (against an exact scan) for brute force and IVF at several
+  ``nprobe`` values
+
+    python benchmarks/bench_vector_index.py --rows 1000000 --dim 384
+"""
+import argparse
+import os
+import resource
+import statistics
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from fact_checker.embeddings import Embedder, get_embedder  # noqa: E402
+from fact_checker.tools.vector_index import VectorIndex  # noqa: E402
+
+WORDS = ("the claim report minister budget percent vaccine study election climate emissions "
+         "tower population growth rate survey court ruling official data year increase").split()
+
+
+class Precomputed(Embedder):
+    """Stands in for a model of ``dim`` dimensions; the benchmark supplies the vectors."""
+
+    def __init__(self, dim):
+        self.dim = dim
+        self.name = f"synthetic-{dim}"
+
+
+def rss_mb():
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def clustered(count, centres, gen, noise):
+    """Unit rows around random centres; ``noise`` 1.0 puts a row at cosine ~0.7 to its centre."""
+    rows = centres[gen.integers(len(centres), size=count)]
+    rows = rows + noise * gen.standard_normal(rows.shape, dtype=np.float32) / np.sqrt(centres.shape[1])
+    return rows / np.linalg.norm(rows, axis=1, keepdims=True)
+
+
+def embedding_throughput(count):
+    embedder = get_embedder()
+    gen = np.random.default_rng(1)
+    texts = [" ".join(gen.choice(WORDS, size=80)) for _ in range(count)]
+    print(f"{embedder.name}: {embedder.dim} dimensions")
+    for batch in (1, 32, 256):
+        start = time.perf_counter()
+        for i in range(0, count, batch):
+            embedder.embed(texts[i:i + batch])
+        elapsed = time.perf_counter() - start
+        print(f"  batch {batch:>4}: {count / elapsed:>8,.0f} passages/s")
+
+
+def timed(index, queries, nprobe):
+    samples, found = [], []
+    for q in queries:
+        start = time.perf_counter()
+        found.append(index.nearest(q, k=10, nprobe=nprobe)[0])
+        samples.append((time.perf_counter() - start) * 1000)
+    samples.sort()
+    return found, statistics.median(samples), samples[int(len(samples) * 0.95) - 1]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=200_000)
+    parser.add_argument("--dim", type=int, default=384)
+    parser.add_argument("--clusters", type=int, default=2000)
+    parser.add_argument("--noise", type=float, default=1.0)
+    parser.add_argument("--batch", type=int, default=8192)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--embed", type=int, default=2000, help="passages for the embedding throughput test")
+    args = parser.parse_args()
+
+    embedding_throughput(args.embed)
+
+    gen = np.random.default_rng(7)
+    centres = gen.standard_normal((args.clusters, args.dim), dtype=np.float32)
+    centres /= np.linalg.norm(centres, axis=1, keepdims=True)
+    root = tempfile.mkdtemp(prefix="vectors-bench-")
+    index = VectorIndex(root, embedder=Precomputed(args.dim), ivf_min_rows=args.rows + 1)
+    generate = append = 0.0
+    for start in range(0, args.rows, args.batch):
+        t0 = time.perf_counter()
+        count = min(args.batch, args.rows - start)
+        vectors = clustered(count, centres, gen, args.noise)
+        t1 = time.perf_counter()
+        index.append(np.arange(start + 1, start + count + 1, dtype=np.int64), vectors)
+        generate += t1 - t0
+        append += time.perf_counter() - t1
+    print(f"\nappended {len(index):,} rows in {append:.1f}s: {len(index) / append:,.0f} rows/s "
+          f"(+{generate:.1f}s generating them)")
+
+    start = time.perf_counter()
+    index._train()
+    print(f"IVF trained in {time.perf_counter() - start:.1f}s: {index.stats()['ivf_lists']} lists")
+    print(f"on disk {index.size_bytes() / 1e6:,.0f} MB "
+          f"({len(index) * args.dim * 2 / 1e6:,.0f} MB of float16 vectors); peak RSS {rss_mb():,.0f} MB")
+
+    queries = clustered(args.queries, centres, gen, args.noise)
+    exact, p50, p95 = timed(index, queries, nprobe=0)
+    print(f"\n{'search':<16}{'recall@10':>10}{'p50 ms':>10}{'p95 ms':>10}")
+    print(f"{'brute force':<16}{1.0:>10.2f}{p50:>10.2f}{p95:>10.2f}")
+    for nprobe in (4, 16, 64):
+        found, p50, p95 = timed(index, queries, nprobe)
+        recall = np.mean([len(np.intersect1d(f, e)) / len(e) for f, e in zip(found, exact)])
+        print(f"{f'IVF nprobe={nprobe}':<16}{recall:>10.2f}{p50:>10.2f}{p95:>10.2f}")
+    print(f"\npeak RSS after queries {rss_mb():,.0f} MB")
+
+
+if __name__ == "__main__":
+    main()
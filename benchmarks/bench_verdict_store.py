@@ -0,0 +1,97 @@
+"""Verdict memo lookup latency with a large number of stored claims.
+
+Fills a fresh store with ``--claims`` rows. Filler rows get random 64-bit
+fingerprints, which is how SimHash values of unrelated claims are
+distributed. A probe set of real claims is then added through
+``VerdictStore.add``. Lookups are timed for three cases: reworded probes
+(which should hit), numerically different probes (which must miss) and
+unrelated claims.
+
+    python benchmarks/bench_verdict_store.py --claims 1000000
+"""
+import argparse
+import os
+import random
+import re
+import sqlite3
+import statistics
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from fact_checker.verdict_store import REPORT, VerdictStore  # noqa: E402
+
+SUBJECTS = ["The Eiffel Tower", "Mount Everest", "The Amazon river", "The Great Wall", "Lake Baikal",
+            "The Sahara", "The Moon", "Jupiter", "The Pacific Ocean", "The Nile", "The population of Brazil",
+            "Global CO2 emissions", "The unemployment rate", "The national debt"]
+FACTS = ["is {n} metres tall", "was completed in {n}", "covers {n} square kilometres",
+         "has {n} visitors a year", "is {n} kilometres long", "grew by {n} percent last year",
+         "reached {n} million in 2023"]
+
+
+def claims(count, rng):
+    return [f"{rng.choice(SUBJECTS)} {rng.choice(FACTS).format(n=rng.randint(10, 99999))}." for _ in range(count)]
+
+
+def reword(claim, rng):
+    variants = [claim.lower(), claim.upper(), "  " + claim.rstrip(".") + "!!", claim.replace(" ", "  ")]
+    return rng.choice(variants)
+
+
+def timed(store, queries):
+    samples, hits = [], 0
+    for q in queries:
+        start = time.perf_counter()
+        hits += store.lookup(q, REPORT) is not None
+        samples.append((time.perf_counter() - start) * 1e6)
+    samples.sort()
+    return hits, statistics.median(samples), samples[int(len(samples) * 0.99) - 1]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--claims", type=int, default=1_000_000)
+    parser.add_argument("--probes", type=int, default=2000)
+    args = parser.parse_args()
+    rng = random.Random(11)
+    path = os.path.join(tempfile.mkdtemp(prefix="verdict-bench-"), "verdicts.sqlite3")
+
+    VerdictStore(path)  # create the schema
+    start = time.perf_counter()
+    filler = np.random.default_rng(11).integers(-(2 ** 63), 2 ** 63 - 1, size=args.claims, dtype=np.int64)
+    now = time.time()
+    with sqlite3.connect(path) as conn:
+        conn.executemany(
+            "INSERT INTO verdicts (fingerprint, guard, claim, verdict, evidence, stored_at) "
+            "VALUES (?, 0, 'filler', 'UNVERIFIABLE', '', ?)",
+            ((int(fp), now) for fp in filler),
+        )
+    print(f"wrote {args.claims:,} filler rows in {time.perf_counter() - start:.1f}s")
+
+    start = time.perf_counter()
+    store = VerdictStore(path, ttl=3600)
+    print(f"loaded index from SQLite in {time.perf_counter() - start:.2f}s")
+
+    probes = claims(args.probes, rng)
+    for claim in probes:
+        store.add(claim, "FALSE", REPORT)
+    store.index.merge()
+
+    reworded = [reword(c, rng) for c in probes]
+    renumbered = [re.sub(r"\d+", lambda m: str(int(m.group()) + 1), c, count=1) for c in probes]
+    unrelated = [f"Claim number {i} about something else entirely, {rng.random():.6f}." for i in range(args.probes)]
+
+    print(f"\n{len(store):,} stored claims\n")
+    print(f"{'queries':<22}{'hits':>8}{'p50 us':>10}{'p99 us':>10}")
+    for label, queries in (("reworded duplicates", reworded), ("different numbers", renumbered),
+                           ("unrelated", unrelated)):
+        hits, p50, p99 = timed(store, queries)
+        print(f"{label:<22}{hits:>8}{p50:>10.1f}{p99:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+"""Local web server with synthetic news pages for offline benchmarks.
+
+``GET /article/<n>`` returns ``html_corpus.make_page(n)``. The same ``n``
+always gives the same bytes. Every reply is delayed by ``latency``
+seconds and counted, so benchmarks can report requests and bytes served.
+
+    python benchmarks/fixture_server.py --port 8597 --latency 0.05
+"""
+import argparse
+import re
+import threading
+import time
+from functools import lru_cache
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from html_corpus import make_page
+
+_ARTICLE = re.compile(r"^/article/(\d+)$")
+
+
+@lru_cache(maxsize=256)
+def _page(seed: int) -> bytes:
+    return make_page(seed)[0].encode("utf-8")
+
+
+def article_text(seed: int) -> str:
+    """The article body of ``/article/<seed>`` as plain paragraphs."""
+    return "\n\n".join(make_page(seed)[1])
+
+
+class FixtureServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, port: int = 0, latency: float = 0.05):
+        super().__init__(("127.0.0.1", port), _Handler)
+        self.latency = latency
+        self.requests = 0
+        self.bytes_served = 0
+        self._lock = threading.Lock()
+
+    @property
+    def base_url(self) -> str:
+        return f"http://127.0.0.1:{self.server_address[1]}"
+
+    def url(self, seed: int) -> str:
+        return f"{self.base_url}/article/{seed}"
+
+    def start(self) -> "FixtureServer":
+        threading.Thread(target=self.serve_forever, daemon=True).start()
+        return self
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        match = _ARTICLE.match(self.path.split("?", 1)[0])
+        if not match:
+            self.send_response(404)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+        data = _page(int(match.group(1)))
+        server = self.server
+        time.sleep(server.latency)
+        with server._lock:
+            server.requests += 1
+            server.bytes_served += len(data)
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, *args):
+        pass
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--port", type=int, default=8597)
+    parser.add_argument("--latency", type=float, default=0.05)
+    args = parser.parse_args()
+
+    server = FixtureServer(args.port, args.latency)
+    print(f"fixture pages on {server.base_url}/article/<n>")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+"""Synthetic news-page fixtures shared by the extraction benchmarks.
+
+Pages are generated deterministically rather than checked in so the repo
+doesn't carry multi-megabyte HTML files. Each page has the usual clutter
+(navigation, cookie banner, inline scripts, related-links rails, footer)
+around an article body whose sentences are returned alongside the HTML.
+"""
+import os
+import random
+
+WORDS = (
+    "government report study percent million data health vaccine climate "
+    "election official statement minister economy growth inflation survey "
+    "researchers published according evidence claim agency record increase "
+    "decline experts analysis university source figures national global"
+).split()
+BOILERPLATE = (
+    "Home News World Politics Business Tech Science Health Sport Opinion "
+    "Subscribe Sign in Newsletter Cookie settings Accept all Privacy policy "
+    "Terms of use Advertise with us Contact Follow us Share Trending now"
+).split()
+
+
+def _sentence(rng, words, n):
+    return " ".join(rng.choice(words) for _ in range(n)).capitalize() + "."
+
+
+def make_page(seed: int, paragraphs: int = 40, clutter: int = 20):
+    """Return ``(html, article_paragraphs)`` for one synthetic page."""
+    rng = random.Random(seed)
+    article = [
+        " ".join(_sentence(rng, WORDS, rng.randint(8, 20)) for _ in range(rng.randint(2, 5)))
+        for _ in range(paragraphs)
+    ]
+    nav = "".join(f'<li><a href="/s/{i}">{rng.choice(BOILERPLATE)}</a></li>' for i in range(clutter))
+    rail = "".join(
+        f'<li><a href="/r/{i}">{_sentence(rng, BOILERPLATE, 6)}</a></li>' for i in range(clutter)
+    )
+    script = "<script>window.__STATE__=" + "{" + ",".join(
+        f'"k{i}":{rng.random()}' for i in range(clutter * 20)
+    ) + "}</script>"
+    body = "".join(f"<p>{p}</p>\n" for p in article)
+    html = (
+        "<!DOCTYPE html><html><head><meta charset=\"utf-8\"><title>Story</title>"
+        f"<style>{'.c{color:red}' * clutter}</style>{script}</head><body>"
+        f'<header><nav><ul>{nav}</ul></nav></header>'
+        '<div class="cookie-banner"><p>We use cookies to improve your experience. '
+        'Accept all cookies or manage your privacy settings.</p></div>'
+        f'<main><article><h1>{_sentence(rng, WORDS, 8)}</h1>{body}</article>'
+        f'<aside><h3>Related</h3><ul>{rail}</ul></aside></main>'
+        f'<footer><ul>{nav}</ul><p>Copyright. All rights reserved.</p></footer>'
+        "</body></html>"
+    )
+    return html, article
+
+
+def make_large_page(target_bytes: int, seed: int = 0) -> bytes:
+    """Concatenate article paragraphs until the page reaches ``target_bytes``."""
+    html, _ = make_page(seed)
+    head, tail = html.split("</article>", 1)
+    rng = random.Random(seed)
+    filler = []
+    size = len(html)
+    while size < target_bytes:
+        para = f"<p>{_sentence(rng, WORDS, 30)} {_sentence(rng, WORDS, 30)}</p>\n"
+        filler.append(para)
+        size += len(para)
+    return (head + "".join(filler) + "</article>" + tail).encode("utf-8")
+
+
+def write_fixtures(directory: str, sizes_mb=(1, 5, 20)):
+    os.makedirs(directory, exist_ok=True)
+    paths = []
+    for size in sizes_mb:
+        path = os.path.join(directory, f"page_{size}mb.html")
+        if not os.path.exists(path):
+            with open(path, "wb") as f:
+                f.write(make_large_page(size * 1024 * 1024, seed=size))
+        paths.append(path)
+    return paths
@@ -0,0 +1,131 @@
+"""Local OpenAI-compatible ``/v1/chat/completions`` stub for offline benchmarks.
+
+Replies after ``latency`` seconds (a number, or a dict per model name) with
+the text of ``responder(model, messages)`` if given, else a scripted answer
+(the first entry of ``responses`` whose key appears in the last user
+message), else a generic ReAct final answer so crewai agents finish in
+one turn.
+
+    python benchmarks/stub_llm_server.py --port 8599 --latency 0.8
+
+Point crewai at it with ``OPENAI_API_BASE=http://127.0.0.1:8599/v1``.
+"""
+import argparse
+import json
+import socket
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Dict, Optional, Union
+
+DEFAULT_ANSWER = "Thought: I now know the final answer\nFinal Answer: {answer}"
+
+
+class StubLLMServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, port: int = 0, latency: Union[float, Dict[str, float]] = 0.5,
+                 responses: Optional[Dict[str, str]] = None, fail_models=(),
+                 responder: Optional[Callable[[str, list], str]] = None):
+        super().__init__(("127.0.0.1", port), _Handler)
+        self.latency = latency
+        self.responses = responses or {}
+        self.responder = responder
+        self.fail_models = set(fail_models)
+        self.calls = 0
+        self.calls_by_model: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    @property
+    def base_url(self) -> str:
+        return f"http://127.0.0.1:{self.server_address[1]}/v1"
+
+    def start(self) -> "StubLLMServer":
+        threading.Thread(target=self.serve_forever, daemon=True).start()
+        return self
+
+    def handle_error(self, request, client_address):
+        # Clients that timed out (fallback tests) hang up mid-reply.
+        pass
+
+    def latency_for(self, model: str) -> float:
+        if isinstance(self.latency, dict):
+            return self.latency.get(model, self.latency.get("*", 0.0))
+        return self.latency
+
+    def answer(self, model: str, messages) -> str:
+        if self.responder is not None:
+            return self.responder(model, messages)
+        last = next((m.get("content") or "" for m in reversed(messages) if m.get("role") == "user"), "")
+        for needle, reply in self.responses.items():
+            if needle in last:
+                return reply
+        return DEFAULT_ANSWER.format(answer=f"stub answer for: {' '.join(str(last).split())[:80]}")
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def setup(self):
+        super().setup()
+        self.connection.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+
+    def do_POST(self):
+        body = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))) or b"{}")
+        model = body.get("model", "")
+        server = self.server
+        with server._lock:
+            server.calls += 1
+            server.calls_by_model[model] = server.calls_by_model.get(model, 0) + 1
+        time.sleep(server.latency_for(model))
+
+        if model in server.fail_models:
+            self._send(503, {"error": {"message": f"{model} unavailable", "type": "server_error"}})
+            return
+        content = server.answer(model, body.get("messages", []))
+        self._send(200, {
+            "id": f"chatcmpl-stub-{server.calls}",
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": model,
+            "choices": [{
+                "index": 0,
+                "message": {"role": "assistant", "content": content},
+                "finish_reason": "stop",
+            }],
+            "usage": {"prompt_tokens": 0, "completion_tokens": 0, "total_tokens": 0},
+        })
+
+    def _send(self, status: int, payload: dict):
+        data = json.dumps(payload).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, *args):
+        pass
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--port", type=int, default=8599)
+    parser.add_argument("--latency", type=float, default=0.5)
+    parser.add_argument("--responses", help="JSON file mapping prompt substrings to replies")
+    args = parser.parse_args()
+
+    responses = None
+    if args.responses:
+        with open(args.responses, encoding="utf-8") as f:
+            responses = json.load(f)
+    server = StubLLMServer(args.port, args.latency, responses)
+    print(f"stub LLM listening on {server.base_url}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
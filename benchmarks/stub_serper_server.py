@@ -0,0 +1,96 @@
+"""Local Serper-compatible ``/search`` stub for offline benchmarks.
+
+Answers every query after ``latency`` seconds with ``results`` organic
+hits. The hits link to pages on ``link_base`` (usually the fixture
+server), so an agent that scrapes a result stays offline. The same query
+always gets the same results.
+
+    python benchmarks/stub_serper_server.py --port 8598 --latency 0.3
+
+Point the crew at it with ``FACT_CHECKER_SERPER_URL=http://127.0.0.1:8598``.
+"""
+import argparse
+import hashlib
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict
+
+
+class StubSerperServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, port: int = 0, latency: float = 0.3, results: int = 5,
+                 link_base: str = "http://127.0.0.1:8597", pages: int = 50):
+        super().__init__(("127.0.0.1", port), _Handler)
+        self.latency = latency
+        self.results = results
+        self.link_base = link_base.rstrip("/")
+        self.pages = pages
+        self.calls = 0
+        self.queries: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    @property
+    def base_url(self) -> str:
+        return f"http://127.0.0.1:{self.server_address[1]}"
+
+    def start(self) -> "StubSerperServer":
+        threading.Thread(target=self.serve_forever, daemon=True).start()
+        return self
+
+    def search(self, query: str) -> dict:
+        seed = int(hashlib.sha1(query.encode("utf-8")).hexdigest()[:8], 16)
+        organic = []
+        for position in range(1, self.results + 1):
+            page = (seed + position * 7) % self.pages
+            organic.append({
+                "title": f"Result {position} for {query[:60]}",
+                "link": f"{self.link_base}/article/{page}",
+                "snippet": f"Reporting on {query[:120]} with figures from source {page}.",
+                "position": position,
+            })
+        return {"searchParameters": {"q": query, "type": "search", "engine": "google"}, "organic": organic}
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_POST(self):
+        body = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))) or b"{}")
+        query = str(body.get("q", ""))
+        server = self.server
+        with server._lock:
+            server.calls += 1
+            server.queries[query] = server.queries.get(query, 0) + 1
+        time.sleep(server.latency)
+        data = json.dumps(server.search(query)).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, *args):
+        pass
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--port", type=int, default=8598)
+    parser.add_argument("--latency", type=float, default=0.3)
+    parser.add_argument("--results", type=int, default=5)
+    parser.add_argument("--link-base", default="http://127.0.0.1:8597")
+    args = parser.parse_args()
+
+    server = StubSerperServer(args.port, args.latency, args.results, args.link_base)
+    print(f"stub Serper listening on {server.base_url}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -12,11 +12,16 @@ load_dotenv()
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "src")))
 
 try:
-    from fact_checker.crew import FactChecker
+    from fact_checker.warm import fact_check
+    from fact_checker.service import ServiceClient
+    from fact_checker.documents import open_document
 except ImportError as e:
     st.error(f"Could not import FactChecker: {e}")
     st.stop()
 
+# When set, analyses are submitted to the job API instead of run in-process
+API_URL = os.getenv("FACT_CHECKER_API_URL")
+
 # Page configuration
 st.set_page_config(
     page_title="VERIFACT - Professional AI Fact Verification",
@@ -147,8 +152,8 @@ st.markdown("""
 </div>
 """, unsafe_allow_html=True)
 
-# Environment check
-if not os.getenv("OPENAI_API_KEY"):
+# Environment check (the job API holds the keys in thin-client mode)
+if not API_URL and not os.getenv("OPENAI_API_KEY"):
     st.error("⚠️ **Configuration Error:** Please set your OPENAI_API_KEY in the .env file")
     st.stop()
 
@@ -241,38 +246,12 @@ if analyze_button:
     with st.spinner(
             "🔍 **VERIFACT Analysis in Progress** - Our AI agents are researching, analyzing, and verifying your content..."):
         input_content = ""
+        document = None
 
-        # File processing
+        # File processing: a PDF's pages are extracted as the check reads them
         if uploaded_file:
-            from pathlib import Path
-
-            suffix = Path(uploaded_file.name).suffix.lower()
             try:
-                if suffix == ".pdf":
-                    import PyPDF2
-
-                    reader = PyPDF2.PdfReader(uploaded_file)
-                    input_content = "".join([page.extract_text() for page in reader.pages])
-                elif suffix == ".docx":
-                    from docx import Document
-
-                    doc = Document(uploaded_file)
-                    input_content = "\n".join([p.text for p in doc.paragraphs])
-                elif suffix == ".txt":
-                    raw = uploaded_file.read()
-                    for enc in ["utf-8", "utf-16", "latin-1", "cp1252"]:
-                        try:
-                            input_content = raw.decode(enc)
-                            break
-                        except UnicodeDecodeError:
-                            continue
-                    else:
-                        st.error(
-                            "❌ **File Processing Error:** Unable to decode text file. Please ensure UTF-8 encoding.")
-                        st.stop()
-                else:
-                    st.error("❌ **Unsupported Format:** Please upload a PDF, Word document, or text file.")
-                    st.stop()
+                document, input_content = open_document(uploaded_file, uploaded_file.name)
             except Exception as e:
                 st.error(f"❌ **File Processing Error:** {e}")
                 st.stop()
@@ -283,14 +262,25 @@ if analyze_button:
         try:
             progress = st.progress(0, text="Initializing VERIFACT system...")
             progress.progress(20, text="Loading AI agents...")
-            checker = FactChecker()
             progress.progress(60, text="Executing multi-agent analysis...")
-            result = checker.crew().kickoff(inputs={"input_content": input_content})
+            if API_URL:
+                # Thin client: the job API's workers run the crew, and take the text whole
+                if document is not None:
+                    input_content = "\n".join(input_content)
+                client = ServiceClient(API_URL)
+                result = client.wait(client.submit(input_content))["report"]
+            else:
+                result = fact_check(input_content)
             progress.progress(100, text="Analysis complete!")
         except Exception as e:
             st.error(f"❌ **Analysis Error:** {e}")
             st.stop()
 
+        if document is not None and document.truncated:
+            st.warning(f"✂️ **Long Document:** {document.notice}")
+        if document is not None and document.unreadable:
+            st.warning(f"⚠️ **Unreadable Pages:** {document.unreadable_notice}")
+
     # Success notification
     #st.balloons()
     st.success("🎉 **Analysis Complete** - Professional verification report generated successfully")
@@ -0,0 +1,183 @@
+import csv
+import json
+import os
+import statistics
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from typing import Callable, Dict, Iterator, List, Optional, Set, Tuple
+
+INPUT_FIELDS = ('input_content', 'input', 'claim', 'url', 'youtube_url', 'text')
+
+
+def _content(record: Dict) -> str:
+    for name in INPUT_FIELDS:
+        value = record.get(name)
+        if isinstance(value, str) and value.strip():
+            return value
+    return ''
+
+
+def read_inputs(path: str) -> Iterator[Tuple[str, Optional[str]]]:
+    """Yield ``(id, input_content)`` from a JSONL or CSV file, lazily.
+
+    Records without an ``id`` are numbered by line, which stays stable as
+    long as the file isn't edited between runs. JSONL lines may also be
+    bare JSON strings. A line that is not a JSON object or string yields
+    ``(line number, None)``.
+    """
+    with open(path, newline='', encoding='utf-8') as f:
+        if path.lower().endswith('.csv'):
+            for n, row in enumerate(csv.DictReader(f), 1):
+                yield str(row.get('id') or n), _content(row)
+            return
+        for n, line in enumerate(f, 1):
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                record = None
+            if isinstance(record, str):
+                yield str(n), record
+            elif isinstance(record, dict):
+                yield str(record.get('id') or n), _content(record)
+            else:
+                yield str(n), None
+
+
+def completed_ids(path: str, retry_errors: bool = True) -> Set[str]:
+    """IDs already in the output file, i.e. the resume checkpoint.
+
+    A torn last line from a crash is ignored. With ``retry_errors``,
+    failed items are not counted as done and run again.
+    """
+    done: Set[str] = set()
+    if not os.path.exists(path):
+        return done
+    with open(path, encoding='utf-8') as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+            except ValueError:
+                continue
+            if record.get('status') == 'ok':
+                done.add(record['id'])
+            elif retry_errors:
+                done.discard(record['id'])
+            else:
+                done.add(record['id'])
+    return done
+
+
+@dataclass
+class BatchStats:
+    ok: int = 0
+    errors: int = 0
+    skipped: int = 0
+    invalid: int = 0
+    malformed: List[int] = field(default_factory=list)   # JSONL line numbers that didn't parse
+    latencies: List[float] = field(default_factory=list)
+    started: float = field(default_factory=time.perf_counter)
+
+    def render(self) -> str:
+        elapsed = time.perf_counter() - self.started
+        ran = self.ok + self.errors
+        lines = [
+            f"📊 {ran} items in {elapsed:.1f}s ({ran / elapsed if elapsed else 0:.2f} items/s), "
+            f"{self.ok} ok, {self.errors} errors ({self.errors / ran if ran else 0:.1%}), "
+            f"{self.skipped} already done, {self.invalid} empty inputs",
+        ]
+        if self.malformed:
+            shown = ", ".join(map(str, self.malformed[:10])) + (", ..." if len(self.malformed) > 10 else "")
+            lines.append(f"⚠️ {len(self.malformed)} malformed lines skipped: {shown}")
+        if self.latencies:
+            ordered = sorted(self.latencies)
+            lines.append(f"⏱️ per item: p50 {statistics.median(ordered):.1f}s, "
+                         f"p95 {ordered[max(int(len(ordered) * 0.95) - 1, 0)]:.1f}s")
+        return "\n".join(lines)
+
+
+def run_batch(input_path: str, output_path: str, concurrency: int = 4,
+              check: Optional[Callable[[str], object]] = None, retry_errors: bool = True,
+              fsync_every: float = 5.0) -> BatchStats:
+    """Fact-check every input, appending one JSON line per item to ``output_path``.
+
+    Up to ``concurrency`` items run at once; inputs are read lazily so
+    only about twice that many are held in memory. Each result line is
+    flushed as soon as it completes (and fsynced every ``fsync_every``
+    seconds), so the output doubles as the checkpoint a rerun resumes
+    from. When an ID appears twice (an error later retried), the last
+    line wins.
+    """
+    from .warm import fact_check, result_payload
+
+    check = check or fact_check
+    stats = BatchStats()
+    done = completed_ids(output_path, retry_errors)
+    write_lock = threading.Lock()
+    last_sync = [time.monotonic()]
+
+    out = open(output_path, 'a', encoding='utf-8')
+    if out.tell() > 0:
+        with open(output_path, 'rb') as tail:
+            tail.seek(-1, os.SEEK_END)
+            if tail.read(1) != b"\n":
+                out.write("\n")  # fence off a line torn by a crash
+
+    def write(record: Dict):
+        with write_lock:
+            out.write(json.dumps(record, ensure_ascii=False) + "\n")
+            out.flush()
+            if time.monotonic() - last_sync[0] >= fsync_every:
+                os.fsync(out.fileno())
+                last_sync[0] = time.monotonic()
+
+    def process(item_id: str, content: str):
+        start = time.perf_counter()
+        try:
+            record = {'id': item_id, 'input': content, 'status': 'ok', **result_payload(check(content))}
+        except Exception as e:
+            record = {'id': item_id, 'input': content, 'status': 'error', 'error': f"{type(e).__name__}: {e}"}
+        record['seconds'] = round(time.perf_counter() - start, 3)
+        write(record)
+        return record
+
+    try:
+        with ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix='batch') as pool:
+            pending = set()
+            for item_id, content in read_inputs(input_path):
+                if content is None:
+                    stats.malformed.append(int(item_id))
+                    continue
+                if item_id in done:
+                    stats.skipped += 1
+                    continue
+                if not content.strip():
+                    stats.invalid += 1
+                    continue
+                if len(pending) >= concurrency * 2:
+                    finished, pending = wait(pending, return_when=FIRST_COMPLETED)
+                    _tally(stats, finished)
+                pending.add(pool.submit(process, item_id, content))
+            _tally(stats, pending)
+    finally:
+        with write_lock:
+            out.flush()
+            os.fsync(out.fileno())
+            out.close()
+    return stats
+
+
+def _tally(stats: BatchStats, futures):
+    for future in wait(futures).done:
+        record = future.result()
+        if record['status'] == 'ok':
+            stats.ok += 1
+        else:
+            stats.errors += 1
+        stats.latencies.append(record['seconds'])
+        if (stats.ok + stats.errors) % 100 == 0:
+            print(f"… {stats.ok + stats.errors} done, {stats.errors} errors")
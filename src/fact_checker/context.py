@@ -0,0 +1,184 @@
+import os
+import re
+from dataclasses import dataclass
+from typing import Callable, List, Optional
+
+from crewai import Task
+from pydantic import Field, PrivateAttr
+
+from .progress import TASK_STARTED, publish
+from .tools.relevance import bm25_scores, split_passages, tokenize
+from .tools.tracing import span
+
+DIVIDER = "\n\n----------\n\n"
+# A URL ending a sentence keeps its last character but not the full stop.
+_URL = re.compile(r"https?://[^\s<>\"')\]]*[^\s<>\"')\].,;:!?]")
+_PARAGRAPH = re.compile(r"\n\s*\n")
+
+_encoder: Optional[Callable[[str], int]] = None
+
+
+def count_tokens(text: str) -> int:
+    """Token count via tiktoken's cl100k encoding, else ~4 characters per token."""
+    global _encoder
+    if _encoder is None:
+        try:
+            import tiktoken
+
+            encoding = tiktoken.get_encoding("cl100k_base")
+            _encoder = lambda s: len(encoding.encode(s, disallowed_special=()))  # noqa: E731
+        except Exception:
+            _encoder = lambda s: (len(s) + 3) // 4  # noqa: E731
+    return _encoder(text)
+
+
+@dataclass
+class CompactionReport:
+    task: str
+    prompt_tokens: int
+    context_tokens_in: int
+    context_tokens_out: int
+    duplicates_dropped: int = 0
+    passages_trimmed: int = 0
+
+    def render(self) -> str:
+        line = f"📏 {self.task}: prompt ~{self.prompt_tokens} tokens"
+        if self.context_tokens_in:
+            line += (f" (context {self.context_tokens_in} → {self.context_tokens_out}, "
+                     f"{self.duplicates_dropped} duplicate and {self.passages_trimmed} "
+                     f"over-budget passages dropped)")
+        return line
+
+
+def _passages(block: str) -> List[str]:
+    out = []
+    for paragraph in _PARAGRAPH.split(block):
+        paragraph = paragraph.strip()
+        if paragraph:
+            out.extend(split_passages(paragraph, 600) if len(paragraph) > 1200 else [paragraph])
+    return out
+
+
+def _covered(terms: set, kept: List[set], threshold: float = 0.8) -> bool:
+    """True if a kept passage has 80% of ``terms`` and every number in them."""
+    if not terms:
+        return False
+    numbers = {t for t in terms if any(c.isdigit() for c in t)}
+    return any(numbers <= other and len(terms & other) >= threshold * len(terms) for other in kept)
+
+
+def compact_context(context: str, budget: int, focus: str = ""):
+    """Deduplicate and budget the upstream task outputs handed to a task.
+
+    ``context`` is crewai's join of upstream outputs, oldest first. Later
+    outputs (e.g. the analysis) usually restate what earlier ones (raw
+    research) said, so passages are kept newest-first and an earlier
+    passage is dropped when a kept one has 80% of its terms and all of its
+    numbers.
+    Past ``budget`` tokens, earlier outputs lose their least relevant
+    passages (BM25 against ``focus`` plus the newest output) first. A
+    digest lists the source URLs of dropped passages so citations survive.
+    Returns ``(compacted, duplicates_dropped, passages_trimmed)``.
+    """
+    blocks = [b for b in context.split(DIVIDER) if b.strip()]
+    if not blocks:
+        return context, 0, 0
+
+    kept_terms: List[set] = []
+    kept: List[List[str]] = []
+    dropped = 0
+    for block in reversed(blocks):
+        block_kept = []
+        for passage in _passages(block):
+            terms = set(tokenize(passage))
+            if _covered(terms, kept_terms):
+                dropped += 1
+                continue
+            kept_terms.append(terms)
+            block_kept.append(passage)
+        kept.append(block_kept)
+    kept.reverse()
+
+    sources = list(dict.fromkeys(_URL.findall(context)))
+
+    def render(selection: List[List[str]]) -> str:
+        body = DIVIDER.join("\n\n".join(passages) for passages in selection if passages)
+        missing = [url for url in sources if url not in body]
+        if not missing:
+            return body
+        return body + "\n\nOther sources seen upstream:\n" + "\n".join(f"- {url}" for url in missing)
+
+    compacted = render(kept)
+    trimmed = 0
+    if count_tokens(compacted) > budget and len(kept) > 1:
+        # Rank passages of the earlier outputs; the newest is kept whole.
+        query = tokenize(focus + " " + " ".join(kept[-1]))
+        candidates = [(b, i) for b in range(len(kept) - 1) for i in range(len(kept[b]))]
+        scores = bm25_scores(query, [tokenize(kept[b][i]) for b, i in candidates])
+        fixed = count_tokens(render([[] for _ in kept[:-1]] + [kept[-1]]))
+        ranked = sorted(zip(scores, candidates), key=lambda pair: -pair[0])
+        chosen, used = set(), fixed
+        for _, (b, i) in ranked:
+            cost = count_tokens(kept[b][i]) + 2
+            if used + cost <= budget:
+                chosen.add((b, i))
+                used += cost
+        trimmed = len(candidates) - len(chosen)
+        kept = [[p for i, p in enumerate(passages) if (b, i) in chosen] for b, passages in enumerate(kept[:-1])] \
+            + [kept[-1]]
+        compacted = render(kept)
+    return compacted, dropped, trimmed
+
+
+class CompactContextTask(Task):
+    """Task that compacts the context it receives from upstream tasks.
+
+    crewai hands each task the raw outputs of its ``context`` tasks joined
+    together, so the verifier would otherwise read the research report
+    twice: once on its own and once restated inside the analysis. The
+    prompt size of every run is printed and kept on ``last_report``.
+    Synchronous runs are traced as a ``task`` span.
+    """
+
+    context_budget: int = Field(
+        default_factory=lambda: int(os.getenv('FACT_CHECKER_CONTEXT_TOKENS', 6000)),
+        description="Token budget for the upstream context passed to this task",
+    )
+    _last_report: Optional[CompactionReport] = PrivateAttr(default=None)
+
+    @property
+    def last_report(self) -> Optional[CompactionReport]:
+        return self._last_report
+
+    def _compact(self, context: Optional[str]) -> Optional[str]:
+        before = after = 0
+        dropped = trimmed = 0
+        if context and os.getenv('FACT_CHECKER_CONTEXT_COMPACTION', '1') != '0':
+            before = count_tokens(context)
+            context, dropped, trimmed = compact_context(context, self.context_budget, self.description)
+            after = count_tokens(context)
+        elif context:
+            before = after = count_tokens(context)
+        report = CompactionReport(
+            task=self.name or self.description[:40],
+            prompt_tokens=count_tokens(self.prompt()) + after,
+            context_tokens_in=before,
+            context_tokens_out=after,
+            duplicates_dropped=dropped,
+            passages_trimmed=trimmed,
+        )
+        self._last_report = report
+        print(report.render())
+        return context
+
+    def execute_sync(self, agent=None, context=None, tools=None):
+        label = self.name or self.description[:40]
+        role = getattr(agent or self.agent, 'role', '')
+        with span('task', label, agent=role.strip()) as traced:
+            publish(TASK_STARTED, label, agent=role.strip())
+            context = self._compact(context)
+            traced.set('context_tokens', self._last_report.context_tokens_out)
+            return super().execute_sync(agent, context, tools)
+
+    def execute_async(self, agent=None, context=None, tools=None):
+        return super().execute_async(agent, self._compact(context), tools)
@@ -1,16 +1,20 @@
 from crewai import Agent, Crew, Process, Task
-from crewai.project import CrewBase, agent, crew, task
+from crewai.project import CrewBase, agent, crew, task, after_kickoff, before_kickoff
 from .tools.youtube_tool import YouTubeTranscriptTool
 from .tools.web_scraping_tool import WebScrapingTool
+from .tools.search_tool import SearchTool
+from .tools import search_tool
+from .tools.evidence_index import evidence_index
+from .tools.vector_index import vector_index
+from .tools.disk_cache import all_stats
+from .models import ClaimAnalysis, ClaimList, ClaimVerdict
+from .llm import build_llm
+from .context import CompactContextTask
+from .routing import route
+from .progress import TASK_FINISHED, TOOL, publish
+from .tools import tracing
 import os
 
-# Try to import SerperDevTool
-try:
-    from crewai_tools import SerperDevTool
-    SERPER_AVAILABLE = True
-except ImportError:
-    SERPER_AVAILABLE = False
-    print("⚠️ SerperDevTool not available, web search will be limited")
 
 
 @CrewBase
@@ -26,20 +30,60 @@ class FactChecker:
 
         # Decide availability
         self.use_openai = bool(self.openai_key)
-        self.use_serper = bool(self.serper_key and SERPER_AVAILABLE)
+        self.use_serper = bool(self.serper_key)
 
         if not self.use_openai and not self.use_serper:
             raise RuntimeError(
                 "❌ No valid API backend: please set OPENAI_API_KEY or SERPER_API_KEY"
             )
 
+        # Tools are stateless (their caches are process-wide), so every
+        # agent and every crew built from this instance shares one of each.
+        self.youtube_tool = YouTubeTranscriptTool()
+        self.scraping_tool = WebScrapingTool()
+        self.search_tool = SearchTool(scraper=self.scraping_tool) if self.use_serper else None
+        # Verdicts rest on live results: only research answers from stored evidence.
+        self.live_search_tool = (SearchTool(scraper=self.scraping_tool, use_local_evidence=False)
+                                 if self.use_serper else None)
+        if self.search_tool is not None:
+            vector_index()  # starts embedding stored evidence in the background
+        self._llms = {}
+
+        tracing.trace_crews()
+        tracing.serve_metrics()
+
+    def _llm(self, name: str):
+        """One LLM client per agent config, with its ``llm_cache`` mode applied."""
+        if name not in self._llms:
+            self._llms[name] = build_llm(self.agents_config[name])
+        return self._llms[name]
+
+    def step_callback(self, step):
+        """Crew ``step_callback``: reports every tool an agent invokes."""
+        tool = getattr(step, 'tool', None)
+        if tool:
+            publish(TOOL, tool, str(getattr(step, 'tool_input', ''))[:500],
+                    result_chars=len(str(getattr(step, 'result', '') or '')))
+
+    def task_callback(self, output):
+        """Crew ``task_callback``: hands each finished task's output to the listener."""
+        publish(TASK_FINISHED, output.name or output.description[:40], output.raw, agent=output.agent)
+
+    def _content_tools(self) -> list:
+        return [self.youtube_tool, self.scraping_tool]
+
+    def _search_tools(self) -> list:
+        return [self.search_tool] if self.search_tool else []
+
+    def _verification_tools(self) -> list:
+        return [self.live_search_tool] if self.live_search_tool else []
+
     @agent
     def fact_researcher(self) -> Agent:
-        tools = [YouTubeTranscriptTool(), WebScrapingTool()]
-        if self.use_serper:
-            tools.append(SerperDevTool())
+        tools = self._content_tools() + self._search_tools()
         return Agent(
             config=self.agents_config['fact_researcher'],
+            llm=self._llm('fact_researcher'),
             verbose=True,
             tools=tools
         )
@@ -48,31 +92,30 @@ class FactChecker:
     def content_analyzer(self) -> Agent:
         return Agent(
             config=self.agents_config['content_analyzer'],
+            llm=self._llm('content_analyzer'),
             verbose=True,
-            tools=[YouTubeTranscriptTool(), WebScrapingTool()]
+            tools=self._content_tools()
         )
 
     @agent
     def fact_verifier(self) -> Agent:
-        tools = []
-        if self.use_serper:
-            tools.append(SerperDevTool())
         return Agent(
             config=self.agents_config['fact_verifier'],
+            llm=self._llm('fact_verifier'),
             verbose=True,
-            tools=tools
+            tools=self._verification_tools()
         )
 
     @task
     def research_task(self) -> Task:
-        return Task(
+        return CompactContextTask(
             config=self.tasks_config['research_task'],
             agent=self.fact_researcher()
         )
 
     @task
     def content_analysis_task(self) -> Task:
-        return Task(
+        return CompactContextTask(
             config=self.tasks_config['content_analysis_task'],
             agent=self.content_analyzer(),
             context=[self.research_task()]
@@ -80,12 +123,138 @@ class FactChecker:
 
     @task
     def verification_task(self) -> Task:
-        return Task(
+        return CompactContextTask(
             config=self.tasks_config['verification_task'],
             agent=self.fact_verifier(),
             context=[self.research_task(), self.content_analysis_task()]
         )
 
+    def claim_extraction_crew(self) -> Crew:
+        """Single-task crew that lists the claims in one segment of a long input.
+
+        Builds fresh Agent/Task objects on every call so several can run
+        in parallel without sharing executor state.
+        """
+        analyzer = Agent(
+            config=self.agents_config['content_analyzer'],
+            llm=self._llm('content_analyzer'),
+            verbose=False,
+        )
+        extraction = CompactContextTask(
+            name='claim_extraction_task',
+            config=self.tasks_config['claim_extraction_task'],
+            agent=analyzer,
+            output_pydantic=ClaimList,
+        )
+        return Crew(agents=[analyzer], tasks=[extraction], process=Process.sequential, verbose=False,
+                    step_callback=self.step_callback, task_callback=self.task_callback)
+
+    def merged_verification_crew(self) -> Crew:
+        """The verification_task stage fed with an explicit ``{claims}`` list."""
+        verifier = Agent(
+            config=self.agents_config['fact_verifier'],
+            llm=self._llm('fact_verifier'),
+            verbose=True,
+            tools=self._verification_tools(),
+        )
+        config = self.tasks_config['verification_task']
+        verification = CompactContextTask(
+            name='verification_task',
+            description=config['description'] + "\nClaims to verify:\n{claims}\n",
+            expected_output=config['expected_output'],
+            agent=verifier,
+        )
+        return Crew(agents=[verifier], tasks=[verification], process=Process.sequential, verbose=True,
+                    step_callback=self.step_callback, task_callback=self.task_callback)
+
+    def analysis_crew(self) -> Crew:
+        """Research + analysis stages only, ending in a structured claim list."""
+        researcher = Agent(
+            config=self.agents_config['fact_researcher'],
+            llm=self._llm('fact_researcher'),
+            verbose=True,
+            tools=self._content_tools() + self._search_tools(),
+        )
+        analyzer = Agent(
+            config=self.agents_config['content_analyzer'],
+            llm=self._llm('content_analyzer'),
+            verbose=True,
+            tools=self._content_tools(),
+        )
+        research = CompactContextTask(name='research_task', config=self.tasks_config['research_task'],
+                                      agent=researcher)
+        analysis = CompactContextTask(
+            name='content_analysis_task',
+            config=self.tasks_config['content_analysis_task'],
+            agent=analyzer,
+            context=[research],
+            output_pydantic=ClaimAnalysis,
+        )
+        return Crew(
+            agents=[researcher, analyzer],
+            tasks=[research, analysis],
+            process=Process.sequential,
+            verbose=True,
+            step_callback=self.step_callback,
+            task_callback=self.task_callback,
+        )
+
+    def claim_verification_crew(self) -> Crew:
+        """Verifies one claim; fresh objects per call so many can run at once."""
+        verifier = Agent(
+            config=self.agents_config['fact_verifier'],
+            llm=self._llm('fact_verifier'),
+            verbose=False,
+            tools=self._verification_tools(),
+        )
+        verification = CompactContextTask(
+            name='claim_verification_task',
+            config=self.tasks_config['claim_verification_task'],
+            agent=verifier,
+            output_pydantic=ClaimVerdict,
+        )
+        return Crew(agents=[verifier], tasks=[verification], process=Process.sequential, verbose=False,
+                    step_callback=self.step_callback, task_callback=self.task_callback)
+
+    @before_kickoff
+    def route_input(self, inputs):
+        """Fetch a linked video or page up front so research starts from content.
+
+        Inputs that were already routed (they carry ``input_kind``) pass
+        through unchanged.
+        """
+        if inputs and 'input_content' in inputs and 'input_kind' not in inputs:
+            routed = route(inputs['input_content'], self.youtube_tool, self.scraping_tool)
+            inputs = {**inputs, **routed.as_inputs()}
+        return inputs
+
+    @after_kickoff
+    def report_cache_stats(self, result):
+        for name, stats in all_stats().items():
+            print(
+                f"📦 {name} cache: {stats['hits']} hits, {stats['revalidated']} revalidated, "
+                f"{stats['misses'] + stats['stale'] - stats['revalidated']} fetched, "
+                f"{stats['evictions']} evicted (hit rate {stats['hit_rate']:.0%})"
+            )
+        searches = search_tool.stats()
+        if searches['api_calls'] or searches['coalesced'] or searches['local_answers']:
+            print(
+                f"🔎 search: {searches['api_calls']} API calls, {searches['coalesced']} coalesced, "
+                f"{searches['stale_served']} served stale, {searches['local_answers']} answered "
+                f"from local evidence"
+            )
+        index = evidence_index()
+        if index is not None:
+            evidence = index.stats()
+            print(f"📚 evidence index: {evidence['passages']:,} passages in {evidence['segments']} segments, "
+                  f"{evidence['added']} added this process")
+        vectors = vector_index()
+        if vectors is not None:
+            dense = vectors.stats()
+            print(f"🧭 vector index: {dense['rows']:,} passages embedded, {dense['ivf_lists']} IVF lists, "
+                  f"{dense['queries']} searches this process")
+        return result
+
     @crew
     def crew(self) -> Crew:
         """Creates the fact checking crew"""
@@ -94,4 +263,6 @@ class FactChecker:
             tasks=[self.research_task(), self.content_analysis_task(), self.verification_task()],
             process=Process.sequential,
             verbose=True,
+            step_callback=self.step_callback,
+            task_callback=self.task_callback,
         )
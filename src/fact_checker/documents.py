@@ -0,0 +1,317 @@
+"""Text of uploaded documents (PDF, Word, plain text) within page and size budgets.
+
+    document = read_document(upload, upload.name)   # whole text, budgets applied
+    for number, text in iter_pdf_pages(path):        # or page by page, lazily
+        ...
+
+PDF pages are extracted in a process pool (``FACT_CHECKER_DOC_WORKERS``)
+because text extraction is pure-Python CPU work that threads can't
+spread. Pages are handed out in small ranges and yielded in order as
+they finish, with at most two ranges per worker in flight, so a consumer
+such as ``pipeline.iter_segments`` holds a few pages at a time and an
+abandoned iteration cancels the rest.
+"""
+import io
+import os
+import tempfile
+import threading
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass, field
+from multiprocessing import get_context
+from pathlib import Path
+from typing import BinaryIO, Dict, Iterator, List, Optional, Tuple, Union
+
+# Below this many pages the pool's start-up and pickling cost more than
+# extracting in-process.
+PARALLEL_MIN_PAGES = 8
+# A pypdf reader keeps every object it has parsed, so each range of
+# pages covering about this much of the file gets a fresh one: memory then
+# holds the file (which the reader loads whole) and one range's pages,
+# not the whole document's. Opening a reader costs a parse of the file's
+# structure, so ranges are at least 8 pages and at most 256.
+READER_BYTES = 4 * 1024 * 1024
+
+
+@dataclass
+class Document:
+    text: str
+    pages: int = 0          # pages extracted (PDF only)
+    total_pages: int = 0
+    truncated: bool = False
+    unreadable: List[int] = field(default_factory=list)   # PDF pages whose text couldn't be extracted
+    chars: int = 0          # characters kept, also for a PDF streamed by ``open_document``
+
+    @property
+    def notice(self) -> str:
+        """Why part of the document was left out, or ''."""
+        if not self.truncated:
+            return ''
+        if self.pages < self.total_pages:
+            return f"Only the first {self.pages} of {self.total_pages} pages were checked."
+        return f"Only the first {self.chars:,} characters were checked."
+
+    @property
+    def unreadable_notice(self) -> str:
+        """Which pages were skipped as unreadable, or ''."""
+        if not self.unreadable:
+            return ''
+        shown = ', '.join(map(str, self.unreadable[:10])) + (', ...' if len(self.unreadable) > 10 else '')
+        return f"{len(self.unreadable)} page(s) could not be read and were skipped: {shown}."
+
+
+def max_bytes() -> int:
+    return int(float(os.getenv('FACT_CHECKER_DOC_MAX_MB', 50)) * 1024 * 1024)
+
+
+def max_pages() -> int:
+    return int(os.getenv('FACT_CHECKER_DOC_MAX_PAGES', 500))
+
+
+def max_chars() -> int:
+    return int(os.getenv('FACT_CHECKER_DOC_MAX_CHARS', 1_000_000))
+
+
+def default_workers() -> int:
+    return int(os.getenv('FACT_CHECKER_DOC_WORKERS', min(4, os.cpu_count() or 1)))
+
+
+def _pdf_reader(source):
+    try:
+        from pypdf import PdfReader
+    except ImportError:
+        from PyPDF2 import PdfReader
+    return PdfReader(source)
+
+
+def _page_text(page) -> Optional[str]:
+    """The page's text, or None if it can't be extracted.
+
+    One malformed page shouldn't lose the rest of the document. None
+    rather than a message because this runs in worker processes, whose
+    output nobody sees; the reader of the pages reports it.
+    """
+    try:
+        return page.extract_text() or ''
+    except Exception:
+        return None
+
+
+def _extract_range(path: str, start: int, stop: int) -> List[Optional[str]]:
+    pages = _pdf_reader(path).pages
+    return [_page_text(pages[i]) for i in range(start, stop)]
+
+
+_pools: Dict[int, ProcessPoolExecutor] = {}
+_pool_lock = threading.Lock()
+
+
+def _get_pool(workers: int) -> ProcessPoolExecutor:
+    """Process-wide extraction pool of ``workers`` processes.
+
+    Workers are spawned, not forked, since the callers (Streamlit, the job
+    service) are multi-threaded. There is one pool per size, so a caller
+    asking for another size never shuts down a pool that another
+    iteration is still reading from.
+    """
+    with _pool_lock:
+        pool = _pools.get(workers)
+        if pool is None:
+            pool = _pools[workers] = ProcessPoolExecutor(max_workers=workers, mp_context=get_context('spawn'))
+        return pool
+
+
+def _discard_pool(workers: int):
+    with _pool_lock:
+        _pools.pop(workers, None)
+
+
+def iter_pdf_pages(path: Union[str, Path], limit: Optional[int] = None,
+                   workers: Optional[int] = None) -> Iterator[Tuple[int, Optional[str]]]:
+    """``(page number, text)`` of the first ``limit`` pages of a PDF, in order.
+
+    ``text`` is None for a page that couldn't be read.
+
+    With ``workers`` > 1 and at least ``PARALLEL_MIN_PAGES`` pages, ranges
+    of pages are extracted in the process pool; otherwise pages are read
+    one at a time as the caller asks for them.
+    """
+    total = len(_pdf_reader(str(path)).pages)
+    return _iter_pages(str(path), total if limit is None else min(limit, total), workers)
+
+
+def _pages_per_reader(path: str, total: int) -> int:
+    per_page = os.path.getsize(path) / max(total, 1)
+    return max(8, min(256, int(READER_BYTES / max(per_page, 1))))
+
+
+def _iter_pages(path: str, total: int, workers: Optional[int],
+                first: int = 0) -> Iterator[Tuple[int, Optional[str]]]:
+    workers = default_workers() if workers is None else workers
+    per_reader = _pages_per_reader(path, total)
+    if workers <= 1 or total - first < PARALLEL_MIN_PAGES:
+        for start in range(first, total, per_reader):
+            pages = _pdf_reader(path).pages
+            for i in range(start, min(start + per_reader, total)):
+                yield i + 1, _page_text(pages[i])
+        return
+    step = max(1, min(per_reader, (total - first) // (workers * 4)))
+    ranges = iter([(start, min(start + step, total)) for start in range(first, total, step)])
+    pending = deque()
+    done = first
+    try:
+        pool = _get_pool(workers)
+        for start, stop in ranges:
+            pending.append((start, pool.submit(_extract_range, path, start, stop)))
+            if len(pending) >= 2 * workers:
+                break
+        while pending:
+            start, future = pending.popleft()
+            texts = future.result()
+            following = next(ranges, None)
+            if following is not None:
+                pending.append((following[0], pool.submit(_extract_range, path, *following)))
+            for offset, text in enumerate(texts):
+                done = start + offset + 1
+                yield done, text
+    except BrokenProcessPool:
+        # A worker died (out of memory, killed): finish in this process.
+        _discard_pool(workers)
+        yield from _iter_pages(path, total, 1, first=done)
+    finally:
+        for _, future in pending:
+            future.cancel()
+
+
+def _pdf_parts(path: str, document: Document, workers: Optional[int],
+               temporary: bool = False) -> Iterator[str]:
+    """Page texts of a PDF within the page and character budgets.
+
+    ``document`` is updated as pages are read: pages extracted, characters
+    kept, unreadable pages and whether anything was cut. A ``temporary``
+    file is deleted once the pages are read.
+    """
+    budget, kept = max_chars(), 0
+    pages = _iter_pages(path, min(document.total_pages, max_pages()), workers)
+    try:
+        for document.pages, text in pages:
+            if text is None:
+                document.unreadable.append(document.pages)
+                continue
+            room = budget - document.chars - (1 if kept else 0)   # parts are joined with '\n'
+            if len(text) > room:
+                document.truncated = True
+                text = text[:max(room, 0)]
+            document.chars += len(text) + (1 if kept else 0)
+            kept += 1
+            yield text
+            if document.truncated and document.chars >= budget:
+                break
+    finally:
+        pages.close()
+        if temporary:
+            os.unlink(path)
+    if document.unreadable:
+        print(f"⚠️ Skipped {len(document.unreadable)} unreadable PDF page(s): {document.unreadable[:10]}")
+
+
+def _read_docx(data: bytes) -> Document:
+    from docx import Document as WordDocument
+
+    text = '\n'.join(p.text for p in WordDocument(io.BytesIO(data)).paragraphs)
+    return Document(text[:max_chars()], truncated=len(text) > max_chars(), chars=min(len(text), max_chars()))
+
+
+def _read_txt(data: bytes) -> Document:
+    for encoding in ('utf-8', 'utf-16', 'latin-1', 'cp1252'):
+        try:
+            text = data.decode(encoding)
+            break
+        except UnicodeDecodeError:
+            continue
+    else:
+        raise ValueError("Unable to decode text file. Please ensure UTF-8 encoding.")
+    return Document(text[:max_chars()], truncated=len(text) > max_chars(), chars=min(len(text), max_chars()))
+
+
+def _size(source: Union[str, Path, bytes, BinaryIO]) -> int:
+    if isinstance(source, (str, Path)):
+        return os.path.getsize(source)
+    if isinstance(source, bytes):
+        return len(source)
+    source.seek(0, io.SEEK_END)
+    size = source.tell()
+    source.seek(0)
+    return size
+
+
+def open_document(source: Union[str, Path, bytes, BinaryIO], name: Optional[str] = None,
+                  workers: Optional[int] = None) -> Tuple[Document, Iterator[str]]:
+    """``read_document`` without holding a PDF's text: ``(document, parts)``.
+
+    For a PDF, ``parts`` yields page texts as they are extracted, and
+    ``document`` (whose ``text`` stays empty) gets its page counts,
+    ``truncated`` and ``unreadable`` filled in as they are read. Other
+    formats are read whole and their text is the only part. Feed the
+    parts to ``warm.fact_check`` or ``pipeline.iter_segments``.
+    """
+    if isinstance(source, (str, Path)):
+        name = name or str(source)
+    size = _size(source)
+    if size > max_bytes():
+        raise ValueError(f"File is {size / 1024 / 1024:.1f} MB; the limit is {max_bytes() / 1024 / 1024:.1f} MB.")
+    suffix = Path(name or '').suffix.lower()
+    if suffix == '.pdf':
+        if isinstance(source, (str, Path)):
+            path, temporary = str(source), False
+        else:
+            # Worker processes open the file by path.
+            data = source if isinstance(source, bytes) else source.read()
+            with tempfile.NamedTemporaryFile(suffix='.pdf', delete=False) as handle:
+                handle.write(data)
+            path, temporary = handle.name, True
+        try:
+            total = len(_pdf_reader(path).pages)
+        except Exception:
+            if temporary:
+                os.unlink(path)
+            raise
+        document = Document('', total_pages=total, truncated=total > max_pages())
+        return document, _pdf_parts(path, document, workers, temporary)
+    if isinstance(source, (str, Path)):
+        data = Path(source).read_bytes()
+    else:
+        data = source if isinstance(source, bytes) else source.read()
+    if suffix == '.docx':
+        document = _read_docx(data)
+    elif suffix == '.txt':
+        document = _read_txt(data)
+    else:
+        raise ValueError("Unsupported format. Please upload a PDF, Word document, or text file.")
+    return document, iter([document.text])
+
+
+def read_document(source: Union[str, Path, bytes, BinaryIO], name: Optional[str] = None,
+                  workers: Optional[int] = None) -> Document:
+    """Text of a PDF, .docx or .txt file given as a path, bytes or a file object.
+
+    The format comes from ``name`` (or the path). Files over
+    ``FACT_CHECKER_DOC_MAX_MB`` are refused with ``ValueError``; text past
+    ``FACT_CHECKER_DOC_MAX_PAGES`` pages or ``FACT_CHECKER_DOC_MAX_CHARS``
+    characters is left out and the result is marked ``truncated``.
+    """
+    # Imported here: spawned extraction workers import this module, and
+    # the tools package would drag CrewAI into every one of them.
+    from .tools.tracing import span
+
+    if isinstance(source, (str, Path)):
+        name = name or str(source)
+    suffix = Path(name or '').suffix.lower()
+    with span('document', suffix.lstrip('.'), bytes=_size(source)) as traced:
+        document, parts = open_document(source, name, workers)
+        document.text = '\n'.join(parts)
+        if suffix == '.pdf':
+            traced.set('pages', document.pages).set('unreadable', len(document.unreadable))
+        traced.set('chars', len(document.text)).set('truncated', document.truncated)
+        return document
@@ -0,0 +1,91 @@
+import hashlib
+import os
+import re
+import threading
+from typing import List, Optional
+
+import numpy as np
+
+_WORD = re.compile(r"\w+")
+
+
+class Embedder:
+    """Maps texts to L2-normalised float32 vectors, one row per text."""
+
+    dim: int = 0
+    name: str = "base"
+
+    def embed(self, texts: List[str]) -> np.ndarray:
+        raise NotImplementedError
+
+
+class HashingEmbedder(Embedder):
+    """Dependency-free embedder: hashed word unigrams, bigrams and char trigrams.
+
+    Not semantic: robust to reordering, punctuation and small wording
+    changes, which is what near-duplicate prompts differ by, but a real
+    paraphrase scores near zero and unrelated texts sharing words score
+    high. It stands in for a model in tests and benchmarks; the evidence
+    vector index is not built on it.
+    """
+
+    def __init__(self, dim: int = 1024):
+        self.dim = dim
+        self.name = f"hashing-{dim}"
+
+    def _features(self, text: str) -> List[str]:
+        words = _WORD.findall(text.lower())
+        feats = words + [f"{a} {b}" for a, b in zip(words, words[1:])]
+        for word in words:
+            padded = f"#{word}#"
+            feats.extend(padded[i:i + 3] for i in range(len(padded) - 2))
+        return feats
+
+    def embed(self, texts: List[str]) -> np.ndarray:
+        out = np.zeros((len(texts), self.dim), dtype=np.float32)
+        for row, text in enumerate(texts):
+            for feat in self._features(text):
+                h = int.from_bytes(hashlib.blake2b(feat.encode(), digest_size=8).digest(), "little")
+                out[row, h % self.dim] += 1.0 if (h >> 63) & 1 else -1.0
+        norms = np.linalg.norm(out, axis=1, keepdims=True)
+        norms[norms == 0] = 1.0
+        return out / norms
+
+
+class SentenceTransformerEmbedder(Embedder):
+    """Local CPU sentence-transformers model, batched."""
+
+    def __init__(self, model_name: str, batch_size: int = 64):
+        from sentence_transformers import SentenceTransformer
+
+        self.model = SentenceTransformer(model_name, device="cpu")
+        self.name = model_name
+        self.dim = self.model.get_sentence_embedding_dimension()
+        self.batch_size = batch_size
+
+    def embed(self, texts: List[str]) -> np.ndarray:
+        vectors = self.model.encode(
+            texts, batch_size=self.batch_size, normalize_embeddings=True, show_progress_bar=False
+        )
+        return np.asarray(vectors, dtype=np.float32)
+
+
+_embedder: Optional[Embedder] = None
+_embedder_lock = threading.Lock()
+
+
+def get_embedder() -> Embedder:
+    """Process-wide embedder: ``FACT_CHECKER_EMBEDDING_MODEL`` if set, else hashing."""
+    global _embedder
+    if _embedder is None:
+        with _embedder_lock:
+            if _embedder is None:
+                model = os.getenv("FACT_CHECKER_EMBEDDING_MODEL")
+                if model:
+                    try:
+                        _embedder = SentenceTransformerEmbedder(model)
+                    except ImportError:
+                        print("⚠️ sentence-transformers not installed, using hashing embeddings")
+                if _embedder is None:
+                    _embedder = HashingEmbedder()
+    return _embedder
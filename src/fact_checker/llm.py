@@ -0,0 +1,319 @@
+import hashlib
+import json
+import os
+import re
+import sqlite3
+import threading
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+from crewai import LLM
+
+from .context import count_tokens
+from .embeddings import Embedder, HashingEmbedder, get_embedder
+from .progress import TOKENS, publish
+from .tools.disk_cache import default_cache_dir, get_cache
+from .tools.tracing import span
+
+
+_NUMBER = re.compile(r"\d+(?:[.,]\d+)*")
+
+
+def _normalize(text: str) -> str:
+    return ' '.join(str(text).split())
+
+
+def _semantic_namespace(namespace: str, text: str) -> str:
+    # Prompts that differ only in a figure ("330 m" vs "530 m") embed almost
+    # identically but must never share an answer, so the numbers are part
+    # of the namespace rather than left to the similarity threshold.
+    numbers = ' '.join(_NUMBER.findall(text))
+    return namespace + ':' + hashlib.sha256(numbers.encode()).hexdigest()[:16]
+
+
+def semantic_available() -> bool:
+    """Whether a real embedding model (``FACT_CHECKER_EMBEDDING_MODEL``) is loaded.
+
+    Hashed features score prompts by shared words, and reused completions
+    here are verdicts, so without a model ``semantic`` caching is exact.
+    """
+    return not isinstance(get_embedder(), HashingEmbedder)
+
+
+class SemanticIndex:
+    """Prompt embeddings of cached responses, persisted in SQLite.
+
+    Vectors for a namespace are loaded into one matrix on first use and
+    searched with a single matrix-vector product. The ``meta`` table
+    records the embedding model and its dimension; vectors made by any
+    other model are dropped when the index opens.
+    """
+
+    def __init__(self, path=None, embedder: Optional[Embedder] = None):
+        self.path = path or default_cache_dir() / "llm_semantic.sqlite3"
+        self.embedder = embedder or get_embedder()
+        self._lock = threading.Lock()
+        self._matrices: Dict[str, Tuple[List[str], np.ndarray]] = {}
+        model = json.dumps({'model': self.embedder.name, 'dim': self.embedder.dim})
+        with self._connect() as conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS vectors ("
+                "namespace TEXT NOT NULL, key TEXT NOT NULL, vector BLOB NOT NULL, "
+                "PRIMARY KEY (namespace, key))"
+            )
+            conn.execute("CREATE TABLE IF NOT EXISTS meta (name TEXT PRIMARY KEY, value TEXT NOT NULL)")
+            row = conn.execute("SELECT value FROM meta WHERE name = 'embedder'").fetchone()
+            if row is None or row[0] != model:
+                conn.execute("DELETE FROM vectors")
+                conn.execute("INSERT OR REPLACE INTO meta (name, value) VALUES ('embedder', ?)", (model,))
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.path, timeout=30)
+        conn.execute("PRAGMA journal_mode=WAL")
+        return conn
+
+    def _matrix(self, namespace: str) -> Tuple[List[str], np.ndarray]:
+        if namespace not in self._matrices:
+            with self._connect() as conn:
+                rows = conn.execute(
+                    "SELECT key, vector FROM vectors WHERE namespace = ?", (namespace,)
+                ).fetchall()
+            keys = [row[0] for row in rows]
+            matrix = (
+                np.vstack([np.frombuffer(row[1], dtype=np.float32) for row in rows])
+                if rows else np.zeros((0, self.embedder.dim), dtype=np.float32)
+            )
+            self._matrices[namespace] = (keys, matrix)
+        return self._matrices[namespace]
+
+    def add(self, namespace: str, key: str, text: str):
+        vector = self.embedder.embed([text])[0]
+        with self._connect() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO vectors (namespace, key, vector) VALUES (?, ?, ?)",
+                (namespace, key, vector.tobytes()),
+            )
+        with self._lock:
+            keys, matrix = self._matrix(namespace)
+            self._matrices[namespace] = (keys + [key], np.vstack([matrix, vector[None, :]]))
+
+    def nearest(self, namespace: str, text: str, threshold: float) -> Optional[str]:
+        with self._lock:
+            keys, matrix = self._matrix(namespace)
+        if not keys:
+            return None
+        scores = matrix @ self.embedder.embed([text])[0]
+        best = int(np.argmax(scores))
+        return keys[best] if scores[best] >= threshold else None
+
+
+class LLMResponseCache:
+    """Exact (and optionally semantic) cache of LLM completions.
+
+    The exact key covers model, temperature, stop words, tool names and
+    the whitespace-normalised conversation. The semantic layer only
+    compares prompts within the same model/temperature/tools namespace
+    that also quote exactly the same numbers.
+    """
+
+    def __init__(self):
+        self.store = get_cache(
+            'llm',
+            ttl=float(os.getenv('FACT_CHECKER_LLM_CACHE_TTL', 24 * 3600)),
+            max_bytes=int(float(os.getenv('FACT_CHECKER_LLM_CACHE_MAX_MB', 256)) * 1024 * 1024),
+        )
+        self._semantic: Optional[SemanticIndex] = None
+        self._semantic_lock = threading.Lock()
+
+    @property
+    def semantic(self) -> SemanticIndex:
+        if self._semantic is None:
+            with self._semantic_lock:
+                if self._semantic is None:
+                    self._semantic = SemanticIndex()
+        return self._semantic
+
+    def keys(self, llm: LLM, messages: Any, tools: Optional[List[dict]]) -> Tuple[str, str, str]:
+        if isinstance(messages, str):
+            messages = [{"role": "user", "content": messages}]
+        tool_names = sorted(
+            (t.get("function", {}) or {}).get("name") or t.get("name", "") for t in tools or []
+        )
+        namespace = hashlib.sha256(json.dumps(
+            [llm.model, llm.temperature, llm.stop, tool_names], sort_keys=True, default=str
+        ).encode()).hexdigest()[:32]
+        conversation = [(m.get("role"), _normalize(m.get("content", ""))) for m in messages]
+        key = hashlib.sha256(json.dumps([namespace, conversation]).encode()).hexdigest()
+        # System prompts are fixed per agent; only the rest is worth embedding.
+        text = "\n".join(content for role, content in conversation if role != "system")
+        return namespace, key, text
+
+    def get(self, namespace: str, key: str, text: str, semantic_threshold: Optional[float] = None):
+        value = self.store.get(key)
+        if value is None and semantic_threshold is not None:
+            try:
+                match = self.semantic.nearest(_semantic_namespace(namespace, text), text, semantic_threshold)
+            except Exception as e:
+                # The semantic layer is an optimisation: a failure is a miss.
+                print(f"⚠️ Semantic LLM cache lookup failed: {e}")
+                match = None
+            if match is not None:
+                value = self.store.get(match)
+        return value
+
+    def put(self, namespace: str, key: str, text: str, response: str, semantic: bool = False):
+        self.store.put(key, response, meta={'namespace': namespace})
+        if semantic:
+            try:
+                self.semantic.add(_semantic_namespace(namespace, text), key, text)
+            except Exception as e:
+                print(f"⚠️ Semantic LLM cache update failed: {e}")
+
+
+_response_cache: Optional[LLMResponseCache] = None
+_response_cache_lock = threading.Lock()
+
+
+def response_cache() -> LLMResponseCache:
+    global _response_cache
+    if _response_cache is None:
+        with _response_cache_lock:
+            if _response_cache is None:
+                _response_cache = LLMResponseCache()
+    return _response_cache
+
+
+class CachedLLM(LLM):
+    """crewai LLM whose text completions go through ``LLMResponseCache``.
+
+    ``cache_mode`` is ``exact``, ``semantic`` (exact first, then nearest
+    prompt above ``semantic_threshold`` cosine similarity, when an
+    embedding model is configured) or ``off``.
+    Calls that hand the model executable functions are never cached.
+    Every call is traced as an ``llm`` span with its token counts, and
+    cache hits count no tokens.
+    """
+
+    def __init__(self, *args, cache_mode: str = 'exact', semantic_threshold: float = 0.97, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.cache_mode = cache_mode
+        self.semantic_threshold = semantic_threshold
+
+    def call(self, messages, tools=None, callbacks=None, available_functions=None, **kwargs):
+        with span('llm', self.model, cache_mode=self.cache_mode) as traced:
+            response, hit = self._call(messages, tools, callbacks, available_functions, **kwargs)
+            traced.set('cache_hit', hit)
+            if not hit and isinstance(response, str):
+                prompt = messages if isinstance(messages, str) else "\n".join(
+                    str(m.get('content') or '') for m in messages)
+                usage = {'prompt_tokens': count_tokens(prompt), 'completion_tokens': count_tokens(response)}
+                traced.set('prompt_tokens', usage['prompt_tokens']).set('completion_tokens', usage['completion_tokens'])
+                publish(TOKENS, self.model, **usage)
+            return response
+
+    def _call(self, messages, tools, callbacks, available_functions, **kwargs):
+        if self.cache_mode not in ('exact', 'semantic') or available_functions:
+            return super().call(messages, tools, callbacks, available_functions, **kwargs), False
+
+        cache = response_cache()
+        semantic = self.cache_mode == 'semantic' and semantic_available()
+        namespace, key, text = cache.keys(self, messages, tools)
+        cached = cache.get(namespace, key, text, self.semantic_threshold if semantic else None)
+        if cached is not None:
+            return cached, True
+
+        response = super().call(messages, tools, callbacks, available_functions, **kwargs)
+        if isinstance(response, str) and response.strip():
+            cache.put(namespace, key, text, response, semantic=semantic)
+        return response, False
+
+
+_TRANSIENT_ERRORS = frozenset({
+    'Timeout', 'APITimeoutError', 'TimeoutError', 'APIConnectionError',
+    'ServiceUnavailableError', 'InternalServerError', 'RateLimitError',
+})
+
+
+def _is_transient(error: Exception) -> bool:
+    return any(cls.__name__ in _TRANSIENT_ERRORS for cls in type(error).__mro__)
+
+
+class FallbackLLM(LLM):
+    """Tries each LLM of ``chain`` in turn until one answers.
+
+    Moves on only for timeouts, connection errors, rate limits and 5xx
+    responses; anything else (bad request, auth, context length) is the
+    caller's problem and is raised as-is. Stop words the agent sets on
+    this wrapper are copied onto whichever model is called.
+    """
+
+    def __init__(self, chain: List[LLM]):
+        primary = chain[0]
+        super().__init__(model=primary.model, temperature=primary.temperature, timeout=primary.timeout)
+        self.chain = chain
+        self.fallbacks_used = 0
+
+    def call(self, messages, tools=None, callbacks=None, available_functions=None, **kwargs):
+        for position, llm in enumerate(self.chain):
+            llm.stop = self.stop
+            try:
+                return llm.call(messages, tools, callbacks, available_functions, **kwargs)
+            except Exception as e:
+                if position == len(self.chain) - 1 or not _is_transient(e):
+                    raise
+                self.fallbacks_used += 1
+                print(f"⏱️ {llm.model} failed ({type(e).__name__}), falling back to {self.chain[position + 1].model}")
+
+
+def cache_mode_for(config: Dict[str, Any]) -> str:
+    """Per-agent cache mode from ``llm_cache`` in agents.yaml.
+
+    Unset means ``exact`` for deterministic agents (temperature 0) and
+    ``off`` otherwise; ``FACT_CHECKER_LLM_CACHE=0`` turns caching off.
+    """
+    if os.getenv('FACT_CHECKER_LLM_CACHE', '1') == '0':
+        return 'off'
+    mode = config.get('llm_cache')
+    if mode is None:
+        return 'exact' if config.get('temperature') == 0 else 'off'
+    if isinstance(mode, bool):
+        return 'exact' if mode else 'off'
+    return str(mode)
+
+
+def _single_llm(model: str, config: Dict[str, Any], retries: Optional[int] = None) -> LLM:
+    kwargs: Dict[str, Any] = {'model': model}
+    if retries is not None:
+        kwargs['max_retries'] = retries
+    if config.get('temperature') is not None:
+        kwargs['temperature'] = config['temperature']
+    if config.get('llm_timeout') is not None:
+        kwargs['timeout'] = float(config['llm_timeout'])
+    if os.getenv('FACT_CHECKER_LLM_BASE_URL'):
+        kwargs['base_url'] = os.getenv('FACT_CHECKER_LLM_BASE_URL')
+    return CachedLLM(
+        cache_mode=cache_mode_for(config),
+        semantic_threshold=float(os.getenv('FACT_CHECKER_LLM_SEMANTIC_THRESHOLD', 0.97)),
+        **kwargs,
+    )
+
+
+def build_llm(config: Dict[str, Any]) -> LLM:
+    """LLM client for an agent config entry.
+
+    ``llm`` is the primary model, ``fallback_llms`` the models tried in
+    order when it times out or is unavailable, and ``llm_timeout`` the
+    per-call timeout in seconds for each of them.
+    """
+    model = config.get('llm', 'gpt-4o')
+    if isinstance(model, LLM):
+        return model
+    fallbacks = config.get('fallback_llms') or []
+    if isinstance(fallbacks, str):
+        fallbacks = [fallbacks]
+    if os.getenv('FACT_CHECKER_LLM_FALLBACK', '1') == '0' or not fallbacks:
+        return _single_llm(model, config)
+    # The client's own retries would multiply llm_timeout before the next
+    # tier is tried, so only the last model in the chain keeps them.
+    chain = [_single_llm(m, config, retries=0) for m in [model, *fallbacks[:-1]]]
+    return FallbackLLM(chain + [_single_llm(fallbacks[-1], config)])
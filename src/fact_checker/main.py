@@ -1,22 +1,31 @@
 #!/usr/bin/env python
+import argparse
+import os
 import sys
 import warnings
-from datetime import datetime
 
-from crew import FactChecker
+if not __package__:
+    # Allow `python src/fact_checker/main.py ...` without installing the package.
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fact_checker.crew import FactChecker
 warnings.filterwarnings("ignore", category=SyntaxWarning, module="pysbd")
 
+SAMPLE_INPUT = "The Great Wall of China is visible from space with the naked eye."
+
+
+def _inputs(content=None):
+    return {'input_content': content or SAMPLE_INPUT}
+
+
 def run():
     """
     Run the crew.
     """
-    inputs = {
-        'topic': 'AI LLMs',
-        'current_year': str(datetime.now().year)
-    }
-
+    content = sys.argv[2] if len(sys.argv) > 2 else None
     try:
-        FactChecker().crew().kickoff(inputs=inputs)
+        result = FactChecker().crew().kickoff(inputs=_inputs(content))
+        print(result)
     except Exception as e:
         raise Exception(f"❌ An error occurred while running the crew: {e}")
 
@@ -24,12 +33,8 @@ def train():
     """
     Train the crew for a given number of iterations.
     """
-    inputs = {
-        "topic": "AI LLMs",
-        'current_year': str(datetime.now().year)
-    }
     try:
-        FactChecker().crew().train(n_iterations=int(sys.argv[1]), filename=sys.argv[2], inputs=inputs)
+        FactChecker().crew().train(n_iterations=int(sys.argv[2]), filename=sys.argv[3], inputs=_inputs())
 
     except Exception as e:
         raise Exception(f"❌ An error occurred while training the crew: {e}")
@@ -39,7 +44,7 @@ def replay():
     Replay the crew execution from a specific task.
     """
     try:
-        FactChecker().crew().replay(task_id=sys.argv[1])
+        FactChecker().crew().replay(task_id=sys.argv[2])
 
     except Exception as e:
         raise Exception(f"❌ An error occurred while replaying the crew: {e}")
@@ -48,17 +53,34 @@ def test():
     """
     Test the crew execution and return the results.
     """
-    inputs = {
-        "topic": "AI LLMs",
-        "current_year": str(datetime.now().year)
-    }
-
     try:
-        FactChecker().crew().test(n_iterations=int(sys.argv[1]), eval_llm=sys.argv[2], inputs=inputs)
+        FactChecker().crew().test(n_iterations=int(sys.argv[2]), eval_llm=sys.argv[3], inputs=_inputs())
 
     except Exception as e:
         raise Exception(f"❌ An error occurred while testing the crew: {e}")
 
-# Optional: call one of them directly if needed
+def batch():
+    """
+    Fact-check a JSONL/CSV file of inputs into a JSONL file, resumably.
+    """
+    from fact_checker.batch import run_batch
+
+    parser = argparse.ArgumentParser(prog="main.py batch", description=batch.__doc__.strip())
+    parser.add_argument("input", help="JSONL or CSV with an input_content/claim/url column (and optional id)")
+    parser.add_argument("output", help="JSONL results; rerunning with the same file resumes")
+    parser.add_argument("--concurrency", type=int, default=int(os.getenv("FACT_CHECKER_BATCH_CONCURRENCY", 4)))
+    parser.add_argument("--no-retry-errors", action="store_true", help="treat failed items as done on resume")
+    args = parser.parse_args(sys.argv[2:])
+
+    stats = run_batch(args.input, args.output, args.concurrency, retry_errors=not args.no_retry_errors)
+    print(stats.render())
+
+
+COMMANDS = {'run': run, 'train': train, 'replay': replay, 'test': test, 'batch': batch}
+
 if __name__ == "__main__":
-    run()  # or train(), test(), replay() depending on use case
\ No newline at end of file
+    command = sys.argv[1] if len(sys.argv) > 1 else 'run'
+    if command not in COMMANDS:
+        print(f"usage: main.py [{'|'.join(COMMANDS)}] [args...]")
+        sys.exit(2)
+    COMMANDS[command]()
@@ -0,0 +1,53 @@
+from collections import Counter
+from typing import List
+
+from pydantic import BaseModel, Field
+
+
+class ClaimList(BaseModel):
+    """Structured output of the claim extraction step."""
+
+    claims: List[str] = Field(default_factory=list, description="Self-contained factual claims")
+
+
+class AnalyzedClaim(BaseModel):
+    claim: str = Field(..., description="The factual claim, restated so it stands on its own")
+    context: str = Field("", description="Where and how the claim appears in the content")
+    evidence: str = Field("", description="Supporting or contradicting evidence found during research")
+
+
+class ClaimAnalysis(BaseModel):
+    """Structured output of content_analysis_task in fan-out mode."""
+
+    claims: List[AnalyzedClaim] = Field(default_factory=list)
+
+
+class ClaimVerdict(BaseModel):
+    claim: str
+    verdict: str = Field(..., description="TRUE, FALSE, MISLEADING or UNVERIFIABLE")
+    confidence: str = Field("Low", description="High, Medium or Low")
+    explanation: str = ""
+    sources: List[str] = Field(default_factory=list)
+
+
+class FactCheckReport(BaseModel):
+    """Per-claim verdicts aggregated into the final report."""
+
+    verdicts: List[ClaimVerdict] = Field(default_factory=list)
+
+    def __str__(self) -> str:
+        lines = ["# Fact-Check Report", ""]
+        for i, v in enumerate(self.verdicts, 1):
+            lines.append(f"## Claim {i}: {v.claim}")
+            lines.append(f"**Verdict:** {v.verdict.upper()} (Confidence: {v.confidence})")
+            if v.explanation:
+                lines.append(v.explanation)
+            if v.sources:
+                lines.append("Sources: " + ", ".join(v.sources))
+            lines.append("")
+        # Only non-zero labels, so the summary never mentions a verdict
+        # that no claim received.
+        counts = Counter(v.verdict.upper() for v in self.verdicts)
+        summary = ", ".join(f"{n} {label}" for label, n in counts.most_common())
+        lines.append(f"**Summary conclusion:** {summary or 'no verifiable claims found'}")
+        return "\n".join(lines)
@@ -0,0 +1,195 @@
+import os
+import re
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Iterable, Iterator, List, Optional, Union
+
+from .models import AnalyzedClaim, ClaimVerdict, FactCheckReport
+from .tools.relevance import tokenize
+from .tools.tracing import bind
+from .verdict_store import CLAIM_VERDICT, verdict_store
+
+_SENTENCE_BREAK = re.compile(r"[.!?]\s")
+
+
+def _cut(text: str, size: int) -> int:
+    """Where the segment starting at ``text[0]`` ends; ``text`` is longer than ``size``."""
+    tail = text[size - size // 5:size]
+    breaks = [m.end() for m in _SENTENCE_BREAK.finditer(tail)]
+    if breaks:
+        return size - size // 5 + breaks[-1]
+    space = text.rfind(' ', size // 2, size)
+    return space if space > 0 else size
+
+
+def iter_segments(parts: Iterable[str], size: int = 12000, overlap: int = 1000) -> Iterator[str]:
+    """``split_segments`` over text that arrives in pieces, such as PDF pages.
+
+    Pieces are joined with a newline, as ``documents.read_document`` joins
+    pages. A segment is yielded as soon as enough text follows it, so only
+    about one segment plus the latest piece is held in memory.
+    """
+    buffer = ''
+    for part in parts:
+        buffer = buffer + '\n' + part if buffer else part.lstrip()
+        while len(buffer) > size:
+            end = _cut(buffer, size)
+            yield buffer[:end].strip()
+            buffer = buffer[max(end - overlap, 1):]
+    buffer = buffer.strip()
+    if buffer:
+        yield buffer
+
+
+def split_segments(text: str, size: int = 12000, overlap: int = 1000) -> List[str]:
+    """Split ``text`` into ~``size``-character segments that overlap by ``overlap``.
+
+    Cuts prefer a sentence end in the last fifth of the window, then any
+    whitespace, so claims are rarely split mid-word. The overlap lets a
+    claim straddling a cut appear whole in at least one segment.
+    """
+    return list(iter_segments([text], size, overlap))
+
+
+def dedupe_claims(claims: List[str], threshold: float = 0.8) -> List[str]:
+    """Drop claims whose token set overlaps an earlier one by >= ``threshold`` (Jaccard)."""
+    kept, kept_tokens = [], []
+    for claim in claims:
+        claim = claim.strip()
+        tokens = set(tokenize(claim))
+        if not tokens:
+            continue
+        duplicate = any(
+            len(tokens & other) / len(tokens | other) >= threshold for other in kept_tokens
+        )
+        if not duplicate:
+            kept.append(claim)
+            kept_tokens.append(tokens)
+    return kept
+
+
+def _segment_claims(checker, segment: str, index: int, count: Optional[int]) -> List[str]:
+    output = checker.claim_extraction_crew().kickoff(inputs={
+        'segment': segment,
+        'segment_index': str(index),
+        'segment_count': str(count) if count else 'several',
+    })
+    if output.pydantic is not None:
+        return list(output.pydantic.claims)
+    # Unstructured fallback: one claim per bullet / numbered line.
+    return [
+        re.sub(r'^\s*(?:[-*•]|\d+[.)])\s*', '', line).strip()
+        for line in str(output).splitlines() if line.strip()
+    ]
+
+
+def extract_claims_parallel(checker, segments: Iterable[str], max_workers: Optional[int] = None) -> List[str]:
+    """Run claim extraction on every segment concurrently, keeping segment order.
+
+    ``segments`` may be lazy (``iter_segments`` over PDF pages): it is read
+    only while at most two segments per worker are in flight, so a long
+    document is extracted as it is read rather than held whole.
+    """
+    max_workers = max_workers or int(os.getenv('FACT_CHECKER_CHUNK_WORKERS', 4))
+    count = len(segments) if isinstance(segments, list) else None
+    claims, pending = [], deque()
+    with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='claims') as pool:
+        for index, segment in enumerate(segments, 1):
+            pending.append(pool.submit(bind(_segment_claims), checker, segment, index, count))
+            if len(pending) >= 2 * max_workers:
+                claims += pending.popleft().result()
+        while pending:
+            claims += pending.popleft().result()
+    return claims
+
+
+def fanout_enabled() -> bool:
+    return os.getenv('FACT_CHECKER_VERIFY_MODE', 'sequential') == 'fanout'
+
+
+def _verify_one(checker, item: AnalyzedClaim) -> ClaimVerdict:
+    store = verdict_store()
+    stored = store.lookup(item.claim, CLAIM_VERDICT) if store is not None else None
+    if stored is not None:
+        try:
+            return ClaimVerdict.model_validate_json(stored.verdict).model_copy(update={'claim': item.claim})
+        except ValueError:
+            pass
+    try:
+        output = checker.claim_verification_crew().kickoff(inputs={
+            'claim': item.claim,
+            'context': item.context or 'n/a',
+            'evidence': item.evidence or 'none gathered yet',
+        })
+    except Exception as e:
+        return ClaimVerdict(claim=item.claim, verdict='UNVERIFIABLE', explanation=f"Verification failed: {e}")
+    if output.pydantic is None:
+        return ClaimVerdict(claim=item.claim, verdict='UNVERIFIABLE', explanation=str(output))
+    if store is not None:
+        store.add(item.claim, output.pydantic.model_dump_json(), CLAIM_VERDICT, item.evidence)
+    return output.pydantic
+
+
+def verify_claims(checker, claims: List[AnalyzedClaim], max_workers: Optional[int] = None) -> FactCheckReport:
+    """Verify each claim in its own crew on a bounded pool and aggregate the verdicts."""
+    max_workers = max_workers or int(os.getenv('FACT_CHECKER_VERIFY_WORKERS', 8))
+    with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='verify') as pool:
+        verdicts = list(pool.map(bind(lambda item: _verify_one(checker, item)), claims))
+    return FactCheckReport(verdicts=verdicts)
+
+
+def run_fanout(checker, content: str, max_workers: Optional[int] = None) -> FactCheckReport:
+    """Research and analysis once, then one concurrent verification per claim.
+
+    Documents with many claims verify in roughly the time of the slowest
+    claim rather than all of them in one long sequential turn.
+    """
+    output = checker.analysis_crew().kickoff(inputs={'input_content': content})
+    analysis = output.pydantic
+    claims = list(analysis.claims) if analysis is not None else []
+    if not claims:
+        claims = [AnalyzedClaim(claim=content[:2000], evidence=str(output))]
+    print(f"🔀 Verifying {len(claims)} claims in parallel")
+    return verify_claims(checker, claims, max_workers)
+
+
+def chunk_threshold() -> int:
+    return int(os.getenv('FACT_CHECKER_CHUNK_THRESHOLD', 20000))
+
+
+def is_long(content: str) -> bool:
+    return len(content) > chunk_threshold()
+
+
+def run_chunked(checker, content: Union[str, Iterable[str]], max_workers: Optional[int] = None,
+                segment_chars: Optional[int] = None, overlap: Optional[int] = None):
+    """Map-reduce fact check for inputs too long for one crew context.
+
+    Segments are mapped to claim lists in parallel, the claims are
+    deduplicated across segments, and the merged list goes through the
+    verification_task stage once (or per claim in fan-out mode). Wall time is roughly the slowest
+    segment's extraction plus one verification. ``content`` may also be
+    text arriving in pieces, such as PDF pages; it is then segmented with
+    ``iter_segments`` as the pieces arrive.
+    """
+    size = segment_chars or int(os.getenv('FACT_CHECKER_CHUNK_CHARS', 12000))
+    overlap = overlap or int(os.getenv('FACT_CHECKER_CHUNK_OVERLAP', 1000))
+    count = 0
+    if isinstance(content, str):
+        segments = split_segments(content, size=size, overlap=overlap)
+        count = len(segments)
+    else:
+        def streamed():
+            nonlocal count
+            for count, segment in enumerate(iter_segments(content, size=size, overlap=overlap), 1):
+                yield segment
+        segments = streamed()
+    claims = dedupe_claims(extract_claims_parallel(checker, segments, max_workers))
+    print(f"🧩 {count} segments → {len(claims)} distinct claims")
+    if not claims:
+        # Nothing to verify: an empty report says so without a verification crew.
+        return FactCheckReport()
+    if fanout_enabled():
+        return verify_claims(checker, [AnalyzedClaim(claim=claim) for claim in claims], max_workers)
+    numbered = "\n".join(f"{i}. {claim}" for i, claim in enumerate(claims, 1))
+    return checker.merged_verification_crew().kickoff(inputs={'claims': numbered})
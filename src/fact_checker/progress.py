@@ -0,0 +1,94 @@
+"""Live progress events from a running fact check.
+
+    events = queue.Queue()
+    with listen(events.put):
+        fact_check(content)      # events arrive as tasks and tools run
+
+``FactChecker``'s step and task callbacks, ``CompactContextTask`` and
+the LLM clients call ``publish``. Only the listener of the context doing
+the work hears an event, so concurrent checks don't mix. Pool threads
+started through ``tools.tracing.bind`` keep their caller's listener.
+"""
+import contextvars
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterator, Optional, Tuple
+
+TASK_STARTED = 'task_started'
+TASK_FINISHED = 'task_finished'
+TOOL = 'tool'
+TOKENS = 'tokens'
+
+TASK_TITLES = {
+    'research_task': "🔎 Researching the claim",
+    'content_analysis_task': "🧠 Extracting the claims",
+    'verification_task': "⚖️ Verifying the claims",
+    'claim_extraction_task': "🧩 Extracting claims from each segment",
+    'claim_verification_task': "⚖️ Verifying claims in parallel",
+}
+
+
+@dataclass
+class ProgressEvent:
+    kind: str
+    label: str
+    detail: str = ''
+    data: Dict[str, Any] = field(default_factory=dict)
+    at: float = field(default_factory=time.time)
+
+
+_listener: contextvars.ContextVar[Optional[Callable[[ProgressEvent], Any]]] = contextvars.ContextVar(
+    'fact_checker_progress', default=None
+)
+
+
+@contextmanager
+def listen(callback: Callable[[ProgressEvent], Any]) -> Iterator[None]:
+    token = _listener.set(callback)
+    try:
+        yield
+    finally:
+        _listener.reset(token)
+
+
+def publish(kind: str, label: str, detail: str = '', **data):
+    callback = _listener.get()
+    if callback is None:
+        return
+    try:
+        callback(ProgressEvent(kind, label, detail, data))
+    except Exception as e:
+        # A broken UI must never fail the check it is watching.
+        print(f"⚠️ Progress listener failed: {e}")
+
+
+class RunProgress:
+    """Turns events into a progress-bar position and a status line.
+
+    The bar moves with finished tasks out of the tasks seen so far (at
+    least the three of the sequential crew) and never goes backwards.
+    """
+
+    def __init__(self):
+        self.started = 0
+        self.finished = 0
+        self.tools = 0
+        self.tokens = 0
+        self.percent = 5
+        self.status = "🤖 Starting the agents..."
+
+    def update(self, event: ProgressEvent) -> Tuple[int, str]:
+        if event.kind == TASK_STARTED:
+            self.started += 1
+            self.status = TASK_TITLES.get(event.label, f"▶️ {event.label}") + "..."
+        elif event.kind == TASK_FINISHED:
+            self.finished += 1
+        elif event.kind == TOOL:
+            self.tools += 1
+            self.status = f"🛠️ {event.label}: {event.detail[:80]}"
+        elif event.kind == TOKENS:
+            self.tokens += event.data.get('prompt_tokens', 0) + event.data.get('completion_tokens', 0)
+        total = max(self.started, 3)
+        self.percent = max(self.percent, min(95, 5 + 90 * self.finished // total))
+        return self.percent, f"{self.status} ({self.tools} tool calls, {self.tokens:,} tokens)"
@@ -0,0 +1,97 @@
+import re
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Dict, Optional
+
+from .tools.tracing import bind, span
+from .tools.web_scraping_tool import WebScrapingTool
+from .tools.youtube_tool import YouTubeTranscriptTool
+
+_SCHEME = re.compile(r"^https?://\S+$", re.IGNORECASE)
+# Bare "example.com/path" without a scheme; the TLD must be alphabetic so
+# numbers like "3.14" stay claims.
+_BARE_URL = re.compile(r"^(?:[\w-]+\.)+[a-z]{2,}(?::\d+)?(?:[/?#]\S*)?$", re.IGNORECASE)
+
+YOUTUBE, URL, TEXT = 'youtube', 'url', 'text'
+
+_prefetch_executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix='prefetch')
+
+
+@dataclass
+class RoutedInput:
+    """User input after deterministic routing, with its content fetched."""
+
+    kind: str
+    raw: str
+    target: Optional[str] = None
+    content: str = ''
+    error: Optional[str] = None
+
+    @property
+    def fetched(self) -> bool:
+        return self.kind != TEXT and not self.error
+
+    @property
+    def text(self) -> str:
+        """The text to fact-check: fetched content, or the input itself."""
+        return self.content if self.fetched else self.raw
+
+    def render(self) -> str:
+        """Value for ``{input_content}``, telling the researcher what is already done."""
+        if self.kind == TEXT:
+            return self.raw
+        if self.error:
+            return (f"{self.raw}\n\n(Automatic extraction failed: {self.error}. "
+                    f"Retrieve the content with the appropriate tool.)")
+        label = "YouTube video transcript" if self.kind == YOUTUBE else "Web page text"
+        return (f"{label} ALREADY EXTRACTED from {self.raw} (do not fetch this source again):"
+                f"\n\n{self.content}")
+
+    def as_inputs(self) -> Dict[str, str]:
+        return {'input_content': self.render(), 'input_kind': self.kind, 'input_source': self.raw}
+
+
+def classify(text: str):
+    """Return ``(kind, target)`` for raw user input.
+
+    Only input that *is* a link is routed to a fetcher; prose that merely
+    mentions a URL stays text and is left to the researcher.
+    """
+    stripped = text.strip()
+    if stripped and not any(c.isspace() for c in stripped):
+        video_id = YouTubeTranscriptTool()._extract_video_id(stripped)
+        if video_id:
+            return YOUTUBE, video_id
+        if _SCHEME.match(stripped):
+            return URL, stripped
+        if _BARE_URL.match(stripped):
+            return URL, f"https://{stripped}"
+    return TEXT, None
+
+
+def route(text: str, youtube_tool: Optional[YouTubeTranscriptTool] = None,
+          scraping_tool: Optional[WebScrapingTool] = None) -> RoutedInput:
+    """Classify ``text`` and fetch the transcript or page it points at."""
+    kind, target = classify(text)
+    routed = RoutedInput(kind=kind, raw=text.strip() if kind != TEXT else text, target=target)
+    with span('route', kind) as traced:
+        if kind == YOUTUBE:
+            tool = youtube_tool or YouTubeTranscriptTool()
+            try:
+                routed.content = tool.get_index(target).render_full()
+            except Exception as e:
+                routed.error = str(e)
+        elif kind == URL:
+            tool = scraping_tool or WebScrapingTool()
+            result = tool.scrape(target)
+            routed.content, routed.error = result.text, result.error
+        traced.set('chars', len(routed.text))
+    if routed.fetched:
+        print(f"🧭 Routed input as {kind}: {len(routed.content)} characters prefetched")
+    return routed
+
+
+def prefetch(text: str, youtube_tool: Optional[YouTubeTranscriptTool] = None,
+             scraping_tool: Optional[WebScrapingTool] = None) -> "Future[RoutedInput]":
+    """Start ``route`` in the background, e.g. while the crew is being built."""
+    return _prefetch_executor.submit(bind(route), text, youtube_tool, scraping_tool)
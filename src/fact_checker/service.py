@@ -0,0 +1,380 @@
+"""Headless fact-checking job API.
+
+    python -m fact_checker.service --port 8700 --workers 2
+
+Endpoints (JSON in and out):
+
+    POST /jobs               {"input_content": "..."} -> 202 {"id", "status"}
+    GET  /jobs/<id>          status and timings
+    GET  /jobs/<id>/result   200 with the report (or error) once finished, 202 while pending
+    GET  /healthz            queue depth and worker count
+    GET  /metrics            span timings and token/byte counters (Prometheus text)
+
+Jobs are kept in a SQLite queue, so a restart resumes queued and
+interrupted jobs. A running job holds a lease its worker keeps renewing;
+only a job whose lease has run out (its process died) is queued again, so
+several service processes can share one queue. A bounded pool of worker
+threads runs them. New
+submissions get 429 once too many jobs are waiting, and 413 when the
+input is too large.
+"""
+import argparse
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Set
+
+from .tools.disk_cache import default_cache_dir
+from .tools.http_client import default_timeout, get_session
+from .tools.tracing import render_metrics
+
+QUEUED, RUNNING, DONE, FAILED = 'queued', 'running', 'done', 'failed'
+_JOB_PATH = re.compile(r"^/jobs/([0-9a-f]{32})(/result)?$")
+
+
+class JobQueue:
+    """Durable FIFO of fact-check jobs on SQLite."""
+
+    def __init__(self, path: Optional[Path] = None, max_attempts: int = 3, lease: Optional[float] = None):
+        self.path = Path(path) if path else default_cache_dir() / "jobs.sqlite3"
+        self.max_attempts = max_attempts
+        self.lease = lease or float(os.getenv('FACT_CHECKER_API_LEASE', 60))
+        self._local = threading.local()
+        conn = self._connect()
+        with conn:
+            conn.executescript(
+                """
+                CREATE TABLE IF NOT EXISTS jobs (
+                    id TEXT PRIMARY KEY,
+                    status TEXT NOT NULL,
+                    input TEXT NOT NULL,
+                    result TEXT,
+                    error TEXT,
+                    created_at REAL NOT NULL,
+                    started_at REAL,
+                    finished_at REAL,
+                    attempts INTEGER NOT NULL DEFAULT 0,
+                    lease_until REAL
+                );
+                CREATE INDEX IF NOT EXISTS jobs_status ON jobs(status, created_at);
+                """
+            )
+            columns = {row[1] for row in conn.execute("PRAGMA table_info(jobs)")}
+            if "lease_until" not in columns:
+                # Running rows from before leases have none, so they count as expired.
+                conn.execute("ALTER TABLE jobs ADD COLUMN lease_until REAL")
+            self._requeue_expired(conn, time.time())
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def submit(self, inputs: Dict[str, Any]) -> str:
+        job_id = uuid.uuid4().hex
+        conn = self._connect()
+        with conn:
+            conn.execute(
+                "INSERT INTO jobs (id, status, input, created_at) VALUES (?, ?, ?, ?)",
+                (job_id, QUEUED, json.dumps(inputs), time.time()),
+            )
+        return job_id
+
+    def depth(self) -> int:
+        return self._connect().execute("SELECT COUNT(*) FROM jobs WHERE status = ?", (QUEUED,)).fetchone()[0]
+
+    def running(self) -> int:
+        return self._connect().execute("SELECT COUNT(*) FROM jobs WHERE status = ?", (RUNNING,)).fetchone()[0]
+
+    def _requeue_expired(self, conn: sqlite3.Connection, now: float):
+        """Put running jobs whose lease ran out back in line.
+
+        Their worker died without finishing them. A job that has already
+        taken a worker down ``max_attempts`` times is failed instead.
+        """
+        expired = "status = ? AND (lease_until IS NULL OR lease_until < ?)"
+        conn.execute(
+            "UPDATE jobs SET status = ?, lease_until = NULL, "
+            f"error = 'abandoned after repeated worker crashes' WHERE {expired} AND attempts >= ?",
+            (FAILED, RUNNING, now, self.max_attempts),
+        )
+        conn.execute(
+            f"UPDATE jobs SET status = ?, started_at = NULL, lease_until = NULL WHERE {expired}",
+            (QUEUED, RUNNING, now),
+        )
+
+    def claim(self) -> Optional[Dict[str, Any]]:
+        """Mark the oldest queued job running and return it, or None.
+
+        The claim is one conditional UPDATE inside ``BEGIN IMMEDIATE``, so of
+        several threads or processes polling the same file only one gets
+        each job.
+        """
+        conn = self._connect()
+        now = time.time()
+        with conn:
+            conn.execute("BEGIN IMMEDIATE")
+            self._requeue_expired(conn, now)
+            row = conn.execute(
+                "UPDATE jobs SET status = ?, started_at = ?, lease_until = ?, attempts = attempts + 1 "
+                "WHERE id = (SELECT id FROM jobs WHERE status = ? ORDER BY created_at LIMIT 1) "
+                "AND status = ? RETURNING id, input",
+                (RUNNING, now, now + self.lease, QUEUED, QUEUED),
+            ).fetchone()
+        if row is None:
+            return None
+        return {'id': row[0], 'input': json.loads(row[1])}
+
+    def renew(self, job_ids: List[str]):
+        """Extend the lease on running jobs this process is still working on."""
+        conn = self._connect()
+        with conn:
+            conn.executemany(
+                "UPDATE jobs SET lease_until = ? WHERE id = ? AND status = ?",
+                [(time.time() + self.lease, job_id, RUNNING) for job_id in job_ids],
+            )
+
+    def finish(self, job_id: str, result: Optional[Dict[str, Any]] = None, error: Optional[str] = None):
+        conn = self._connect()
+        with conn:
+            conn.execute(
+                "UPDATE jobs SET status = ?, result = ?, error = ?, finished_at = ?, lease_until = NULL "
+                "WHERE id = ?",
+                (FAILED if error else DONE, json.dumps(result) if result is not None else None,
+                 error, time.time(), job_id),
+            )
+
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        row = self._connect().execute(
+            "SELECT status, result, error, created_at, started_at, finished_at, attempts "
+            "FROM jobs WHERE id = ?", (job_id,)
+        ).fetchone()
+        if row is None:
+            return None
+        status, result, error, created, started, finished, attempts = row
+        job = {'id': job_id, 'status': status, 'created_at': created, 'attempts': attempts}
+        if started:
+            job['queued_seconds'] = round(started - created, 3)
+        if finished and started:
+            job['run_seconds'] = round(finished - started, 3)
+        if error:
+            job['error'] = error
+        if result:
+            job['result'] = json.loads(result)
+        return job
+
+
+class WorkerPool:
+    """Threads that take jobs off the queue and run ``fact_check`` on them."""
+
+    def __init__(self, queue: JobQueue, workers: int = 2, poll_interval: float = 0.2):
+        self.queue = queue
+        self.workers = workers
+        self.poll_interval = poll_interval
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._threads: List[threading.Thread] = []
+        self._running: Set[str] = set()
+        self._running_lock = threading.Lock()
+
+    def start(self) -> "WorkerPool":
+        for i in range(self.workers):
+            thread = threading.Thread(target=self._loop, name=f"job-worker-{i}", daemon=True)
+            thread.start()
+            self._threads.append(thread)
+        heartbeat = threading.Thread(target=self._heartbeat, name="job-heartbeat", daemon=True)
+        heartbeat.start()
+        self._threads.append(heartbeat)
+        return self
+
+    def notify(self):
+        self._wake.set()
+
+    def stop(self):
+        self._stop.set()
+        self._wake.set()
+
+    def _loop(self):
+        from .warm import fact_check, result_payload
+
+        while not self._stop.is_set():
+            job = self.queue.claim()
+            if job is None:
+                self._wake.wait(self.poll_interval)
+                self._wake.clear()
+                continue
+            with self._running_lock:
+                self._running.add(job['id'])
+            try:
+                result = fact_check(job['input']['input_content'])
+                self.queue.finish(job['id'], result=result_payload(result))
+            except Exception as e:
+                self.queue.finish(job['id'], error=f"{type(e).__name__}: {e}")
+            finally:
+                with self._running_lock:
+                    self._running.discard(job['id'])
+
+    def _heartbeat(self):
+        """Renew the leases of running jobs well before they run out."""
+        while not self._stop.wait(self.queue.lease / 3):
+            with self._running_lock:
+                running = list(self._running)
+            if running:
+                self.queue.renew(running)
+
+
+class JobService(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, host: str = '127.0.0.1', port: int = 8700, queue: Optional[JobQueue] = None,
+                 workers: Optional[int] = None, max_queue: Optional[int] = None,
+                 max_input_chars: Optional[int] = None):
+        super().__init__((host, port), _Handler)
+        self.queue = queue or JobQueue()
+        self.max_queue = max_queue or int(os.getenv('FACT_CHECKER_API_MAX_QUEUE', 32))
+        self.max_input_chars = max_input_chars or int(os.getenv('FACT_CHECKER_API_MAX_INPUT_CHARS', 2_000_000))
+        self.pool = WorkerPool(self.queue, workers or int(os.getenv('FACT_CHECKER_API_WORKERS', 2)))
+        self._admit_lock = threading.Lock()
+
+    def admit(self, inputs: Dict[str, Any]):
+        """Queue ``inputs`` and return ``(status, body)`` for the response."""
+        content = inputs.get('input_content')
+        if not isinstance(content, str) or not content.strip():
+            return 400, {'error': 'input_content is required'}
+        if len(content) > self.max_input_chars:
+            return 413, {'error': f'input_content exceeds {self.max_input_chars} characters'}
+        with self._admit_lock:
+            depth = self.queue.depth()
+            if depth >= self.max_queue:
+                return 429, {'error': 'queue full', 'queued': depth}
+            job_id = self.queue.submit({'input_content': content})
+        self.pool.notify()
+        return 202, {'id': job_id, 'status': QUEUED, 'queued': depth + 1}
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_POST(self):
+        if self.path != '/jobs':
+            return self._send(404, {'error': 'not found'})
+        try:
+            inputs = json.loads(self.rfile.read(int(self.headers.get('Content-Length', 0))) or b'{}')
+        except ValueError:
+            return self._send(400, {'error': 'body must be JSON'})
+        status, body = self.server.admit(inputs if isinstance(inputs, dict) else {})
+        headers = {'Retry-After': '5'} if status == 429 else {}
+        if status == 202:
+            headers['Location'] = f"/jobs/{body['id']}"
+        self._send(status, body, headers)
+
+    def do_GET(self):
+        service = self.server
+        if self.path == '/metrics':
+            data = render_metrics().encode()
+            self.send_response(200)
+            self.send_header('Content-Type', 'text/plain; version=0.0.4')
+            self.send_header('Content-Length', str(len(data)))
+            self.end_headers()
+            return self.wfile.write(data)
+        if self.path == '/healthz':
+            return self._send(200, {'queued': service.queue.depth(), 'running': service.queue.running(),
+                                    'workers': service.pool.workers, 'max_queue': service.max_queue})
+        match = _JOB_PATH.match(self.path)
+        job = service.queue.get(match.group(1)) if match else None
+        if job is None:
+            return self._send(404, {'error': 'no such job'})
+        if not match.group(2):
+            job.pop('result', None)
+            return self._send(200, job)
+        if job['status'] in (DONE, FAILED):
+            return self._send(200, job)
+        self._send(202, job, {'Retry-After': '2'})
+
+    def _send(self, status: int, payload: Dict[str, Any], headers: Optional[Dict[str, str]] = None):
+        data = json.dumps(payload).encode()
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(data)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, *args):
+        pass
+
+
+class ServiceClient:
+    """Thin client for the job API, on the shared pooled HTTP session."""
+
+    def __init__(self, base_url: str):
+        self.base_url = base_url.rstrip('/')
+        self.session = get_session('api')
+
+    def submit(self, input_content: str) -> str:
+        # Not idempotent: the session retries a POST only when the
+        # connection failed, never after a timeout or a 429/5xx, since the
+        # job may already be queued.
+        response = self.session.post(f"{self.base_url}/jobs", json={'input_content': input_content},
+                                     timeout=default_timeout())
+        if response.status_code == 429:
+            raise RuntimeError("Fact-check service is busy, please retry shortly")
+        response.raise_for_status()
+        return response.json()['id']
+
+    def status(self, job_id: str) -> Dict[str, Any]:
+        response = self.session.get(f"{self.base_url}/jobs/{job_id}", timeout=default_timeout())
+        response.raise_for_status()
+        return response.json()
+
+    def wait(self, job_id: str, timeout: float = 900.0, interval: float = 1.0, on_poll=None) -> Dict[str, Any]:
+        """Poll until the job finishes; returns its result payload."""
+        deadline = time.monotonic() + timeout
+        job = None
+        while time.monotonic() < deadline:
+            response = self.session.get(f"{self.base_url}/jobs/{job_id}/result", timeout=default_timeout())
+            response.raise_for_status()
+            job = response.json()
+            if job['status'] == DONE:
+                return job['result']
+            if job['status'] == FAILED:
+                raise RuntimeError(job.get('error', f"job {job_id} failed"))
+            if on_poll is not None:
+                on_poll(job)
+            time.sleep(interval)
+        if job is None:
+            raise TimeoutError(f"job {job_id} not polled: timeout is {timeout:.0f}s")
+        raise TimeoutError(f"job {job_id} still {job['status']} after {timeout:.0f}s")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Fact-checking job API")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8700)
+    parser.add_argument('--workers', type=int, default=None)
+    parser.add_argument('--max-queue', type=int, default=None)
+    args = parser.parse_args()
+
+    service = JobService(args.host, args.port, workers=args.workers, max_queue=args.max_queue)
+    service.pool.start()
+    print(f"🚀 Fact-check API on http://{args.host}:{service.server_address[1]} "
+          f"({service.pool.workers} workers, queue limit {service.max_queue})")
+    try:
+        service.serve_forever()
+    except KeyboardInterrupt:
+        service.pool.stop()
+
+
+if __name__ == '__main__':
+    main()
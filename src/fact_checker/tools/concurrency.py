@@ -0,0 +1,35 @@
+import asyncio
+import threading
+from typing import Awaitable, TypeVar
+
+from .tracing import bind
+
+T = TypeVar("T")
+
+
+def run_sync(coro: Awaitable[T]) -> T:
+    """Run ``coro`` to completion from synchronous code.
+
+    Tools are invoked synchronously by CrewAI, sometimes from a thread that
+    already has a running event loop (``kickoff_async``). In that case the
+    coroutine runs on a fresh loop in a helper thread instead.
+    """
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return asyncio.run(coro)
+
+    result = {}
+
+    def runner():
+        try:
+            result["value"] = asyncio.run(coro)
+        except BaseException as e:  # re-raised in the calling thread
+            result["error"] = e
+
+    thread = threading.Thread(target=bind(runner), daemon=True)
+    thread.start()
+    thread.join()
+    if "error" in result:
+        raise result["error"]
+    return result["value"]
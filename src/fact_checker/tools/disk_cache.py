@@ -0,0 +1,244 @@
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+import zlib
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, Optional
+
+
+def default_cache_dir() -> Path:
+    root = os.getenv("FACT_CHECKER_CACHE_DIR") or os.path.join(
+        os.path.expanduser("~"), ".cache", "fact_checker"
+    )
+    path = Path(root)
+    path.mkdir(parents=True, exist_ok=True)
+    return path
+
+
+@dataclass
+class CacheEntry:
+    key: str
+    value: str
+    meta: Dict = field(default_factory=dict)
+    stored_at: float = 0.0
+    ttl: Optional[float] = None
+
+    @property
+    def fresh(self) -> bool:
+        return self.ttl is None or time.time() - self.stored_at < self.ttl
+
+
+class DiskCache:
+    """Compressed, content-addressed key/value store on SQLite.
+
+    Values are zlib-compressed and stored once per content digest, so many
+    keys resolving to the same text share a blob. Entries older than ``ttl``
+    are still returned by ``lookup`` (marked stale) so callers can revalidate
+    them; the store is trimmed least-recently-used first once compressed
+    blobs exceed ``max_bytes``. SQLite's locking makes it safe to share one
+    file between threads and worker processes.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        path: Optional[Path] = None,
+        ttl: Optional[float] = None,
+        max_bytes: int = 256 * 1024 * 1024,
+    ):
+        self.name = name
+        self.path = Path(path) if path else default_cache_dir() / f"{name}.sqlite3"
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self._local = threading.local()
+        self._stats_lock = threading.Lock()
+        self._stats = {"hits": 0, "misses": 0, "stale": 0, "revalidated": 0, "writes": 0, "evictions": 0}
+        with self._connect() as conn:
+            conn.executescript(
+                """
+                CREATE TABLE IF NOT EXISTS entries (
+                    key TEXT PRIMARY KEY,
+                    digest TEXT NOT NULL,
+                    meta TEXT NOT NULL,
+                    stored_at REAL NOT NULL,
+                    accessed_at REAL NOT NULL
+                );
+                CREATE INDEX IF NOT EXISTS entries_accessed ON entries(accessed_at);
+                CREATE TABLE IF NOT EXISTS blobs (
+                    digest TEXT PRIMARY KEY,
+                    data BLOB NOT NULL,
+                    size INTEGER NOT NULL
+                );
+                """
+            )
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def _count(self, event: str, n: int = 1):
+        with self._stats_lock:
+            self._stats[event] += n
+
+    def lookup(self, key: str, record: bool = True) -> Optional[CacheEntry]:
+        """Return the entry for ``key`` whether fresh or stale, else None.
+
+        Pass ``record=False`` for re-checks (e.g. after taking a lock) that
+        should not count as another hit or miss.
+        """
+        conn = self._connect()
+        row = conn.execute(
+            "SELECT e.meta, e.stored_at, b.data FROM entries e "
+            "JOIN blobs b ON b.digest = e.digest WHERE e.key = ?",
+            (key,),
+        ).fetchone()
+        if row is None:
+            if record:
+                self._count("misses")
+            return None
+        with conn:
+            conn.execute("UPDATE entries SET accessed_at = ? WHERE key = ?", (time.time(), key))
+        entry = CacheEntry(
+            key=key,
+            value=zlib.decompress(row[2]).decode("utf-8"),
+            meta=json.loads(row[0]),
+            stored_at=row[1],
+            ttl=self.ttl,
+        )
+        if record:
+            self._count("hits" if entry.fresh else "stale")
+        return entry
+
+    def get(self, key: str, record: bool = True) -> Optional[str]:
+        entry = self.lookup(key, record)
+        return entry.value if entry and entry.fresh else None
+
+    def put(self, key: str, value: str, meta: Optional[Dict] = None):
+        raw = value.encode("utf-8")
+        digest = hashlib.sha256(raw).hexdigest()
+        now = time.time()
+        conn = self._connect()
+        with conn:
+            previous = conn.execute("SELECT digest FROM entries WHERE key = ?", (key,)).fetchone()
+            if conn.execute("SELECT 1 FROM blobs WHERE digest = ?", (digest,)).fetchone() is None:
+                data = zlib.compress(raw, 6)
+                conn.execute(
+                    "INSERT OR IGNORE INTO blobs (digest, data, size) VALUES (?, ?, ?)",
+                    (digest, data, len(data)),
+                )
+            conn.execute(
+                "INSERT OR REPLACE INTO entries (key, digest, meta, stored_at, accessed_at) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (key, digest, json.dumps(meta or {}), now, now),
+            )
+            if previous is not None and previous[0] != digest:
+                # The key's old value is garbage now unless another key shares it.
+                conn.execute(
+                    "DELETE FROM blobs WHERE digest = ? AND NOT EXISTS "
+                    "(SELECT 1 FROM entries WHERE digest = ?)",
+                    (previous[0], previous[0]),
+                )
+        self._count("writes")
+        self._evict(conn)
+
+    def touch(self, key: str, meta: Optional[Dict] = None):
+        """Mark a stale entry fresh again after a successful revalidation."""
+        now = time.time()
+        conn = self._connect()
+        with conn:
+            if meta is None:
+                conn.execute(
+                    "UPDATE entries SET stored_at = ?, accessed_at = ? WHERE key = ?",
+                    (now, now, key),
+                )
+            else:
+                conn.execute(
+                    "UPDATE entries SET stored_at = ?, accessed_at = ?, meta = ? WHERE key = ?",
+                    (now, now, json.dumps(meta), key),
+                )
+        self._count("revalidated")
+
+    def delete(self, key: str):
+        conn = self._connect()
+        with conn:
+            conn.execute("DELETE FROM entries WHERE key = ?", (key,))
+            self._drop_orphans(conn)
+
+    def _drop_orphans(self, conn: sqlite3.Connection):
+        conn.execute("DELETE FROM blobs WHERE digest NOT IN (SELECT digest FROM entries)")
+
+    def size_bytes(self) -> int:
+        return self._connect().execute("SELECT COALESCE(SUM(size), 0) FROM blobs").fetchone()[0]
+
+    def _evict(self, conn: sqlite3.Connection):
+        total = self.size_bytes()
+        if total > self.max_bytes:
+            # Unreferenced blobs (left by older versions) go before any entry.
+            with conn:
+                self._drop_orphans(conn)
+            total = self.size_bytes()
+        if total <= self.max_bytes:
+            return
+        evicted = 0
+        with conn:
+            # Walk entries oldest-access first, dropping them until the blobs
+            # they exclusively own bring the store back under budget.
+            rows = conn.execute(
+                "SELECT e.key, e.digest, b.size FROM entries e "
+                "JOIN blobs b ON b.digest = e.digest ORDER BY e.accessed_at ASC"
+            ).fetchall()
+            for key, digest, size in rows:
+                if total <= self.max_bytes:
+                    break
+                conn.execute("DELETE FROM entries WHERE key = ?", (key,))
+                evicted += 1
+                if conn.execute("SELECT 1 FROM entries WHERE digest = ?", (digest,)).fetchone() is None:
+                    conn.execute("DELETE FROM blobs WHERE digest = ?", (digest,))
+                    total -= size
+        if evicted:
+            self._count("evictions", evicted)
+
+    def clear(self):
+        conn = self._connect()
+        with conn:
+            conn.execute("DELETE FROM entries")
+            conn.execute("DELETE FROM blobs")
+
+    def stats(self) -> Dict[str, int]:
+        with self._stats_lock:
+            stats = dict(self._stats)
+        lookups = stats["hits"] + stats["misses"] + stats["stale"]
+        stats["hit_rate"] = round((stats["hits"] + stats["revalidated"]) / lookups, 3) if lookups else 0.0
+        return stats
+
+
+_registry: Dict[str, DiskCache] = {}
+_registry_lock = threading.Lock()
+
+
+def get_cache(name: str, ttl: Optional[float] = None, max_bytes: Optional[int] = None) -> DiskCache:
+    """Return the process-wide cache called ``name``, creating it on first use."""
+    cache = _registry.get(name)
+    if cache is None:
+        with _registry_lock:
+            cache = _registry.get(name)
+            if cache is None:
+                kwargs = {"ttl": ttl}
+                if max_bytes is not None:
+                    kwargs["max_bytes"] = max_bytes
+                cache = DiskCache(name, **kwargs)
+                _registry[name] = cache
+    return cache
+
+
+def all_stats() -> Dict[str, Dict[str, int]]:
+    return {name: cache.stats() for name, cache in _registry.items()}
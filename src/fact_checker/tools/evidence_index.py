@@ -0,0 +1,528 @@
+import atexit
+import hashlib
+import json
+import math
+import os
+import shutil
+import sqlite3
+import threading
+import time
+from array import array
+from collections import Counter
+from contextlib import contextmanager
+from dataclasses import dataclass
+from functools import lru_cache
+from pathlib import Path
+from typing import Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from .disk_cache import default_cache_dir
+from .relevance import split_passages, tokenize
+from .tracing import span
+
+try:
+    import fcntl
+except ImportError:  # Windows: one writing process per cache directory
+    fcntl = None
+
+K1, B = 1.5, 0.75
+
+
+@contextmanager
+def file_lock(path: Path) -> Iterator[None]:
+    """Exclusive lock on ``path`` shared by every process using the directory."""
+    with open(path, "w") as handle:
+        if fcntl is not None:
+            fcntl.flock(handle, fcntl.LOCK_EX)
+        yield
+
+
+@lru_cache(maxsize=1 << 18)
+def term_hash(term: str) -> int:
+    return int.from_bytes(hashlib.blake2b(term.encode(), digest_size=8).digest(), "little")
+
+
+@dataclass
+class Evidence:
+    passage_id: int
+    url: str
+    text: str
+    source: str
+    added_at: float
+    score: float
+    coverage: float
+
+    def render(self) -> str:
+        return f"[{self.url}] {self.text}"
+
+
+class _Segment:
+    """An immutable, memory-mapped slice of the index.
+
+    Each term (a 64-bit hash, sorted in ``terms``) owns the range
+    ``offsets[i]:offsets[i + 1]`` of the postings columns: ``docs`` holds
+    segment-local passage numbers (uint16 while the segment has fewer than
+    65536 passages) and ``tfs`` the clipped term frequencies. ``ids`` maps
+    local numbers to passage ids and ``lengths`` gives token counts. A
+    posting costs three bytes in most segments and nothing is read into
+    memory until a query touches it.
+    """
+
+    COLUMNS = ("terms", "offsets", "docs", "tfs", "ids", "lengths")
+
+    def __init__(self, path: Path):
+        self.path = path
+        self.name = path.name
+        for column in self.COLUMNS:
+            setattr(self, column, np.load(path / f"{column}.npy", mmap_mode="r"))
+        self.total_length = int(self.lengths.sum(dtype=np.int64))
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def _range(self, h: int) -> Tuple[int, int]:
+        i = int(np.searchsorted(self.terms, np.uint64(h)))
+        if i < len(self.terms) and int(self.terms[i]) == h:
+            return int(self.offsets[i]), int(self.offsets[i + 1])
+        return 0, 0
+
+    def df(self, h: int) -> int:
+        lo, hi = self._range(h)
+        return hi - lo
+
+    def postings(self, h: int, among: Optional[np.ndarray] = None) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """``(passage ids, tfs, lengths)`` of the passages containing term ``h``.
+
+        With ``among`` (sorted passage ids), only those passages are looked
+        up, by binary search in the term's sorted postings, so a common
+        term costs O(len(among) log df) instead of a scan of its list.
+        """
+        lo, hi = self._range(h)
+        docs = self.docs[lo:hi]
+        if among is not None:
+            local = np.searchsorted(self.ids, among)
+            local = local[(local < len(self.ids)) & (self.ids[np.minimum(local, len(self.ids) - 1)] == among)]
+            at = np.searchsorted(docs, local)
+            hit = at < len(docs)
+            hit[hit] = docs[at[hit]] == local[hit]
+            at = at[hit]
+            return self.ids[local[hit]], self.tfs[lo:hi][at], self.lengths[local[hit]]
+        return self.ids[docs], self.tfs[lo:hi], self.lengths[docs]
+
+    def size_bytes(self) -> int:
+        return sum((self.path / f"{column}.npy").stat().st_size for column in self.COLUMNS)
+
+    def expanded(self) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Every posting as ``(term hash, passage id, tf)`` columns, for merging."""
+        terms = np.repeat(np.asarray(self.terms), np.diff(self.offsets))
+        return terms, np.asarray(self.ids)[self.docs], np.asarray(self.tfs)
+
+    @classmethod
+    def write(cls, path: Path, terms: np.ndarray, passage_ids: np.ndarray, tfs: np.ndarray,
+              ids: np.ndarray, lengths: np.ndarray) -> "_Segment":
+        """Build a segment from posting columns; ``ids`` must be sorted and unique."""
+        docs = np.searchsorted(ids, passage_ids)
+        order = np.lexsort((docs, terms))
+        terms, docs, tfs = terms[order], docs[order], tfs[order]
+        unique, starts = np.unique(terms, return_index=True)
+        columns = {
+            "terms": unique.astype(np.uint64),
+            "offsets": np.append(starts, len(terms)).astype(np.int64),
+            "docs": docs.astype(np.uint16 if len(ids) < 1 << 16 else np.uint32),
+            "tfs": np.minimum(tfs, 255).astype(np.uint8),
+            "ids": ids.astype(np.int64),
+            "lengths": np.minimum(lengths, 65535).astype(np.uint16),
+        }
+        tmp = path.with_name(path.name + ".tmp")
+        tmp.mkdir(parents=True)
+        for column, values in columns.items():
+            np.save(tmp / f"{column}.npy", values)
+        os.replace(tmp, path)
+        return cls(path)
+
+
+class _Tail:
+    """Passages added since the last flush.
+
+    Postings are flat columns appended per passage, so adding is cheap;
+    the tail stays small enough (``flush_every`` passages) that a query
+    simply scans the term column.
+    """
+
+    def __init__(self):
+        self.ids = array("q")
+        self.lengths = array("q")
+        self.total_length = 0
+        self._terms = array("Q")
+        self._passage_ids = array("q")
+        self._tfs = array("q")
+        self._columns = None
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def add(self, passage_id: int, tokens: Sequence[str]):
+        counts = Counter(tokens)
+        self._terms.extend(map(term_hash, counts))
+        self._passage_ids.extend([passage_id] * len(counts))
+        self._tfs.extend(counts.values())
+        self.ids.append(passage_id)
+        self.lengths.append(len(tokens))
+        self.total_length += len(tokens)
+        self._columns = None
+
+    def _arrays(self) -> Tuple[np.ndarray, ...]:
+        if self._columns is None:
+            length_of = dict(zip(self.ids, self.lengths))
+            passage_ids = np.frombuffer(self._passage_ids, dtype=np.int64).copy()
+            self._columns = (
+                np.frombuffer(self._terms, dtype=np.uint64).copy(),
+                passage_ids,
+                np.frombuffer(self._tfs, dtype=np.int64).copy(),
+                np.array([length_of[i] for i in passage_ids.tolist()], dtype=np.int64),
+            )
+        return self._columns
+
+    def df(self, h: int) -> int:
+        return int(np.count_nonzero(self._arrays()[0] == np.uint64(h))) if self.ids else 0
+
+    def postings(self, h: int, among: Optional[np.ndarray] = None) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        terms, passage_ids, tfs, lengths = self._arrays()
+        mask = terms == np.uint64(h)
+        if among is not None:
+            mask &= np.isin(passage_ids, among)
+        return passage_ids[mask], tfs[mask], lengths[mask]
+
+    def columns(self, keep: set) -> Tuple[np.ndarray, ...]:
+        """Posting and passage columns for ``_Segment.write``, limited to ``keep``."""
+        terms, passage_ids, tfs, _ = self._arrays()
+        kept = np.array(sorted(keep), dtype=np.int64)
+        mask = np.isin(passage_ids, kept)
+        ids, lengths = np.frombuffer(self.ids, dtype=np.int64), np.frombuffer(self.lengths, dtype=np.int64)
+        order = np.argsort(ids)
+        rows = order[np.isin(ids[order], kept)]
+        return terms[mask], passage_ids[mask], tfs[mask], ids[rows], lengths[rows]
+
+
+class EvidenceIndex:
+    """Every scraped passage and search snippet, searchable with BM25.
+
+    Passage text lives in SQLite, deduplicated by content digest. The
+    inverted index is a set of immutable memory-mapped segments (see
+    ``_Segment``) plus an in-memory tail of recent passages. The tail is
+    written out as a new segment every ``flush_every`` passages and at
+    exit; once there are more than ``max_segments``, the smallest
+    ``merge_factor`` are merged into one. A manifest file names the live
+    segments, so other processes pick up new ones on their next query.
+    Passages not yet in any segment are re-read into the tail on start.
+
+    Pages change, so a passage older than ``ttl`` seconds is no longer
+    returned as evidence (``None`` keeps passages forever).
+    """
+
+    def __init__(self, root: Optional[Path] = None, flush_every: int = 2048,
+                 max_segments: int = 8, merge_factor: int = 4, passage_chars: int = 500,
+                 common_df: float = 0.05, max_candidates: int = 2000, ttl: Optional[float] = None):
+        self.root = Path(root) if root else default_cache_dir() / "evidence"
+        self.root.mkdir(parents=True, exist_ok=True)
+        self.flush_every = flush_every
+        self.max_segments = max_segments
+        self.merge_factor = merge_factor
+        self.passage_chars = passage_chars
+        self.common_df = common_df
+        self.max_candidates = max_candidates
+        self.ttl = ttl
+        self._lock = threading.RLock()
+        self._local = threading.local()
+        self._stats = {"added": 0, "duplicates": 0, "queries": 0, "flushes": 0, "merges": 0}
+        self.segments: List[_Segment] = []
+        self._manifest_mtime = None
+        self._tail = _Tail()
+        self._listeners: List[Callable[[int], None]] = []
+        conn = self._connect()
+        with conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS passages ("
+                "id INTEGER PRIMARY KEY, digest TEXT NOT NULL UNIQUE, url TEXT NOT NULL, "
+                "source TEXT NOT NULL, text TEXT NOT NULL, added_at REAL NOT NULL, "
+                "indexed INTEGER NOT NULL DEFAULT 0)"
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS passages_pending ON passages(indexed) WHERE indexed = 0")
+        self._reload()
+        for passage_id, text in conn.execute("SELECT id, text FROM passages WHERE indexed = 0"):
+            self._tail.add(passage_id, tokenize(text))
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.root / "passages.sqlite3", timeout=30)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def _writer(self):
+        """Serialise segment and manifest changes across processes."""
+        return file_lock(self.root / "lock")
+
+    @property
+    def _manifest(self) -> Path:
+        return self.root / "manifest.json"
+
+    def _read_manifest(self) -> List[str]:
+        try:
+            return json.loads(self._manifest.read_text())["segments"]
+        except FileNotFoundError:
+            return []
+
+    def _write_manifest(self, names: List[str]):
+        tmp = self._manifest.with_suffix(".tmp")
+        tmp.write_text(json.dumps({"segments": names}))
+        os.replace(tmp, self._manifest)
+
+    def _reload(self):
+        """Map the segments named in the manifest, if it changed."""
+        try:
+            mtime = self._manifest.stat().st_mtime_ns
+        except FileNotFoundError:
+            mtime = None
+        if mtime == self._manifest_mtime:
+            return
+        for _ in range(3):
+            names = self._read_manifest()
+            known = {segment.name: segment for segment in self.segments}
+            try:
+                self.segments = [known.get(name) or _Segment(self.root / name) for name in names]
+                break
+            except FileNotFoundError:
+                continue  # a merge replaced a segment between the two reads
+        self._manifest_mtime = mtime
+
+    def add(self, url: str, text: str, source: str = "page") -> int:
+        """Split ``text`` into passages and index the new ones; returns how many."""
+        return self.add_passages(url, split_passages(text, self.passage_chars), source)
+
+    def add_passages(self, url: str, passages: Sequence[str], source: str = "page") -> int:
+        """Index already-split ``passages`` (e.g. timestamped transcript windows)."""
+        passages = [p for p in passages if len(p) > 40]
+        if not passages:
+            return 0
+        now = time.time()
+        added = []
+        conn = self._connect()
+        with conn:
+            for passage in passages:
+                digest = hashlib.sha1(passage.encode("utf-8")).hexdigest()
+                cursor = conn.execute(
+                    "INSERT OR IGNORE INTO passages (digest, url, source, text, added_at) VALUES (?, ?, ?, ?, ?)",
+                    (digest, url, source, passage, now),
+                )
+                if cursor.rowcount:
+                    added.append((cursor.lastrowid, tokenize(passage)))
+                else:
+                    # Seen again: it is still on the page, so it is fresh evidence.
+                    conn.execute("UPDATE passages SET added_at = ? WHERE digest = ?", (now, digest))
+        with self._lock:
+            for passage_id, tokens in added:
+                self._tail.add(passage_id, tokens)
+            self._stats["added"] += len(added)
+            self._stats["duplicates"] += len(passages) - len(added)
+            if len(self._tail) >= self.flush_every:
+                self.flush()
+        if added:
+            for callback in self._listeners:
+                callback(len(added))
+        return len(added)
+
+    def subscribe(self, callback: Callable[[int], None]):
+        """Call ``callback(count)`` after new passages are added."""
+        self._listeners.append(callback)
+
+    def passages_after(self, passage_id: int, limit: int) -> List[Tuple[int, str]]:
+        """``(id, text)`` of up to ``limit`` passages stored after ``passage_id``, oldest first."""
+        return self._connect().execute(
+            "SELECT id, text FROM passages WHERE id > ? ORDER BY id LIMIT ?", (passage_id, limit)
+        ).fetchall()
+
+    def fetch(self, scores: Dict[int, Tuple[float, float]]) -> List[Evidence]:
+        """Evidence for ``{passage id: (score, coverage)}``, best score first.
+
+        Passages older than ``ttl`` are left out.
+        """
+        if not scores:
+            return []
+        oldest = time.time() - self.ttl if self.ttl is not None else 0.0
+        rows = self._connect().execute(
+            f"SELECT id, url, text, source, added_at FROM passages "
+            f"WHERE id IN ({','.join('?' * len(scores))}) AND added_at >= ?",
+            [*scores, oldest],
+        ).fetchall()
+        found = [Evidence(row[0], row[1], row[2], row[3], row[4], *scores[row[0]]) for row in rows]
+        return sorted(found, key=lambda e: -e.score)
+
+    def flush(self):
+        """Write the tail out as a segment, merging segments if there are too many."""
+        with self._lock:
+            if not self._tail:
+                return
+            conn = self._connect()
+            with self._writer():
+                # Another process may already have indexed passages it
+                # found pending when it started.
+                pending = set()
+                for chunk in range(0, len(self._tail.ids), 900):
+                    ids = self._tail.ids[chunk:chunk + 900]
+                    pending.update(row[0] for row in conn.execute(
+                        f"SELECT id FROM passages WHERE indexed = 0 AND id IN ({','.join('?' * len(ids))})", ids
+                    ))
+                names = self._read_manifest()
+                if pending:
+                    segment = _Segment.write(self._new_segment_path(), *self._tail.columns(pending))
+                    names.append(segment.name)
+                    with conn:
+                        conn.executemany("UPDATE passages SET indexed = 1 WHERE id = ?", ((i,) for i in pending))
+                        self._write_manifest(names)
+                    self._stats["flushes"] += 1
+                self._tail = _Tail()
+                self._manifest_mtime = None
+                self._reload()
+                if len(self.segments) > self.max_segments:
+                    self._merge()
+
+    def _new_segment_path(self) -> Path:
+        return self.root / f"seg-{time.time_ns():x}-{os.getpid()}"
+
+    def _merge(self):
+        smallest = sorted(self.segments, key=len)[:self.merge_factor]
+        parts = [segment.expanded() for segment in smallest]
+        ids = np.concatenate([np.asarray(segment.ids) for segment in smallest])
+        lengths = np.concatenate([np.asarray(segment.lengths) for segment in smallest])
+        order = np.argsort(ids, kind="stable")
+        merged = _Segment.write(
+            self._new_segment_path(),
+            np.concatenate([p[0] for p in parts]),
+            np.concatenate([p[1] for p in parts]),
+            np.concatenate([p[2] for p in parts]).astype(np.int64),
+            ids[order],
+            lengths[order],
+        )
+        replaced = {segment.name for segment in smallest}
+        names = [name for name in self._read_manifest() if name not in replaced] + [merged.name]
+        self._write_manifest(names)
+        self._manifest_mtime = None
+        self._reload()
+        for name in replaced:
+            shutil.rmtree(self.root / name, ignore_errors=True)
+        self._stats["merges"] += 1
+
+    def search(self, query: str, k: int = 8) -> List[Evidence]:
+        """The ``k`` passages with the best BM25 score for ``query``.
+
+        ``coverage`` divides a passage's score by the summed IDF of every
+        query term, so it reads roughly as the share of the query the
+        passage matches, comparable across queries of different lengths.
+
+        Terms in more than ``common_df`` of all passages carry little IDF.
+        They are not scanned: they only add to the scores of the best
+        ``max_candidates`` passages the rarer terms found (or the rarest
+        term, if all are common).
+        """
+        hashes = list(dict.fromkeys(term_hash(t) for t in tokenize(query)))
+        if not hashes:
+            return []
+        with span("evidence", "search", terms=len(hashes)) as traced, self._lock:
+            self._reload()
+            sources = [*self.segments, self._tail]
+            n = sum(len(s) for s in sources)
+            self._stats["queries"] += 1
+            if not n:
+                return []
+            avgdl = sum(s.total_length for s in sources) / n or 1.0
+            dfs = sorted((sum(s.df(h) for s in sources), h) for h in hashes)
+            ids, scores, ideal, candidates = [], [], 0.0, None
+            for df, h in dfs:
+                idf = math.log(1 + (n - df + 0.5) / (df + 0.5))
+                ideal += idf
+                if not df:
+                    continue
+                # dfs is ascending, so once one term is common the rest are.
+                common = bool(ids) and df > self.common_df * n
+                if common and candidates is None:
+                    candidates = self._candidates(ids, scores, max(self.max_candidates, 10 * k))
+                for source in sources:
+                    found = source.postings(h, candidates if common and len(candidates) * 8 < df else None)
+                    if len(found[0]):
+                        tf = found[1].astype(np.float32)
+                        norm = K1 * (1 - B + B * found[2].astype(np.float32) / avgdl)
+                        ids.append(np.asarray(found[0]))
+                        scores.append(idf * tf * (K1 + 1) / (tf + norm))
+            if not ids:
+                return []
+            unique, inverse = np.unique(np.concatenate(ids), return_inverse=True)
+            totals = np.bincount(inverse, weights=np.concatenate(scores))
+            top = np.argpartition(-totals, min(k, len(totals)) - 1)[:k]
+            top = top[np.argsort(-totals[top])]
+            traced.set("candidates", len(unique))
+        return self.fetch({int(unique[i]): (float(totals[i]), float(totals[i]) / ideal) for i in top})
+
+    @staticmethod
+    def _candidates(ids: List[np.ndarray], scores: List[np.ndarray], limit: int) -> np.ndarray:
+        """Sorted ids of the (at most ``limit``) best passages scored so far."""
+        unique, inverse = np.unique(np.concatenate(ids), return_inverse=True)
+        if len(unique) > limit:
+            partial = np.bincount(inverse, weights=np.concatenate(scores))
+            unique = np.sort(unique[np.argpartition(-partial, limit - 1)[:limit]])
+        return unique
+
+    def __len__(self) -> int:
+        with self._lock:
+            return sum(len(s) for s in self.segments) + len(self._tail)
+
+    def size_bytes(self) -> int:
+        with self._lock:
+            return sum(segment.size_bytes() for segment in self.segments)
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            stats = dict(self._stats)
+            stats.update(passages=len(self), segments=len(self.segments), pending=len(self._tail))
+        return stats
+
+
+_index: Optional[EvidenceIndex] = None
+_index_lock = threading.Lock()
+
+
+def evidence_ttl() -> float:
+    """Seconds a passage counts as evidence; defaults to the search cache TTL,
+    so a snippet lasts as long as the cached search result it came from."""
+    return float(os.getenv("FACT_CHECKER_EVIDENCE_TTL", os.getenv("FACT_CHECKER_SEARCH_CACHE_TTL", 24 * 3600)))
+
+
+def evidence_index() -> Optional[EvidenceIndex]:
+    """Process-wide evidence index, or None when ``FACT_CHECKER_EVIDENCE_STORE=0``."""
+    global _index
+    if os.getenv("FACT_CHECKER_EVIDENCE_STORE", "1") == "0":
+        return None
+    if _index is None:
+        with _index_lock:
+            if _index is None:
+                _index = EvidenceIndex(flush_every=int(os.getenv("FACT_CHECKER_EVIDENCE_FLUSH_EVERY", 2048)),
+                                       ttl=evidence_ttl())
+                atexit.register(_index.flush)
+    return _index
+
+
+def remember(url: str, text: str, source: str = "page", passages: Optional[Sequence[str]] = None) -> int:
+    """Add ``text`` (or pre-split ``passages``) to the process-wide index, if enabled. Never raises."""
+    index = evidence_index()
+    if index is None:
+        return 0
+    try:
+        if passages is not None:
+            return index.add_passages(url, passages, source)
+        return index.add(url, text, source)
+    except Exception as e:
+        print(f"⚠️ Evidence index update failed: {e}")
+        return 0
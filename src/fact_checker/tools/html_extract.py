@@ -0,0 +1,235 @@
+import codecs
+import re
+from html.parser import HTMLParser
+from typing import Iterable, Optional
+
+from bs4 import BeautifulSoup
+
+SKIP_TAGS = {"script", "style", "noscript", "template", "svg"}
+BLOCK_TAGS = (
+    "p", "div", "li", "ul", "ol", "td", "th", "tr", "br", "h1", "h2", "h3", "h4", "h5", "h6",
+    "article", "section", "header", "footer", "nav", "aside", "main", "blockquote", "pre", "title",
+)
+_META_CHARSET = re.compile(rb'<meta[^>]+charset=["\']?([A-Za-z0-9_\-]+)', re.I)
+
+
+def extract_text_soup(content: bytes, max_chars: int = 5000) -> str:
+    """Parse the whole document with BeautifulSoup, then truncate."""
+    soup = BeautifulSoup(content, 'html.parser')
+
+    for script in soup(["script", "style"]):
+        script.decompose()
+
+    text = soup.get_text()
+
+    lines = (line.strip() for line in text.splitlines())
+    chunks = (phrase.strip() for line in lines for phrase in line.split("  "))
+    text = ' '.join(chunk for chunk in chunks if chunk)
+
+    if len(text) > max_chars:
+        text = text[:max_chars] + "..."
+    return text
+
+
+class BudgetTextParser(HTMLParser):
+    """Incremental HTML-to-text parser that stops once ``max_chars`` is filled.
+
+    Whitespace is collapsed as it arrives, so the running length is exact
+    and matches what the BeautifulSoup path produces for the same markup.
+    """
+
+    def __init__(self, max_chars: int):
+        super().__init__(convert_charrefs=True)
+        self.max_chars = max_chars
+        self.done = False
+        self._parts = []
+        self._size = 0
+        self._skip_depth = 0
+        self._pending_space = False
+
+    def handle_starttag(self, tag, attrs):
+        if tag in SKIP_TAGS:
+            self._skip_depth += 1
+
+    def handle_endtag(self, tag):
+        if tag in SKIP_TAGS and self._skip_depth:
+            self._skip_depth -= 1
+
+    def handle_data(self, data):
+        if self.done or self._skip_depth:
+            return
+        words = data.split()
+        if not words:
+            self._pending_space = self._pending_space or bool(data)
+            return
+        if self._size and (self._pending_space or data[0].isspace()):
+            self._parts.append(' ')
+            self._size += 1
+        piece = ' '.join(words)
+        self._parts.append(piece)
+        self._size += len(piece)
+        self._pending_space = data[-1].isspace()
+        if self._size >= self.max_chars:
+            self.done = True
+
+    def text(self) -> str:
+        text = ''.join(self._parts)
+        if self.done and len(text) >= self.max_chars:
+            text = text[:self.max_chars] + "..."
+        return text
+
+
+def sniff_encoding(head: bytes, declared: Optional[str] = None) -> str:
+    match = _META_CHARSET.search(head[:4096])
+    for candidate in (declared, match.group(1).decode('ascii') if match else None):
+        if candidate:
+            try:
+                return codecs.lookup(candidate).name
+            except LookupError:
+                continue
+    return 'utf-8'
+
+
+def extract_text_stream(
+    chunks: Iterable[bytes],
+    max_chars: int = 5000,
+    max_bytes: int = 2 * 1024 * 1024,
+    encoding: Optional[str] = None,
+) -> str:
+    """Feed body chunks through ``BudgetTextParser`` until a budget runs out.
+
+    Stops reading as soon as either ``max_chars`` of text has been produced
+    or ``max_bytes`` of body has been consumed, so callers can close the
+    connection without downloading the rest of the page.
+    """
+    parser = BudgetTextParser(max_chars)
+    decoder = None
+    consumed = 0
+    for chunk in chunks:
+        if not chunk:
+            continue
+        if consumed + len(chunk) > max_bytes:
+            chunk = chunk[:max_bytes - consumed]
+        consumed += len(chunk)
+        if decoder is None:
+            decoder = codecs.getincrementaldecoder(sniff_encoding(chunk, encoding))(errors='replace')
+        parser.feed(decoder.decode(chunk))
+        if parser.done or consumed >= max_bytes:
+            break
+    if decoder is not None and not parser.done:
+        parser.feed(decoder.decode(b'', final=True))
+        parser.close()
+    return parser.text()
+
+
+def _collapse(text: str, max_chars: int) -> str:
+    text = ' '.join(text.split())
+    if len(text) > max_chars:
+        text = text[:max_chars] + "..."
+    return text
+
+
+def _lxml_tree(content: bytes):
+    from lxml import etree, html as lxml_html
+
+    try:
+        tree = lxml_html.fromstring(content)
+    except (etree.ParserError, ValueError):
+        return None
+    etree.strip_elements(tree, *SKIP_TAGS, etree.Comment, with_tail=False)
+    # text_content() glues adjacent blocks together ("end.Next"); a space in
+    # each block's tail keeps words apart once whitespace is collapsed.
+    for el in tree.iter(*BLOCK_TAGS):
+        el.tail = ' ' + (el.tail or '')
+    return tree
+
+
+def extract_text_lxml(content: bytes, max_chars: int = 5000) -> str:
+    """Same output shape as the soup path, using libxml2's HTML parser."""
+    tree = _lxml_tree(content)
+    return _collapse(tree.text_content(), max_chars) if tree is not None else ''
+
+
+BOILERPLATE_HINTS = re.compile(
+    r'nav|menu|header|footer|sidebar|aside|cookie|consent|banner|related|share|social|'
+    r'subscribe|newsletter|promo|advert|sponsor|comment|breadcrumb|popup|modal', re.I
+)
+CONTENT_HINTS = re.compile(r'article|content|story|body|main|post|entry|text', re.I)
+BOILERPLATE_TAGS = ('nav', 'header', 'footer', 'aside', 'form', 'button', 'select', 'iframe')
+PARAGRAPH_TAGS = ('p', 'pre', 'blockquote', 'td', 'li', 'h2', 'h3')
+
+
+def _class_weight(el) -> int:
+    hints = f"{el.get('class', '')} {el.get('id', '')}"
+    weight = 0
+    if CONTENT_HINTS.search(hints):
+        weight += 25
+    if BOILERPLATE_HINTS.search(hints):
+        weight -= 25
+    if el.tag in ('article', 'main'):
+        weight += 25
+    return weight
+
+
+def _link_density(el) -> float:
+    text_len = len(el.text_content()) or 1
+    link_len = sum(len(a.text_content()) for a in el.iter('a'))
+    return min(link_len / text_len, 1.0)
+
+
+def extract_main_text(content: bytes, max_chars: int = 5000, min_chars: int = 200) -> str:
+    """Readability-style main-article extraction using text density.
+
+    Paragraphs score their parent (and half to the grandparent) by length
+    and comma count; candidates are then weighted by class/id hints and
+    penalised by link density. The best candidate plus similarly scored
+    siblings is returned. Falls back to the full-page text when nothing
+    article-like is found.
+    """
+    tree = _lxml_tree(content)
+    if tree is None:
+        return ''
+
+    for el in list(tree.iter(*BOILERPLATE_TAGS)):
+        el.drop_tree()
+    for el in list(tree.iter()):
+        if not isinstance(el.tag, str) or el.tag in ('html', 'body', 'article', 'main'):
+            continue
+        hints = f"{el.get('class', '')} {el.get('id', '')}"
+        if BOILERPLATE_HINTS.search(hints) and not CONTENT_HINTS.search(hints):
+            el.drop_tree()
+
+    scores = {}
+    for para in tree.iter(*PARAGRAPH_TAGS):
+        text = para.text_content().strip()
+        if len(text) < 25:
+            continue
+        score = 1 + text.count(',') + min(len(text) // 100, 3)
+        parent = para.getparent()
+        for ancestor, share in ((parent, 1.0), (parent.getparent() if parent is not None else None, 0.5)):
+            if ancestor is None:
+                continue
+            if ancestor not in scores:
+                scores[ancestor] = float(_class_weight(ancestor))
+            scores[ancestor] += score * share
+
+    if not scores:
+        return _collapse(tree.text_content(), max_chars)
+
+    for el in scores:
+        scores[el] *= 1 - _link_density(el)
+    best = max(scores, key=scores.get)
+
+    nodes = [best]
+    parent = best.getparent()
+    if parent is not None:
+        threshold = max(10.0, scores[best] * 0.2)
+        nodes = [
+            sibling for sibling in parent
+            if sibling is best or scores.get(sibling, 0) >= threshold
+        ]
+
+    text = ' '.join(node.text_content() for node in nodes)
+    if len(text.strip()) < min_chars:
+        return _collapse(tree.text_content(), max_chars)
+    return _collapse(text, max_chars)
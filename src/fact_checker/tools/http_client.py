@@ -0,0 +1,141 @@
+import os
+import threading
+from typing import Dict, FrozenSet, Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+DEFAULT_USER_AGENT = (
+    'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 '
+    '(KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
+)
+
+# Methods whose requests are retried after a read error or a retryable
+# status. Connection failures are retried for every method, since nothing
+# reached the server. A session opts into retrying POST only where
+# sending it twice is harmless.
+IDEMPOTENT_METHODS = frozenset({'GET', 'HEAD', 'OPTIONS'})
+
+
+def _env_int(name: str, default: int) -> int:
+    try:
+        return int(os.getenv(name, default))
+    except ValueError:
+        return default
+
+
+def _env_float(name: str, default: float) -> float:
+    try:
+        return float(os.getenv(name, default))
+    except ValueError:
+        return default
+
+
+class HttpSettings:
+    """Pool, retry and timeout settings shared by every HTTP session."""
+
+    def __init__(
+        self,
+        pool_connections: Optional[int] = None,
+        pool_maxsize: Optional[int] = None,
+        retries: Optional[int] = None,
+        backoff_factor: Optional[float] = None,
+        timeout: Optional[float] = None,
+    ):
+        # pool_connections is the number of distinct hosts kept warm,
+        # pool_maxsize the number of keep-alive sockets per host.
+        self.pool_connections = pool_connections or _env_int("FACT_CHECKER_HTTP_POOL_CONNECTIONS", 32)
+        self.pool_maxsize = pool_maxsize or _env_int("FACT_CHECKER_HTTP_POOL_MAXSIZE", 16)
+        self.retries = retries if retries is not None else _env_int("FACT_CHECKER_HTTP_RETRIES", 3)
+        self.backoff_factor = (
+            backoff_factor if backoff_factor is not None
+            else _env_float("FACT_CHECKER_HTTP_BACKOFF", 0.5)
+        )
+        self.timeout = timeout or _env_float("FACT_CHECKER_HTTP_TIMEOUT", 10.0)
+
+
+class _Counters:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.requests = 0
+        self.bytes_received = 0
+
+    def record(self, response: requests.Response, *args, **kwargs):
+        length = response.headers.get('Content-Length')
+        with self._lock:
+            self.requests += 1
+            if length and length.isdigit():
+                self.bytes_received += int(length)
+
+
+_lock = threading.Lock()
+_settings = HttpSettings()
+_sessions: Dict[str, requests.Session] = {}
+_counters = _Counters()
+
+
+def build_session(settings: Optional[HttpSettings] = None,
+                  retry_methods: FrozenSet[str] = IDEMPOTENT_METHODS) -> requests.Session:
+    """Create a session with per-host keep-alive pools and retry/backoff."""
+    settings = settings or _settings
+    retry = Retry(
+        total=settings.retries,
+        connect=settings.retries,
+        read=settings.retries,
+        backoff_factor=settings.backoff_factor,
+        status_forcelist=(429, 500, 502, 503, 504),
+        allowed_methods=retry_methods,
+        respect_retry_after_header=True,
+        raise_on_status=False,
+    )
+    adapter = HTTPAdapter(
+        pool_connections=settings.pool_connections,
+        pool_maxsize=settings.pool_maxsize,
+        max_retries=retry,
+    )
+    session = requests.Session()
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+    session.headers.update({'User-Agent': DEFAULT_USER_AGENT})
+    session.hooks['response'].append(_counters.record)
+    return session
+
+
+def get_session(name: str = 'default', retry_methods: FrozenSet[str] = IDEMPOTENT_METHODS) -> requests.Session:
+    """Return the process-wide session registered under ``name``.
+
+    Consumers that mutate session state (headers, cookies) should ask for
+    their own name so they don't leak it into the shared default session.
+    ``retry_methods`` applies when the session is first created.
+    """
+    session = _sessions.get(name)
+    if session is None:
+        with _lock:
+            session = _sessions.get(name)
+            if session is None:
+                session = build_session(retry_methods=retry_methods)
+                _sessions[name] = session
+    return session
+
+
+def configure(settings: HttpSettings):
+    """Replace the pool settings and drop existing sessions."""
+    global _settings
+    with _lock:
+        _settings = settings
+        for session in _sessions.values():
+            session.close()
+        _sessions.clear()
+
+
+def default_timeout() -> float:
+    return _settings.timeout
+
+
+def stats() -> Dict[str, int]:
+    return {
+        'sessions': len(_sessions),
+        'requests': _counters.requests,
+        'bytes_received': _counters.bytes_received,
+    }
@@ -0,0 +1,115 @@
+import math
+import re
+from collections import Counter
+from typing import List, Sequence
+
+_TOKEN = re.compile(r"[a-z0-9]+(?:[.,][0-9]+)*")
+_SENTENCE_END = re.compile(r"(?<=[.!?])\s+(?=[A-Z0-9\"'“(])")
+
+STOPWORDS = frozenset(
+    "a an and are as at be but by for from has have he her his i in is it its of on or "
+    "our she that the their them they this to was were which who will with you your".split()
+)
+
+
+def tokenize(text: str) -> List[str]:
+    return [t for t in _TOKEN.findall(text.lower()) if t not in STOPWORDS]
+
+
+def split_passages(text: str, passage_chars: int = 500) -> List[str]:
+    """Group sentences into passages of roughly ``passage_chars`` characters."""
+    sentences = []
+    for sentence in _SENTENCE_END.split(text):
+        sentence = sentence.strip()
+        # Text without punctuation (menus, tables) would otherwise become
+        # one giant "sentence" that never fits the budget.
+        while len(sentence) > passage_chars * 2:
+            cut = sentence.rfind(' ', 0, passage_chars)
+            cut = cut if cut > 0 else passage_chars
+            sentences.append(sentence[:cut])
+            sentence = sentence[cut:].strip()
+        if sentence:
+            sentences.append(sentence)
+
+    passages, current, size = [], [], 0
+    for sentence in sentences:
+        if current and size + len(sentence) > passage_chars:
+            passages.append(' '.join(current))
+            current, size = [], 0
+        current.append(sentence)
+        size += len(sentence) + 1
+    if current:
+        passages.append(' '.join(current))
+    return passages
+
+
+def bm25_scores(query: Sequence[str], documents: Sequence[Sequence[str]],
+                k1: float = 1.5, b: float = 0.75) -> List[float]:
+    """Okapi BM25 of ``query`` against each tokenized document in the set."""
+    if not documents:
+        return []
+    n = len(documents)
+    avgdl = sum(len(d) for d in documents) / n or 1.0
+    df = Counter(term for doc in documents for term in set(doc))
+    terms = set(query)
+    idf = {t: math.log(1 + (n - df[t] + 0.5) / (df[t] + 0.5)) for t in terms if df[t]}
+    scores = []
+    for doc in documents:
+        tf = Counter(doc)
+        norm = k1 * (1 - b + b * len(doc) / avgdl)
+        scores.append(sum(
+            weight * tf[t] * (k1 + 1) / (tf[t] + norm)
+            for t, weight in idf.items() if tf[t]
+        ))
+    return scores
+
+
+def select_passages(text: str, claim: str, budget: int, passage_chars: int = 500) -> str:
+    """Keep the passages most relevant to ``claim`` within ``budget`` characters.
+
+    Passages are ranked with BM25 over the page's own passage set, taken
+    greedily until the budget is full, then re-emitted in page order with
+    "..." marking the gaps. Falls back to plain truncation when the claim
+    shares no terms with the page.
+    """
+    if len(text) <= budget:
+        return text
+    passages = split_passages(text, passage_chars)
+    scores = bm25_scores(tokenize(claim), [tokenize(p) for p in passages])
+    if not any(scores):
+        return text[:budget] + "..."
+
+    ranked = sorted(range(len(passages)), key=lambda i: (-scores[i], i))
+    chosen, used = [], 0
+    for i in ranked:
+        if scores[i] <= 0:
+            break
+        cost = len(passages[i]) + 5
+        if used + cost > budget:
+            continue
+        chosen.append(i)
+        used += cost
+
+    # Spend what's left of the budget on the page lead, which usually
+    # carries the headline and dateline.
+    for i in range(len(passages)):
+        cost = len(passages[i]) + 5
+        if i in chosen:
+            continue
+        if used + cost > budget:
+            break
+        chosen.append(i)
+        used += cost
+
+    if not chosen:
+        return text[:budget] + "..."
+
+    out, previous = [], -1
+    for i in sorted(chosen):
+        if previous >= 0 and i != previous + 1:
+            out.append("...")
+        out.append(passages[i])
+        previous = i
+    if previous != len(passages) - 1:
+        out.append("...")
+    return ' '.join(out)
@@ -0,0 +1,337 @@
+from crewai.tools import BaseTool
+from pydantic import BaseModel, Field
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Dict, List, Optional, Type
+from urllib.parse import urlsplit
+import json
+import os
+import re
+import threading
+import unicodedata
+from .http_client import IDEMPOTENT_METHODS, get_session, default_timeout
+from .disk_cache import get_cache
+from .evidence_index import Evidence, evidence_index, remember
+from .tracing import bind, span
+from .vector_index import vector_index
+from .web_scraping_tool import WebScrapingTool, normalize_url
+
+SERPER_URL = 'https://google.serper.dev'
+
+# Answer fields kept from a Serper response; the rest (credits, search
+# parameters, images) never reaches the prompt, so it isn't cached either.
+KEPT_FIELDS = ('answerBox', 'knowledgeGraph', 'organic', 'peopleAlsoAsk')
+
+_SPACES = re.compile(r'\s+')
+_EDGE_PUNCTUATION = '?!.,;:\'"“”‘’ '
+# Reciprocal-rank-fusion constant: a hit's merged score is the sum of
+# 1 / (RRF_K + position) over the queries that returned it.
+RRF_K = 60
+
+
+def normalize_query(query: str) -> str:
+    """Cache key text: case-folded, NFKC, single-spaced, no edge punctuation.
+
+    Word order and inner quotes are kept because they change what the
+    search engine returns.
+    """
+    query = unicodedata.normalize('NFKC', query).casefold()
+    return _SPACES.sub(' ', query).strip(_EDGE_PUNCTUATION)
+
+
+def search_cache():
+    return get_cache(
+        'search',
+        ttl=float(os.getenv('FACT_CHECKER_SEARCH_CACHE_TTL', 24 * 3600)),
+        max_bytes=int(float(os.getenv('FACT_CHECKER_SEARCH_CACHE_MAX_MB', 64)) * 1024 * 1024),
+    )
+
+
+class _Counters:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.api_calls = 0
+        self.coalesced = 0
+        self.stale_served = 0
+        self.local_answers = 0
+
+    def count(self, name: str):
+        with self.lock:
+            setattr(self, name, getattr(self, name) + 1)
+
+
+_counters = _Counters()
+# Normalized query -> future of the request currently answering it, so
+# agents asking the same thing at once share one API call.
+_inflight: Dict[str, Future] = {}
+_inflight_lock = threading.Lock()
+
+
+def stats() -> Dict[str, int]:
+    return {
+        'api_calls': _counters.api_calls,
+        'coalesced': _counters.coalesced,
+        'stale_served': _counters.stale_served,
+        'local_answers': _counters.local_answers,
+    }
+
+
+# Query variants of one batch run here; each holds a pooled connection
+# for at most one request at a time.
+_search_executor = ThreadPoolExecutor(
+    max_workers=int(os.getenv('FACT_CHECKER_SEARCH_CONCURRENCY', 4)),
+    thread_name_prefix='search',
+)
+
+
+def merge_results(results: List[dict]) -> List[dict]:
+    """Organic hits of several queries, deduplicated by URL, best first.
+
+    Each merged hit gets ``queries``, the number of queries that found it.
+    """
+    merged: Dict[str, dict] = {}
+    for result in results:
+        for rank, hit in enumerate(result.get('organic', []), 1):
+            link = hit.get('link')
+            if not link:
+                continue
+            key = normalize_url(link)
+            entry = merged.get(key)
+            if entry is None:
+                entry = merged[key] = {**hit, 'queries': 0, 'score': 0.0}
+            entry['queries'] += 1
+            entry['score'] += 1.0 / (RRF_K + hit.get('position', rank))
+    return sorted(merged.values(), key=lambda hit: -hit['score'])
+
+
+class SearchInput(BaseModel):
+    search_query: str = Field("", description="Search query you want to use to search the internet")
+    queries: List[str] = Field(
+        default_factory=list,
+        description="Several phrasings of the search to run concurrently in one call; "
+                    "results are merged and duplicate links removed",
+    )
+    fetch_top: int = Field(
+        0,
+        description="Also read the top N merged result pages in the same call (at most 5)",
+    )
+    claim: str = Field(
+        "",
+        description="The claim being checked; fetched pages are cut to the passages most relevant to it",
+    )
+    live: bool = Field(
+        False,
+        description="Search the web even when pages read earlier already cover the query",
+    )
+
+
+class SearchTool(BaseTool):
+    """Serper web search behind a shared, persistent result cache.
+
+    Results are stored per normalized query for
+    ``FACT_CHECKER_SEARCH_CACHE_TTL`` seconds, so the verifier re-running
+    the researcher's query, or another user checking the same trending
+    claim, costs no API call. Identical queries issued concurrently wait
+    for the first one. If the API fails, a stale cached answer is served.
+
+    Given ``queries``, the variants run concurrently and their hits are
+    merged by URL; ``fetch_top`` then scrapes the best pages through
+    ``scraper`` in the same call, saving the agent a turn per step.
+
+    Before going to the web, the query (or ``claim``) is looked up in the
+    local evidence index of pages and snippets seen in earlier runs. When
+    at least ``min_evidence_sources`` sources match it with a coverage of
+    ``min_evidence_score`` or more, those passages are the answer and no
+    search is made. A claim worded differently from the stored text shares
+    few terms with it, so when the term match is weak and an embedding
+    model is configured, passages whose embedding has a cosine of
+    ``min_evidence_similarity`` or more to the query count as well. Live results are added to the index. Only the
+    research stage should answer from the index: with
+    ``use_local_evidence`` off (the verifier's tool) every call goes to
+    the web, as if ``live`` were set.
+    """
+
+    name: str = "Search the internet with Serper"
+    description: str = (
+        "Search the internet for a query and return the top results "
+        "(title, link and snippet), plus any direct answer. Pass several phrasings "
+        "in `queries` to run them at once, and `fetch_top` to also read the best pages"
+    )
+    args_schema: Type[BaseModel] = SearchInput
+    base_url: str = Field(default_factory=lambda: os.getenv('FACT_CHECKER_SERPER_URL') or SERPER_URL)
+    api_key: Optional[str] = Field(default_factory=lambda: os.getenv('SERPER_API_KEY'))
+    n_results: int = Field(default_factory=lambda: int(os.getenv('FACT_CHECKER_SEARCH_RESULTS', 10)))
+    use_cache: bool = True
+    use_local_evidence: bool = True
+    scraper: Optional[WebScrapingTool] = None
+    max_fetch: int = 5
+    min_evidence_score: float = Field(
+        default_factory=lambda: float(os.getenv('FACT_CHECKER_EVIDENCE_MIN_SCORE', 0.6)))
+    min_evidence_sources: int = Field(
+        default_factory=lambda: int(os.getenv('FACT_CHECKER_EVIDENCE_MIN_SOURCES', 2)))
+    min_evidence_similarity: float = Field(
+        default_factory=lambda: float(os.getenv('FACT_CHECKER_EVIDENCE_MIN_SIMILARITY', 0.45)))
+
+    def _run(self, search_query: str = "", queries: Optional[List[str]] = None,
+             fetch_top: int = 0, claim: str = "", live: bool = False) -> str:
+        variants = list(dict.fromkeys(
+            q for q in ([search_query] if search_query else []) + list(queries or []) if q.strip()
+        ))
+        if not variants:
+            return "Error searching: no query provided"
+        with span('tool', self.name, queries=len(variants), fetch_top=fetch_top) as traced:
+            local = [] if live or not self.use_local_evidence else self.local_evidence(claim or variants[0])
+            if local:
+                _counters.count('local_answers')
+                traced.set('evidence', 'local')
+                output = "\n---\n".join(
+                    ["Evidence from sources read earlier (set `live` to search the web instead):"]
+                    + [e.render() for e in local]
+                )
+            elif len(variants) == 1 and not fetch_top:
+                try:
+                    output = self.format(self.search(variants[0]))
+                except Exception as e:
+                    output = f"Error searching for {variants[0]!r}: {str(e)}"
+            else:
+                output = self._batch(variants, fetch_top, claim)
+            traced.set('output_chars', len(output))
+            return output
+
+    def _batch(self, queries: List[str], fetch_top: int, claim: str) -> str:
+        results, errors = [], []
+        for query, outcome in zip(queries, self.search_many(queries)):
+            if isinstance(outcome, Exception):
+                errors.append(f"Error searching for {query!r}: {outcome}")
+            else:
+                results.append(outcome)
+        answers = [self.format({k: v for k, v in r.items() if k != 'organic'}) for r in results]
+        hits = merge_results(results)
+        parts = [f"Merged results of {len(queries)} searches: " + " | ".join(queries)]
+        parts += list(dict.fromkeys(a for a in answers if a != "No search results found"))
+        parts += [
+            f"Title: {hit.get('title', '')}\nLink: {hit['link']}\nSnippet: {hit.get('snippet', '')}\n"
+            f"Found by: {hit['queries']} of {len(queries)} searches"
+            for hit in hits
+        ]
+        parts += errors
+        output = "\n---\n".join(parts)
+        top = [hit['link'] for hit in hits[:min(fetch_top, self.max_fetch)]]
+        if top and self.scraper is not None:
+            pages = self.scraper.scrape_many(top, claim)
+            output += "\n\n===\n\n" + "\n\n---\n\n".join(page.render() for page in pages)
+        return output
+
+    def local_evidence(self, query: str) -> List[Evidence]:
+        """Passages of the evidence index that answer ``query``, or [] if it is weak there."""
+        index = evidence_index()
+        if index is None:
+            return []
+        hits = [e for e in index.search(query) if e.coverage >= self.min_evidence_score]
+        if len({e.url for e in hits}) >= self.min_evidence_sources:
+            return hits
+        vectors = vector_index()
+        if vectors is None:
+            return []
+        seen = {e.passage_id for e in hits}
+        hits += [e for e in vectors.search(query)
+                 if e.score >= self.min_evidence_similarity and e.passage_id not in seen]
+        if len({e.url for e in hits}) < self.min_evidence_sources:
+            return []
+        return hits
+
+    def search_many(self, queries: List[str]) -> list:
+        """``search`` each query concurrently; failures come back as exceptions."""
+        def attempt(query: str):
+            try:
+                return self.search(query)
+            except Exception as e:
+                return e
+
+        return list(_search_executor.map(bind(attempt), queries))
+
+    def search(self, query: str) -> dict:
+        """Serper's answer for ``query`` (only ``KEPT_FIELDS``), cached."""
+        key = f"{self.n_results}:{normalize_query(query)}"
+        if not self.use_cache:
+            return self._coalesced(key, query, None)
+        cache = search_cache()
+        entry = cache.lookup(key)
+        if entry is not None and entry.fresh:
+            return json.loads(entry.value)
+        return self._coalesced(key, query, entry)
+
+    def _coalesced(self, key: str, query: str, stale) -> dict:
+        with _inflight_lock:
+            future = _inflight.get(key)
+            leader = future is None
+            if leader:
+                future = _inflight[key] = Future()
+        if not leader:
+            _counters.count('coalesced')
+            return future.result()
+        try:
+            result = self._fetch_and_store(key, query, stale)
+            future.set_result(result)
+            return result
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        finally:
+            with _inflight_lock:
+                _inflight.pop(key, None)
+
+    def _fetch_and_store(self, key: str, query: str, stale) -> dict:
+        if self.use_cache:
+            # Another process may have answered it while we waited.
+            cached = search_cache().get(key, record=False)
+            if cached is not None:
+                return json.loads(cached)
+        try:
+            result = self._fetch(query)
+        except Exception:
+            if stale is None:
+                raise
+            _counters.count('stale_served')
+            return json.loads(stale.value)
+        if self.use_cache:
+            search_cache().put(key, json.dumps(result), meta={'query': query})
+        for hit in result.get('organic', []):
+            if hit.get('link') and hit.get('snippet'):
+                remember(hit['link'], f"{hit.get('title', '')}. {hit['snippet']}", source='search')
+        return result
+
+    def _fetch(self, query: str) -> dict:
+        if not self.api_key:
+            raise RuntimeError("SERPER_API_KEY is not set")
+        url = f"{self.base_url.rstrip('/')}/search"
+        with span('http', urlsplit(url).hostname or '', url=url) as traced:
+            _counters.count('api_calls')
+            # A search is read-only, so a POST that timed out can be sent again.
+            response = get_session('serper', IDEMPOTENT_METHODS | {'POST'}).post(
+                url,
+                json={'q': query, 'num': self.n_results},
+                headers={'X-API-KEY': self.api_key, 'Content-Type': 'application/json'},
+                timeout=default_timeout(),
+            )
+            traced.set('status', response.status_code).set('bytes', len(response.content))
+            response.raise_for_status()
+            data = response.json()
+        return {name: data[name] for name in KEPT_FIELDS if name in data}
+
+    @staticmethod
+    def format(result: dict) -> str:
+        parts = []
+        answer = result.get('answerBox') or {}
+        if answer.get('answer') or answer.get('snippet'):
+            parts.append(f"Answer: {answer.get('answer') or answer.get('snippet')}\n"
+                         f"Link: {answer.get('link', '')}")
+        graph = result.get('knowledgeGraph') or {}
+        if graph.get('description'):
+            parts.append(f"{graph.get('title', '')}: {graph['description']}")
+        for hit in result.get('organic', []):
+            parts.append(f"Title: {hit.get('title', '')}\nLink: {hit.get('link', '')}\n"
+                         f"Snippet: {hit.get('snippet', '')}")
+        for question in result.get('peopleAlsoAsk', [])[:3]:
+            parts.append(f"Q: {question.get('question', '')}\nA: {question.get('snippet', '')}\n"
+                         f"Link: {question.get('link', '')}")
+        return "\n---\n".join(parts) if parts else "No search results found"
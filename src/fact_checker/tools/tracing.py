@@ -0,0 +1,397 @@
+"""Timing spans for the hot path, exported as OTLP/JSON and Prometheus metrics.
+
+    with span('tool', 'Web Scraping Tool', urls=3) as s:
+        ...
+        s.add('bytes', len(body))
+
+Spans nest through a context variable, so a tool call made inside a
+task made inside a crew kickoff records all three as one trace. Work
+handed to a thread pool keeps its parent when it is submitted through
+``bind``. The numeric attributes in ``COUNTED`` (bytes and tokens) are
+also summed into counters.
+
+Every finished span updates in-process histograms, which
+``render_metrics`` prints in the Prometheus text format. With
+``FACT_CHECKER_TRACE_FILE`` or ``FACT_CHECKER_OTLP_ENDPOINT`` set, spans
+are also batched on a background thread and written or POSTed as OTLP
+JSON. A span costs a few microseconds, so tracing stays on unless
+``FACT_CHECKER_TRACING=0``.
+"""
+import atexit
+import contextvars
+import json
+import os
+import queue
+import random
+import threading
+import time
+from bisect import bisect_left
+from collections import deque
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+COUNTED = ('bytes', 'prompt_tokens', 'completion_tokens')
+BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0)
+
+_current: contextvars.ContextVar[Optional["Span"]] = contextvars.ContextVar('fact_checker_span', default=None)
+
+
+def enabled() -> bool:
+    return os.getenv('FACT_CHECKER_TRACING', '1') != '0'
+
+
+class Span:
+    """One timed operation. ``label`` names the task, tool, model or host."""
+
+    __slots__ = ('name', 'label', 'trace_id', 'span_id', 'parent_id', 'start_ns', 'end_ns',
+                 'attributes', 'error', '_started')
+
+    def __init__(self, name: str, label: str = '', parent: Optional["Span"] = None,
+                 attributes: Optional[Dict[str, Any]] = None):
+        self.name = name
+        self.label = label
+        self.trace_id = parent.trace_id if parent else random.getrandbits(128)
+        self.span_id = random.getrandbits(64)
+        self.parent_id = parent.span_id if parent else None
+        self.attributes = attributes or {}
+        self.error: Optional[str] = None
+        self.start_ns = time.time_ns()
+        self.end_ns: Optional[int] = None
+        self._started = time.perf_counter()
+
+    def set(self, key: str, value: Any) -> "Span":
+        self.attributes[key] = value
+        return self
+
+    def add(self, key: str, amount: float) -> "Span":
+        self.attributes[key] = self.attributes.get(key, 0) + amount
+        return self
+
+    @property
+    def seconds(self) -> float:
+        if self.end_ns is None:
+            return time.perf_counter() - self._started
+        return (self.end_ns - self.start_ns) / 1e9
+
+    def to_otlp(self) -> Dict[str, Any]:
+        attributes = {'label': self.label, **self.attributes} if self.label else self.attributes
+        data = {
+            'traceId': f"{self.trace_id:032x}",
+            'spanId': f"{self.span_id:016x}",
+            'name': self.name,
+            'kind': 1,
+            'startTimeUnixNano': str(self.start_ns),
+            'endTimeUnixNano': str(self.end_ns or time.time_ns()),
+            'attributes': [{'key': k, 'value': _otlp_value(v)} for k, v in attributes.items()],
+            'status': {'code': 2, 'message': self.error} if self.error else {'code': 1},
+        }
+        if self.parent_id is not None:
+            data['parentSpanId'] = f"{self.parent_id:016x}"
+        return data
+
+
+class _NoopSpan:
+    label = ''
+
+    def set(self, key, value):
+        return self
+
+    def add(self, key, amount):
+        return self
+
+
+NOOP = _NoopSpan()
+
+
+def _otlp_value(value: Any) -> Dict[str, Any]:
+    if isinstance(value, bool):
+        return {'boolValue': value}
+    if isinstance(value, int):
+        return {'intValue': str(value)}
+    if isinstance(value, float):
+        return {'doubleValue': value}
+    return {'stringValue': str(value)}
+
+
+def current() -> Optional[Span]:
+    return _current.get()
+
+
+def start(name: str, label: str = '', **attributes) -> Tuple[Span, contextvars.Token]:
+    """Open a span and make it current; close it with ``end``.
+
+    For callers that cannot use ``span`` as a context manager, such as
+    event handlers that see the start and the end of an operation
+    separately.
+    """
+    opened = Span(name, label, _current.get(), attributes)
+    return opened, _current.set(opened)
+
+
+def end(opened: Span, token: contextvars.Token, error: Optional[str] = None):
+    try:
+        _current.reset(token)
+    except ValueError:
+        # Ended from another context; the opener's context unwinds on its own.
+        pass
+    opened.error = opened.error or error
+    _finish(opened)
+
+
+@contextmanager
+def span(name: str, label: str = '', **attributes) -> Iterator[Span]:
+    if not enabled():
+        yield NOOP
+        return
+    opened, token = start(name, label, **attributes)
+    try:
+        yield opened
+    except BaseException as e:
+        opened.error = f"{type(e).__name__}: {e}"
+        raise
+    finally:
+        _current.reset(token)
+        _finish(opened)
+
+
+def bind(fn: Callable) -> Callable:
+    """Wrap ``fn`` so it runs under the caller's current span (and progress listener).
+
+    Pool threads do not inherit context variables. Each call of the
+    wrapper runs in its own copy of the captured context, so one bound
+    function can be mapped over a pool.
+    """
+    captured = contextvars.copy_context()
+
+    def run(*args, **kwargs):
+        return captured.copy().run(fn, *args, **kwargs)
+
+    return run
+
+
+class Metrics:
+    """Per-span-kind duration histograms and byte/token counters."""
+
+    def __init__(self, buckets: Tuple[float, ...] = BUCKETS):
+        self.buckets = buckets
+        self._lock = threading.Lock()
+        self._histograms: Dict[Tuple[str, str], List[float]] = {}
+        self._errors: Dict[Tuple[str, str], int] = {}
+        self._totals: Dict[Tuple[str, str, str], float] = {}
+
+    def observe(self, finished: Span):
+        key = (finished.name, finished.label)
+        seconds = finished.seconds
+        with self._lock:
+            # Per-bucket counts (non-cumulative, last one is +Inf), then sum and count.
+            histogram = self._histograms.get(key)
+            if histogram is None:
+                histogram = self._histograms[key] = [0.0] * (len(self.buckets) + 3)
+            histogram[bisect_left(self.buckets, seconds)] += 1
+            histogram[-2] += seconds
+            histogram[-1] += 1
+            if finished.error:
+                self._errors[key] = self._errors.get(key, 0) + 1
+            for name in COUNTED:
+                value = finished.attributes.get(name)
+                if value:
+                    total = (name, *key)
+                    self._totals[total] = self._totals.get(total, 0) + value
+
+    def render(self) -> str:
+        """Prometheus text exposition format."""
+        with self._lock:
+            histograms = {k: list(v) for k, v in self._histograms.items()}
+            errors = dict(self._errors)
+            totals = dict(self._totals)
+        lines = [
+            "# HELP fact_checker_span_seconds Duration of traced operations.",
+            "# TYPE fact_checker_span_seconds histogram",
+        ]
+        for (name, label), histogram in sorted(histograms.items()):
+            labels = f'span="{_escape(name)}",label="{_escape(label)}"'
+            cumulative = 0.0
+            for bound, count in zip(self.buckets, histogram):
+                cumulative += count
+                lines.append(f'fact_checker_span_seconds_bucket{{{labels},le="{bound}"}} {cumulative:.0f}')
+            lines.append(f'fact_checker_span_seconds_bucket{{{labels},le="+Inf"}} {histogram[-1]:.0f}')
+            lines.append(f"fact_checker_span_seconds_sum{{{labels}}} {histogram[-2]:.6f}")
+            lines.append(f"fact_checker_span_seconds_count{{{labels}}} {histogram[-1]:.0f}")
+        lines += ["# HELP fact_checker_span_errors_total Traced operations that raised.",
+                  "# TYPE fact_checker_span_errors_total counter"]
+        for (name, label), count in sorted(errors.items()):
+            lines.append(f'fact_checker_span_errors_total{{span="{_escape(name)}",label="{_escape(label)}"}} {count}')
+        for counted in COUNTED:
+            lines += [f"# TYPE fact_checker_{counted}_total counter"]
+            for (metric, name, label), value in sorted(totals.items()):
+                if metric == counted:
+                    lines.append(f'fact_checker_{counted}_total{{span="{_escape(name)}",'
+                                 f'label="{_escape(label)}"}} {value:.0f}')
+        return "\n".join(lines) + "\n"
+
+
+def _escape(value: str) -> str:
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+class OTLPExporter:
+    """Batches finished spans on a background thread and exports them as OTLP JSON.
+
+    ``path`` gets one ``ExportTraceServiceRequest`` JSON object per line;
+    ``endpoint`` (an OTLP/HTTP ``/v1/traces`` URL) gets the same payload
+    POSTed. The hot path only enqueues.
+    """
+
+    def __init__(self, path: Optional[str] = None, endpoint: Optional[str] = None,
+                 batch_size: int = 256, interval: float = 5.0):
+        self.path = path
+        self.endpoint = endpoint
+        self.batch_size = batch_size
+        self.interval = interval
+        self._queue: "queue.SimpleQueue[Optional[Span]]" = queue.SimpleQueue()
+        self._thread = threading.Thread(target=self._loop, name='otlp-exporter', daemon=True)
+        self._thread.start()
+
+    def offer(self, finished: Span):
+        self._queue.put(finished)
+
+    def close(self, timeout: float = 2.0):
+        self._queue.put(None)
+        self._thread.join(timeout)
+
+    def _loop(self):
+        batch: List[Span] = []
+        deadline = time.monotonic() + self.interval
+        while True:
+            try:
+                item = self._queue.get(timeout=max(deadline - time.monotonic(), 0))
+            except queue.Empty:
+                item = NOOP
+            if item is None:
+                if batch:
+                    self._export(batch)
+                return
+            if item is not NOOP:
+                batch.append(item)
+            if len(batch) >= self.batch_size or time.monotonic() >= deadline:
+                if batch:
+                    self._export(batch)
+                    batch = []
+                deadline = time.monotonic() + self.interval
+
+    def _export(self, batch: List[Span]):
+        payload = {'resourceSpans': [{
+            'resource': {'attributes': [{'key': 'service.name', 'value': {'stringValue': 'fact_checker'}}]},
+            'scopeSpans': [{'scope': {'name': 'fact_checker.tracing'}, 'spans': [s.to_otlp() for s in batch]}],
+        }]}
+        try:
+            if self.path:
+                with open(self.path, 'a', encoding='utf-8') as f:
+                    f.write(json.dumps(payload) + "\n")
+            if self.endpoint:
+                from .http_client import default_timeout, get_session
+                get_session('otlp').post(self.endpoint, json=payload, timeout=default_timeout())
+        except Exception as e:
+            print(f"⚠️ Trace export failed: {e}")
+
+
+metrics = Metrics()
+_recent: "deque[Span]" = deque(maxlen=1024)
+_exporter: Optional[OTLPExporter] = None
+_exporter_lock = threading.Lock()
+_exporter_checked = False
+
+
+def _get_exporter() -> Optional[OTLPExporter]:
+    global _exporter, _exporter_checked
+    if not _exporter_checked:
+        with _exporter_lock:
+            if not _exporter_checked:
+                path, endpoint = os.getenv('FACT_CHECKER_TRACE_FILE'), os.getenv('FACT_CHECKER_OTLP_ENDPOINT')
+                if path or endpoint:
+                    _exporter = OTLPExporter(path, endpoint)
+                    atexit.register(_exporter.close)
+                _exporter_checked = True
+    return _exporter
+
+
+def _finish(finished: Span):
+    finished.end_ns = time.time_ns()
+    metrics.observe(finished)
+    _recent.append(finished)
+    exporter = _get_exporter()
+    if exporter is not None:
+        exporter.offer(finished)
+
+
+def recent_spans(trace_id: Optional[int] = None) -> List[Span]:
+    """The last finished spans, optionally of one trace, oldest first."""
+    spans = list(_recent)
+    return [s for s in spans if s.trace_id == trace_id] if trace_id is not None else spans
+
+
+def render_metrics() -> str:
+    return metrics.render()
+
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.path.split('?', 1)[0] != '/metrics':
+            self.send_response(404)
+            self.send_header('Content-Length', '0')
+            self.end_headers()
+            return
+        data = render_metrics().encode()
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/plain; version=0.0.4')
+        self.send_header('Content-Length', str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, *args):
+        pass
+
+
+_metrics_server: Optional[ThreadingHTTPServer] = None
+
+
+def serve_metrics(port: Optional[int] = None, host: str = '0.0.0.0') -> Optional[ThreadingHTTPServer]:
+    """Serve ``GET /metrics`` on ``port`` (default ``FACT_CHECKER_METRICS_PORT``), once per process."""
+    global _metrics_server
+    port = port if port is not None else int(os.getenv('FACT_CHECKER_METRICS_PORT', 0) or 0)
+    with _exporter_lock:
+        if _metrics_server is None and port:
+            _metrics_server = ThreadingHTTPServer((host, port), _MetricsHandler)
+            _metrics_server.daemon_threads = True
+            threading.Thread(target=_metrics_server.serve_forever, name='metrics', daemon=True).start()
+    return _metrics_server
+
+
+_open_kickoffs: Dict[int, Tuple[Span, contextvars.Token]] = {}
+_crews_traced = False
+
+
+def trace_crews():
+    """Record every crew kickoff as a span, via crewai's event bus (idempotent)."""
+    global _crews_traced
+    if _crews_traced or not enabled():
+        return
+    from crewai.utilities.events import (
+        CrewKickoffCompletedEvent, CrewKickoffFailedEvent, CrewKickoffStartedEvent, crewai_event_bus,
+    )
+
+    def started(source, event):
+        _open_kickoffs[id(source)] = start('crew.kickoff', event.crew_name or 'crew')
+
+    def finished(source, event):
+        opened = _open_kickoffs.pop(id(source), None)
+        if opened is not None:
+            end(*opened, error=getattr(event, 'error', None))
+
+    with _exporter_lock:
+        if not _crews_traced:
+            crewai_event_bus.register_handler(CrewKickoffStartedEvent, started)
+            crewai_event_bus.register_handler(CrewKickoffCompletedEvent, finished)
+            crewai_event_bus.register_handler(CrewKickoffFailedEvent, finished)
+            _crews_traced = True
@@ -0,0 +1,143 @@
+import math
+from array import array
+from bisect import bisect_left, bisect_right
+from collections import defaultdict
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Sequence
+
+from .relevance import tokenize
+
+
+def format_timestamp(seconds: float) -> str:
+    seconds = int(seconds)
+    return f"{seconds // 3600:d}:{seconds // 60 % 60:02d}:{seconds % 60:02d}"
+
+
+@dataclass
+class Window:
+    start: float
+    end: float
+    text: str
+    score: float = 0.0
+
+    def render(self) -> str:
+        return f"[{format_timestamp(self.start)}-{format_timestamp(self.end)}] {self.text}"
+
+
+class TranscriptIndex:
+    """Columnar transcript segments with an inverted index over them.
+
+    Segments live in parallel arrays (start, duration, offset into one
+    joined text string) rather than a list of dicts, and each term maps to
+    the sorted ids of the segments containing it. That lets the tool answer
+    "which windows talk about X" or "what was said between t1 and t2"
+    without materialising the whole transcript.
+    """
+
+    def __init__(self, segments: Sequence[dict]):
+        self.starts = array('d')
+        self.durations = array('d')
+        self.offsets = array('I', [0])
+        parts = []
+        postings: Dict[str, List[int]] = defaultdict(list)
+        size = 0
+        for i, seg in enumerate(sorted(segments, key=lambda s: s.get('start', 0.0))):
+            text = ' '.join(str(seg.get('text', '')).split())
+            self.starts.append(float(seg.get('start', 0.0)))
+            self.durations.append(float(seg.get('duration', 0.0)))
+            parts.append(text)
+            size += len(text) + 1
+            self.offsets.append(size)
+            for term in set(tokenize(text)):
+                postings[term].append(i)
+        self.text = ' '.join(parts) + ' '
+        self.postings = {term: array('I', ids) for term, ids in postings.items()}
+
+    def __len__(self) -> int:
+        return len(self.starts)
+
+    def segment_text(self, i: int) -> str:
+        return self.text[self.offsets[i]:self.offsets[i + 1] - 1]
+
+    def _span(self, lo: int, hi: int, score: float = 0.0) -> Window:
+        """Window covering segments ``lo`` (inclusive) to ``hi`` (exclusive)."""
+        return Window(
+            start=self.starts[lo],
+            end=self.starts[hi - 1] + self.durations[hi - 1],
+            text=self.text[self.offsets[lo]:self.offsets[hi] - 1],
+            score=score,
+        )
+
+    def time_range(self, start: float = 0.0, end: Optional[float] = None) -> Optional[Window]:
+        lo = bisect_right(self.starts, start) - 1
+        lo = max(lo, 0)
+        if lo < len(self) and self.starts[lo] + self.durations[lo] <= start:
+            lo += 1
+        hi = len(self) if end is None else bisect_left(self.starts, end)
+        if lo >= hi:
+            return None
+        return self._span(lo, hi)
+
+    def windows(self, seconds: float = 30.0) -> List[Window]:
+        """The whole transcript as consecutive windows of about ``seconds``."""
+        out, lo = [], 0
+        while lo < len(self):
+            hi = max(bisect_left(self.starts, self.starts[lo] + seconds), lo + 1)
+            out.append(self._span(lo, hi))
+            lo = hi
+        return out
+
+    def search(self, query: str, k: int = 3, window: float = 60.0,
+               start: float = 0.0, end: Optional[float] = None) -> List[Window]:
+        """Top-``k`` non-overlapping windows of ~``window`` seconds for ``query``.
+
+        Each matching segment scores the sum of idf of the query terms it
+        contains; a candidate window centred on a match scores the total of
+        the matches it covers, so dense discussion beats a passing mention.
+        Results are returned in time order.
+        """
+        n = len(self)
+        scores: Dict[int, float] = defaultdict(float)
+        for term in set(tokenize(query)):
+            ids = self.postings.get(term)
+            if not ids:
+                continue
+            idf = math.log(1 + (n - len(ids) + 0.5) / (len(ids) + 0.5))
+            for i in ids:
+                if self.starts[i] >= start and (end is None or self.starts[i] < end):
+                    scores[i] += idf
+        if not scores:
+            return []
+
+        hits = sorted(scores)
+        prefix = [0.0]
+        for i in hits:
+            prefix.append(prefix[-1] + scores[i])
+
+        half = window / 2
+        candidates = []
+        for i in hits:
+            lo = bisect_left(self.starts, self.starts[i] - half)
+            hi = bisect_right(self.starts, self.starts[i] + half)
+            total = prefix[bisect_left(hits, hi)] - prefix[bisect_left(hits, lo)]
+            candidates.append((total, lo, hi))
+        candidates.sort(key=lambda c: (-c[0], c[1]))
+
+        chosen = []
+        for total, lo, hi in candidates:
+            if len(chosen) == k:
+                break
+            if any(lo < c_hi and c_lo < hi for _, c_lo, c_hi in chosen):
+                continue
+            chosen.append((total, lo, hi))
+        return [self._span(lo, hi, total) for total, lo, hi in sorted(chosen, key=lambda c: c[1])]
+
+    def render_full(self, marker_every: float = 60.0) -> str:
+        """Whole transcript with a timestamp marker roughly every ``marker_every`` s."""
+        out, next_marker = [], 0.0
+        for i in range(len(self)):
+            if self.starts[i] >= next_marker:
+                out.append(f"[{format_timestamp(self.starts[i])}]")
+                next_marker = self.starts[i] + marker_every
+            out.append(self.segment_text(i))
+        return ' '.join(out)
@@ -0,0 +1,368 @@
+import json
+import os
+import shutil
+import threading
+import time
+from pathlib import Path
+from typing import List, Optional, Tuple
+
+import numpy as np
+
+from ..embeddings import Embedder, HashingEmbedder, get_embedder
+from .evidence_index import Evidence, EvidenceIndex, evidence_index, file_lock
+from .tracing import span
+
+# Rows scored per matrix product when scanning without the IVF lists;
+# keeps the float32 copy of a chunk small (32768 x 1024 dims = 128 MB).
+CHUNK_ROWS = 32768
+
+
+def _nearest(rows: np.ndarray, centroids: np.ndarray) -> np.ndarray:
+    """Index of the most similar centroid for each row, in bounded chunks."""
+    out = np.empty(len(rows), dtype=np.int32)
+    for start in range(0, len(rows), 8192):
+        block = np.asarray(rows[start:start + 8192], dtype=np.float32)
+        out[start:start + len(block)] = (block @ centroids.T).argmax(axis=1)
+    return out
+
+
+def _kmeans(sample: np.ndarray, nlist: int, iterations: int = 10, seed: int = 0) -> np.ndarray:
+    """Spherical k-means: unit-length centroids maximising cosine to their rows."""
+    rng = np.random.default_rng(seed)
+    centroids = sample[rng.choice(len(sample), nlist, replace=False)].copy()
+    for _ in range(iterations):
+        assign = _nearest(sample, centroids)
+        order = np.argsort(assign, kind="stable")
+        counts = np.bincount(assign, minlength=nlist)
+        filled = np.flatnonzero(counts)
+        starts = np.concatenate([[0], np.cumsum(counts)[:-1]])[filled]
+        centroids[filled] = np.add.reduceat(sample[order], starts, axis=0)
+        norms = np.linalg.norm(centroids, axis=1, keepdims=True)
+        norms[norms == 0] = 1.0
+        centroids /= norms
+    return centroids
+
+
+class VectorIndex:
+    """Embeddings of the evidence passages, searched by cosine similarity.
+
+    Rows are L2-normalised float16 vectors in one memory-mapped matrix
+    (``vectors.f16``), with each row's passage id in ``ids.i64``. New
+    passages are embedded in batches of ``batch_size`` and appended; the
+    files grow by doubling. ``meta.json`` records the embedding model, the
+    committed row count and the last embedded passage id, so readers never
+    see a half-written batch, and switching models starts a new matrix.
+
+    A query is a matrix-vector product over the rows. Past
+    ``ivf_min_rows`` rows an IVF coarse quantizer is trained (spherical
+    k-means over a sample): every row is filed under its nearest centroid,
+    and a query only scores the rows of its ``nprobe`` nearest lists. Rows
+    appended later are assigned to a list as they arrive; the quantizer is
+    retrained by ``sync`` (the background embedding thread) once the
+    matrix has doubled since the last training.
+    """
+
+    def __init__(self, root: Path, embedder: Optional[Embedder] = None,
+                 evidence: Optional[EvidenceIndex] = None, batch_size: int = 128,
+                 nprobe: int = 16, ivf_min_rows: int = 100_000):
+        self.root = Path(root)
+        self.root.mkdir(parents=True, exist_ok=True)
+        self.embedder = embedder or get_embedder()
+        self.dim = self.embedder.dim
+        self.evidence = evidence
+        self.batch_size = batch_size
+        self.nprobe = nprobe
+        self.ivf_min_rows = ivf_min_rows
+        self._lock = threading.RLock()
+        self._stats = {"embedded": 0, "queries": 0, "trainings": 0}
+        self._meta_mtime = None
+        self.meta: dict = {}
+        self.vectors: Optional[np.ndarray] = None
+        self.ids: Optional[np.ndarray] = None
+        self.lists: Optional[np.ndarray] = None
+        self.centroids: Optional[np.ndarray] = None
+        self._order: Optional[np.ndarray] = None
+        self._offsets: Optional[np.ndarray] = None
+        meta = self._read_meta()
+        if meta and (meta["model"] != self.embedder.name or meta["dim"] != self.dim):
+            with self._writer():
+                self._reset()
+        self._reload()
+
+    def _writer(self):
+        return file_lock(self.root / "lock")
+
+    @property
+    def _meta_path(self) -> Path:
+        return self.root / "meta.json"
+
+    def _read_meta(self) -> dict:
+        try:
+            return json.loads(self._meta_path.read_text())
+        except FileNotFoundError:
+            return {}
+
+    def _write_meta(self, meta: dict):
+        tmp = self._meta_path.with_suffix(".tmp")
+        tmp.write_text(json.dumps(meta))
+        os.replace(tmp, self._meta_path)
+
+    def _reset(self):
+        for path in self.root.iterdir():
+            if path.name == "lock":
+                continue
+            if path.is_dir():
+                shutil.rmtree(path, ignore_errors=True)
+            else:
+                path.unlink(missing_ok=True)
+        self._meta_mtime = None
+
+    def _map(self, name: str, dtype, capacity: int, width: int = 0, mode: str = "r") -> np.ndarray:
+        shape = (capacity, width) if width else (capacity,)
+        return np.memmap(self.root / name, dtype=dtype, mode=mode, shape=shape)
+
+    def _reload(self):
+        """Map the matrix and IVF lists described by ``meta.json``, if it changed."""
+        try:
+            mtime = self._meta_path.stat().st_mtime_ns
+        except FileNotFoundError:
+            mtime = None
+        if mtime == self._meta_mtime:
+            return
+        meta = self._read_meta()
+        capacity = meta.get("capacity", 0)
+        if capacity and capacity != self.meta.get("capacity"):
+            self.vectors = self._map("vectors.f16", np.float16, capacity, self.dim)
+            self.ids = self._map("ids.i64", np.int64, capacity)
+            self.lists = self._map("lists.i32", np.int32, capacity)
+        ivf = meta.get("ivf")
+        if ivf and ivf != self.meta.get("ivf"):
+            path = self.root / ivf
+            self.centroids = np.load(path / "centroids.npy")
+            self._order = np.load(path / "order.npy", mmap_mode="r")
+            self._offsets = np.load(path / "offsets.npy")
+        elif not ivf:
+            self.centroids = self._order = self._offsets = None
+        self.meta = meta
+        self._meta_mtime = mtime
+
+    def __len__(self) -> int:
+        return self.meta.get("count", 0)
+
+    def append(self, ids: np.ndarray, vectors: np.ndarray) -> int:
+        """Store unit ``vectors`` for passage ``ids`` (ascending); returns rows added.
+
+        Ids at or below the last stored one are skipped, so processes
+        embedding the same new passages at once store them only once.
+        """
+        with self._lock, self._writer():
+            self._reload()
+            meta = dict(self.meta) or {"model": self.embedder.name, "dim": self.dim, "count": 0,
+                                       "capacity": 0, "last_id": 0, "ivf": None, "ivf_rows": 0}
+            keep = ids > meta["last_id"]
+            ids, vectors = ids[keep], vectors[keep]
+            if not len(ids):
+                return 0
+            count, capacity = meta["count"], meta["capacity"]
+            end = count + len(ids)
+            if end > capacity:
+                capacity = max(end, 2 * capacity, 1024)
+                for name, row_bytes in (("vectors.f16", 2 * self.dim), ("ids.i64", 8), ("lists.i32", 4)):
+                    with open(self.root / name, "ab") as handle:
+                        handle.truncate(capacity * row_bytes)
+            written = self._map("vectors.f16", np.float16, capacity, self.dim, "r+")
+            written[count:end] = vectors
+            written.flush()
+            written = self._map("ids.i64", np.int64, capacity, mode="r+")
+            written[count:end] = ids
+            written.flush()
+            written = self._map("lists.i32", np.int32, capacity, mode="r+")
+            written[count:end] = _nearest(vectors, self.centroids) if meta["ivf"] else -1
+            written.flush()
+            del written
+            meta.update(count=end, capacity=capacity, last_id=int(ids[-1]))
+            self._write_meta(meta)
+            self._reload()
+            return len(ids)
+
+    def _train_due(self) -> bool:
+        with self._lock:
+            self._reload()
+            count = len(self)
+        return count >= self.ivf_min_rows and count >= 2 * self.meta.get("ivf_rows", 0)
+
+    def _train(self):
+        """Fit the IVF centroids and file every row under its nearest one.
+
+        The k-means and the assignment run on the rows committed when
+        training starts, without any lock, so searches and appends go on
+        meanwhile. Only writing the lists and switching ``meta.json`` to
+        the new quantizer is locked; rows appended during training are
+        assigned then.
+        """
+        with self._lock:
+            self._reload()
+            count, vectors = len(self), self.vectors
+        with span("vector_index", "train") as traced:
+            nlist = min(count, int(np.clip(np.sqrt(count), 16, 4096)))
+            rng = np.random.default_rng(count)
+            sample = np.sort(rng.choice(count, size=min(count, 64 * nlist), replace=False))
+            centroids = _kmeans(np.asarray(vectors[sample], dtype=np.float32), nlist)
+            assign = _nearest(vectors[:count], centroids)
+            order = np.argsort(assign, kind="stable").astype(np.int64)
+            offsets = np.concatenate([[0], np.cumsum(np.bincount(assign, minlength=nlist))]).astype(np.int64)
+            name = f"ivf-{time.time_ns()}"
+            tmp = self.root / f"{name}.tmp"
+            tmp.mkdir()
+            np.save(tmp / "centroids.npy", centroids.astype(np.float32))
+            np.save(tmp / "order.npy", order)
+            np.save(tmp / "offsets.npy", offsets)
+            os.replace(tmp, self.root / name)
+            with self._lock, self._writer():
+                self._reload()
+                if self.meta.get("ivf_rows", 0) >= count:
+                    # Another process trained on at least as many rows meanwhile.
+                    shutil.rmtree(self.root / name, ignore_errors=True)
+                    return
+                end = len(self)
+                lists = self._map("lists.i32", np.int32, self.meta["capacity"], mode="r+")
+                lists[:count] = assign
+                lists[count:end] = _nearest(self.vectors[count:end], centroids)
+                lists.flush()
+                del lists
+                old = self.meta.get("ivf")
+                self._write_meta({**self.meta, "ivf": name, "ivf_rows": count})
+                self._reload()
+            if old:
+                shutil.rmtree(self.root / old, ignore_errors=True)
+            self._stats["trainings"] += 1
+            traced.set("rows", count).set("nlist", nlist)
+
+    def sync(self) -> int:
+        """Embed the evidence passages stored since the last sync, then retrain
+        the quantizer if it is due; returns how many passages were embedded."""
+        evidence = self.evidence or evidence_index()
+        if evidence is None:
+            return 0
+        done = 0
+        while True:
+            with self._lock:
+                self._reload()
+                rows = evidence.passages_after(self.meta.get("last_id", 0), self.batch_size)
+            if not rows:
+                if self._train_due():
+                    self._train()
+                return done
+            with span("vector_index", "embed", rows=len(rows)):
+                vectors = self.embedder.embed([text for _, text in rows])
+            added = self.append(np.array([passage_id for passage_id, _ in rows], dtype=np.int64), vectors)
+            self._stats["embedded"] += added
+            done += added
+
+    def nearest(self, query: np.ndarray, k: int = 8, nprobe: Optional[int] = None) -> Tuple[np.ndarray, np.ndarray]:
+        """``(passage ids, cosines)`` of the ``k`` rows closest to unit vector ``query``.
+
+        ``nprobe=0`` scans every row even when the IVF lists exist.
+        """
+        nprobe = self.nprobe if nprobe is None else nprobe
+        with self._lock:
+            self._reload()
+            count, ivf_rows = len(self), self.meta.get("ivf_rows", 0)
+            vectors, ids, lists = self.vectors, self.ids, self.lists
+            centroids, order, offsets = self.centroids, self._order, self._offsets
+        if not count:
+            return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.float32)
+        query = np.asarray(query, dtype=np.float32)
+        if centroids is not None and nprobe:
+            probe = np.argpartition(-(centroids @ query), min(nprobe, len(centroids)) - 1)[:nprobe]
+            rows = [order[offsets[p]:offsets[p + 1]] for p in probe]
+            rows.append(ivf_rows + np.flatnonzero(np.isin(lists[ivf_rows:count], probe)))
+            rows = np.sort(np.concatenate(rows))
+            scores = np.concatenate([
+                vectors[rows[i:i + CHUNK_ROWS]].astype(np.float32) @ query
+                for i in range(0, len(rows), CHUNK_ROWS)
+            ]) if len(rows) else np.empty(0, dtype=np.float32)
+        else:
+            rows = np.arange(count)
+            scores = np.concatenate([
+                vectors[i:min(i + CHUNK_ROWS, count)].astype(np.float32) @ query
+                for i in range(0, count, CHUNK_ROWS)
+            ])
+        k = min(k, len(scores))
+        if not k:
+            return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.float32)
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top])]
+        return np.asarray(ids[rows[top]]), scores[top]
+
+    def search(self, query: str, k: int = 8) -> List[Evidence]:
+        """Passages closest in meaning to ``query``; score and coverage are the cosine."""
+        evidence = self.evidence or evidence_index()
+        if evidence is None:
+            return []
+        with span("vector_index", "search") as traced:
+            self._stats["queries"] += 1
+            ids, scores = self.nearest(self.embedder.embed([query])[0], k)
+            traced.set("rows", len(self)).set("hits", len(ids))
+            return evidence.fetch({int(i): (float(s), float(s)) for i, s in zip(ids, scores)})
+
+    def size_bytes(self) -> int:
+        return sum(path.stat().st_size for path in self.root.rglob("*") if path.is_file())
+
+    def stats(self) -> dict:
+        with self._lock:
+            self._reload()
+            stats = dict(self._stats)
+            stats.update(rows=len(self), ivf_lists=0 if self.centroids is None else len(self.centroids))
+        return stats
+
+
+_index: Optional[VectorIndex] = None
+_index_lock = threading.Lock()
+
+
+def _keep_synced(index: VectorIndex, evidence: EvidenceIndex):
+    """Embed new evidence passages on a daemon thread as they are added."""
+    wake = threading.Event()
+    evidence.subscribe(lambda count: wake.set())
+
+    def worker():
+        while True:
+            wake.wait()
+            wake.clear()
+            try:
+                index.sync()
+            except Exception as e:
+                print(f"⚠️ Vector index update failed: {e}")
+
+    threading.Thread(target=worker, name="vector-index", daemon=True).start()
+    wake.set()  # catch up with passages stored before this process started
+
+
+def vector_index() -> Optional[VectorIndex]:
+    """Process-wide index over the evidence index, or None when either is disabled.
+
+    Only built with a real embedding model (``FACT_CHECKER_EMBEDDING_MODEL``):
+    hashing features match shared words, not meaning, so they would let
+    lexically similar but unrelated passages pass as evidence. Off with
+    ``FACT_CHECKER_VECTOR_INDEX=0``.
+    """
+    global _index
+    if os.getenv("FACT_CHECKER_VECTOR_INDEX", "1") == "0":
+        return None
+    if not os.getenv("FACT_CHECKER_EMBEDDING_MODEL") or isinstance(get_embedder(), HashingEmbedder):
+        return None
+    evidence = evidence_index()
+    if evidence is None:
+        return None
+    if _index is None:
+        with _index_lock:
+            if _index is None:
+                _index = VectorIndex(
+                    evidence.root / "vectors",
+                    evidence=evidence,
+                    nprobe=int(os.getenv("FACT_CHECKER_VECTOR_NPROBE", 16)),
+                    ivf_min_rows=int(os.getenv("FACT_CHECKER_VECTOR_IVF_MIN_ROWS", 100_000)),
+                )
+                _keep_synced(_index, evidence)
+    return _index
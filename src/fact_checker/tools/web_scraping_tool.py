@@ -1,41 +1,284 @@
 from crewai.tools import BaseTool
 from pydantic import BaseModel, Field
-from typing import Type
-import requests
-from bs4 import BeautifulSoup
+from typing import Dict, Iterable, List, Optional, Set, Type
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+import asyncio
+import os
+from .http_client import get_session, default_timeout
+from .disk_cache import get_cache
+from .evidence_index import remember
+from .concurrency import run_sync
+from .tracing import bind, span
+from .relevance import select_passages
+from .html_extract import extract_main_text, extract_text_lxml, extract_text_soup, extract_text_stream
+
+TRACKING_PARAMS = ('utm_', 'fbclid', 'gclid', 'mc_cid', 'mc_eid', 'ref_src')
+
+
+def normalize_url(url: str) -> str:
+    """Canonical cache key: lowercase host, no fragment, sorted query, no trackers."""
+    parts = urlsplit(url.strip())
+    scheme = (parts.scheme or 'http').lower()
+    host = (parts.hostname or '').lower()
+    port = parts.port
+    if port and not ((scheme == 'http' and port == 80) or (scheme == 'https' and port == 443)):
+        host = f"{host}:{port}"
+    query = sorted(
+        (k, v) for k, v in parse_qsl(parts.query, keep_blank_values=True)
+        if not k.lower().startswith(TRACKING_PARAMS)
+    )
+    return urlunsplit((scheme, host, parts.path or '/', urlencode(query), ''))
+
+
+def scrape_cache():
+    return get_cache(
+        'scrape',
+        ttl=float(os.getenv('FACT_CHECKER_SCRAPE_CACHE_TTL', 3600)),
+        max_bytes=int(float(os.getenv('FACT_CHECKER_SCRAPE_CACHE_MAX_MB', 256)) * 1024 * 1024),
+    )
+
+
+def _read_capped(chunks: Iterable[bytes], max_bytes: int) -> bytes:
+    body = bytearray()
+    for chunk in chunks:
+        body.extend(chunk)
+        if len(body) >= max_bytes:
+            break
+    return bytes(body[:max_bytes])
+
+
+def _counted(chunks: Iterable[bytes], traced) -> Iterable[bytes]:
+    """Pass ``chunks`` through, adding their size to the span's ``bytes``."""
+    for chunk in chunks:
+        traced.add('bytes', len(chunk))
+        yield chunk
+
+
+class ExtractionBackend:
+    """Turns a response body into plain text within a character budget.
+
+    Backends receive the body as an iterator of chunks so streaming ones
+    can stop reading early; whole-document backends read up to
+    ``max_bytes`` and parse once.
+    """
+
+    name = 'base'
+    requires: Optional[str] = None
+
+    def available(self) -> bool:
+        if not self.requires:
+            return True
+        try:
+            __import__(self.requires)
+            return True
+        except ImportError:
+            return False
+
+    def extract(self, chunks: Iterable[bytes], max_chars: int, max_bytes: int,
+                encoding: Optional[str] = None) -> str:
+        raise NotImplementedError
+
+
+class SoupBackend(ExtractionBackend):
+    """BeautifulSoup with the stdlib html.parser: the original behaviour."""
+
+    name = 'soup'
+
+    def extract(self, chunks, max_chars, max_bytes, encoding=None):
+        return extract_text_soup(_read_capped(chunks, max_bytes), max_chars)
+
+
+class StreamingBackend(ExtractionBackend):
+    """Incremental stdlib parser that stops once the budget is filled."""
+
+    name = 'stream'
+
+    def extract(self, chunks, max_chars, max_bytes, encoding=None):
+        return extract_text_stream(chunks, max_chars=max_chars, max_bytes=max_bytes, encoding=encoding)
+
+
+class LxmlBackend(ExtractionBackend):
+    """Full-page text via lxml, several times faster than html.parser."""
+
+    name = 'lxml'
+    requires = 'lxml'
+
+    def extract(self, chunks, max_chars, max_bytes, encoding=None):
+        return extract_text_lxml(_read_capped(chunks, max_bytes), max_chars)
+
+
+class ArticleBackend(ExtractionBackend):
+    """Main-article text only: drops navigation, footers and cookie banners."""
+
+    name = 'article'
+    requires = 'lxml'
+
+    def extract(self, chunks, max_chars, max_bytes, encoding=None):
+        return extract_main_text(_read_capped(chunks, max_bytes), max_chars)
+
+
+EXTRACTION_BACKENDS: Dict[str, ExtractionBackend] = {
+    backend.name: backend
+    for backend in (SoupBackend(), StreamingBackend(), LxmlBackend(), ArticleBackend())
+}
+
+
+# Backend names already reported as unavailable, so the fallback is announced
+# once per process rather than on every scrape.
+_unavailable_backends: Set[str] = set()
+
+
+def get_backend(name: str) -> ExtractionBackend:
+    """Look up a backend, falling back to the soup extractor if unusable."""
+    backend = EXTRACTION_BACKENDS.get(name)
+    if backend is None or not backend.available():
+        if name not in _unavailable_backends:
+            _unavailable_backends.add(name)
+            print(f"⚠️ Extraction backend '{name}' unavailable, using 'soup'")
+        return EXTRACTION_BACKENDS['soup']
+    return backend
+
+
+@dataclass
+class ScrapeResult:
+    url: str
+    text: str = ''
+    error: Optional[str] = None
+
+    def render(self) -> str:
+        if self.error:
+            return f"Error scraping website {self.url}: {self.error}"
+        return f"Web Content from {self.url}:\n\n{self.text}"
+
+
+# Fetch and parse run here so CPU-bound extraction never blocks the loop.
+_scrape_executor = ThreadPoolExecutor(
+    max_workers=int(os.getenv('FACT_CHECKER_SCRAPE_WORKERS', 16)),
+    thread_name_prefix='scrape',
+)
+
 
 class WebScrapingInput(BaseModel):
-    url: str = Field(..., description="Website URL to scrape")
+    url: str = Field("", description="Website URL to scrape")
+    urls: List[str] = Field(
+        default_factory=list,
+        description="Several website URLs to scrape concurrently in one call",
+    )
+    claim: str = Field(
+        "",
+        description="The claim being checked; when given, the passages most relevant "
+                    "to it are returned instead of only the start of the page",
+    )
 
 class WebScrapingTool(BaseTool):
     name: str = "Web Scraping Tool"
     description: str = "Extract content from web pages for fact-checking"
     args_schema: Type[BaseModel] = WebScrapingInput
+    use_cache: bool = True
+    backend: str = os.getenv('FACT_CHECKER_SCRAPE_BACKEND', 'stream')
+    max_chars: int = 5000
+    extract_chars: int = int(os.getenv('FACT_CHECKER_SCRAPE_EXTRACT_CHARS', 50000))
+    max_bytes: int = int(os.getenv('FACT_CHECKER_SCRAPE_MAX_BYTES', 2 * 1024 * 1024))
+    max_concurrency: int = int(os.getenv('FACT_CHECKER_SCRAPE_CONCURRENCY', 8))
+    per_host_concurrency: int = int(os.getenv('FACT_CHECKER_SCRAPE_PER_HOST', 2))
 
-    def _run(self, url: str) -> str:
+    def _run(self, url: str = "", urls: Optional[List[str]] = None, claim: str = "") -> str:
+        targets = [u for u in ([url] if url else []) + list(urls or []) if u]
+        if not targets:
+            return "Error scraping website: no URL provided"
+        with span('tool', self.name, urls=len(targets)) as traced:
+            if len(targets) == 1:
+                output = self.scrape(targets[0], claim).render()
+            else:
+                output = "\n\n---\n\n".join(result.render() for result in self.scrape_many(targets, claim))
+            traced.set('output_chars', len(output))
+            return output
+
+    def scrape(self, url: str, claim: str = "") -> ScrapeResult:
         try:
-            headers = {
-                'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-            }
-            
-            response = requests.get(url, headers=headers, timeout=10)
-            response.raise_for_status()
-            
-            soup = BeautifulSoup(response.content, 'html.parser')
-            
-            for script in soup(["script", "style"]):
-                script.decompose()
-            
-            text = soup.get_text()
-            
-            lines = (line.strip() for line in text.splitlines())
-            chunks = (phrase.strip() for line in lines for phrase in line.split("  "))
-            text = ' '.join(chunk for chunk in chunks if chunk)
-            
-            if len(text) > 5000:
-                text = text[:5000] + "..."
-            
-            return f"Web Content from {url}:\n\n{text}"
-            
+            return ScrapeResult(url=url, text=self._fit(self._scrape(url), claim))
         except Exception as e:
-            return f"Error scraping website {url}: {str(e)}"
\ No newline at end of file
+            return ScrapeResult(url=url, error=str(e))
+
+    def _fit(self, text: str, claim: str) -> str:
+        """Cut extracted page text down to ``max_chars`` for the prompt."""
+        if claim:
+            return select_passages(text, claim, self.max_chars)
+        if len(text) > self.max_chars:
+            text = text[:self.max_chars] + "..."
+        return text
+
+    def scrape_many(self, urls: List[str], claim: str = "") -> List[ScrapeResult]:
+        """Scrape ``urls`` concurrently; results keep the input order."""
+        return run_sync(self.scrape_many_async(urls, claim))
+
+    async def scrape_many_async(self, urls: List[str], claim: str = "") -> List[ScrapeResult]:
+        loop = asyncio.get_running_loop()
+        limit = asyncio.Semaphore(self.max_concurrency)
+        per_host = defaultdict(lambda: asyncio.Semaphore(self.per_host_concurrency))
+
+        async def fetch(url: str) -> ScrapeResult:
+            host = (urlsplit(url).hostname or '').lower()
+            async with per_host[host], limit:
+                return await loop.run_in_executor(_scrape_executor, bind(self.scrape), url, claim)
+
+        return list(await asyncio.gather(*(fetch(url) for url in urls)))
+
+    def _scrape(self, url: str) -> str:
+        with span('http', urlsplit(url).hostname or '', url=url) as traced:
+            return self._scrape_traced(url, traced)
+
+    def _scrape_traced(self, url: str, traced) -> str:
+        cache = scrape_cache() if self.use_cache else None
+        backend = get_backend(self.backend)
+        # Backends extract different text from the same page, so each has its own entries.
+        key = f"{backend.name}:{normalize_url(url)}"
+        entry = cache.lookup(key) if cache else None
+        if entry and entry.fresh:
+            traced.set('cache', 'hit')
+            return entry.value
+
+        headers = {}
+        if entry:
+            if entry.meta.get('etag'):
+                headers['If-None-Match'] = entry.meta['etag']
+            if entry.meta.get('last_modified'):
+                headers['If-Modified-Since'] = entry.meta['last_modified']
+
+        response = get_session().get(
+            url, headers=headers, timeout=default_timeout(), stream=True
+        )
+        with response:
+            traced.set('status', response.status_code)
+            if entry and response.status_code == 304:
+                # Unchanged upstream: keep the stored text, skip download and parse.
+                traced.set('cache', 'revalidated')
+                cache.touch(key)
+                return entry.value
+            response.raise_for_status()
+            traced.set('cache', 'miss')
+            text = self._extract(response, traced, backend)
+            traced.set('chars', len(text))
+
+        if cache:
+            cache.put(key, text, meta={
+                'etag': response.headers.get('ETag'),
+                'last_modified': response.headers.get('Last-Modified'),
+            })
+        remember(url, text)
+        return text
+
+    def _extract(self, response, traced=None, backend: Optional[ExtractionBackend] = None) -> str:
+        content_type = response.headers.get('Content-Type', '')
+        declared = content_type.split('charset=')[-1].strip() if 'charset=' in content_type else None
+        chunks = response.iter_content(chunk_size=16384)
+        backend = backend or get_backend(self.backend)
+        return backend.extract(
+            _counted(chunks, traced) if traced is not None else chunks,
+            max_chars=self.extract_chars,
+            max_bytes=self.max_bytes,
+            encoding=declared,
+        )
@@ -1,29 +1,72 @@
 from crewai.tools import BaseTool
 from pydantic import BaseModel, Field
-from typing import Type
+from typing import List, Optional, Tuple, Type
+from collections import OrderedDict
+import json
+import os
 import re
+import threading
+import time
+from .http_client import get_session
+from .disk_cache import get_cache
+from .evidence_index import remember
+from .tracing import span
+from .transcript_index import TranscriptIndex
+
+# Concurrent agents in this process fetch a video once: fetches hold the
+# lock its ID hashes to, from a fixed pool so the locks don't grow with
+# the videos seen. Other worker processes are covered by the shared
+# on-disk store.
+_fetch_locks = [threading.Lock() for _ in range(64)]
+_indexes: "OrderedDict[str, TranscriptIndex]" = OrderedDict()
+_indexes_lock = threading.Lock()
+
+
+def transcript_cache():
+    return get_cache(
+        'transcripts',
+        ttl=float(os.getenv('FACT_CHECKER_TRANSCRIPT_CACHE_TTL', 7 * 24 * 3600)),
+        max_bytes=int(float(os.getenv('FACT_CHECKER_TRANSCRIPT_CACHE_MAX_MB', 512)) * 1024 * 1024),
+    )
+
 
 class YouTubeTranscriptInput(BaseModel):
     youtube_url: str = Field(..., description="YouTube video URL")
+    query: str = Field(
+        "",
+        description="Optional claim or keywords; returns only the timestamped transcript "
+                    "windows that discuss it instead of the full transcript",
+    )
+    start: Optional[float] = Field(None, description="Optional start of a time range, in seconds")
+    end: Optional[float] = Field(None, description="Optional end of a time range, in seconds")
 
 class YouTubeTranscriptTool(BaseTool):
     name: str = "YouTube Transcript Tool"
     description: str = "Extract transcript from YouTube videos for fact-checking"
     args_schema: Type[BaseModel] = YouTubeTranscriptInput
+    use_cache: bool = True
+    max_windows: int = 4
+    window_seconds: float = 60.0
 
-    def _run(self, youtube_url: str) -> str:
+    def _run(self, youtube_url: str, query: str = "",
+             start: Optional[float] = None, end: Optional[float] = None) -> str:
+        with span('tool', self.name, query=bool(query)) as traced:
+            output = self._transcript(youtube_url, query, start, end)
+            traced.set('output_chars', len(output))
+            return output
+
+    def _transcript(self, youtube_url: str, query: str,
+                    start: Optional[float], end: Optional[float]) -> str:
         try:
             video_id = self._extract_video_id(youtube_url)
             if not video_id:
                 return "Invalid YouTube URL format"
 
-            from youtube_transcript_api import YouTubeTranscriptApi
-            
-            api = YouTubeTranscriptApi()
-            
             try:
-                transcript = api.get_transcript(video_id)
-                full_transcript = " ".join([entry['text'] for entry in transcript])
+                index = self.get_index(video_id)
+                if query or start is not None or end is not None:
+                    return self._excerpts(video_id, index, query, start, end)
+                full_transcript = index.render_full()
                 return f"YouTube Video Transcript (ID: {video_id}):\n\n{full_transcript}"
             except Exception as e:
                 return f"Error accessing video {video_id}: {str(e)}"
@@ -31,6 +74,78 @@ class YouTubeTranscriptTool(BaseTool):
         except Exception as e:
             return f"Error processing YouTube URL: {str(e)}"
 
+    def _excerpts(self, video_id: str, index: TranscriptIndex, query: str,
+                  start: Optional[float], end: Optional[float]) -> str:
+        if query:
+            windows = index.search(query, k=self.max_windows, window=self.window_seconds,
+                                   start=start or 0.0, end=end)
+        else:
+            window = index.time_range(start or 0.0, end)
+            windows = [window] if window else []
+        if not windows:
+            return f"No transcript passages of video {video_id} matched the request"
+        body = "\n\n".join(window.render() for window in windows)
+        return f"YouTube Video Transcript excerpts (ID: {video_id}):\n\n{body}"
+
+    def get_index(self, video_id: str) -> TranscriptIndex:
+        with _indexes_lock:
+            index = _indexes.get(video_id)
+            if index is not None:
+                _indexes.move_to_end(video_id)
+                return index
+        segments, fetched = self._segments(video_id)
+        index = TranscriptIndex(segments)
+        if fetched:
+            remember(f"https://www.youtube.com/watch?v={video_id}", '', source='transcript',
+                     passages=[w.render() for w in index.windows()])
+        with _indexes_lock:
+            _indexes[video_id] = index
+            while len(_indexes) > 32:
+                _indexes.popitem(last=False)
+        return index
+
+    def get_segments(self, video_id: str) -> List[dict]:
+        """Transcript entries (``text``, ``start``, ``duration``) for a video."""
+        return self._segments(video_id)[0]
+
+    def _segments(self, video_id: str) -> Tuple[List[dict], bool]:
+        """``get_segments`` plus whether they were stored just now (a cache miss)."""
+        with span('transcript', video_id) as traced:
+            if not self.use_cache:
+                return self._fetch(video_id)[0], False
+
+            cache = transcript_cache()
+            cached = cache.get(video_id)
+            if cached is None:
+                with _fetch_locks[hash(video_id) % len(_fetch_locks)]:
+                    cached = cache.get(video_id, record=False)
+                    if cached is None:
+                        segments, language = self._fetch(video_id)
+                        payload = json.dumps(segments)
+                        traced.set('cache', 'miss').set('segments', len(segments)).set('bytes', len(payload))
+                        cache.put(video_id, payload, meta={
+                            'language': language,
+                            'fetched_at': time.time(),
+                        })
+                        return segments, True
+            traced.set('cache', 'hit')
+            return json.loads(cached), False
+
+    def _fetch(self, video_id: str) -> Tuple[List[dict], Optional[str]]:
+        from youtube_transcript_api import YouTubeTranscriptApi
+
+        try:
+            # youtube_transcript_api >= 1.0 accepts a requests session;
+            # it sets its own headers, so it gets a dedicated pool.
+            api = YouTubeTranscriptApi(http_client=get_session('youtube'))
+        except TypeError:
+            api = YouTubeTranscriptApi()
+
+        if hasattr(api, 'fetch'):
+            fetched = api.fetch(video_id)
+            return fetched.to_raw_data(), getattr(fetched, 'language_code', None)
+        return api.get_transcript(video_id), None
+
     def _extract_video_id(self, url: str) -> str:
         patterns = [
             r'(?:youtube\.com\/watch\?v=|youtu\.be\/|youtube\.com\/embed\/)([^&\n?#]+)',
@@ -42,4 +157,4 @@ class YouTubeTranscriptTool(BaseTool):
             if match:
                 return match.group(1)
         
-        return None
\ No newline at end of file
+        return None
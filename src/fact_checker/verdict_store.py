@@ -0,0 +1,317 @@
+import hashlib
+import os
+import re
+import sqlite3
+import threading
+import time
+import unicodedata
+from dataclasses import dataclass
+from pathlib import Path
+from typing import List, Optional, Tuple
+
+import numpy as np
+
+from .tools.disk_cache import default_cache_dir
+
+_WORD = re.compile(r"[a-z0-9]+(?:\.[0-9]+)?")
+_THOUSANDS = re.compile(r"(?<=\d)[,_ ](?=\d{3}\b)")
+_NUMBER = re.compile(r"\d+(?:\.\d+)?")
+NEGATIONS = frozenset("not no never none nobody nothing neither nor without".split())
+
+# What a stored verdict is: the crew's whole markdown report for a
+# plain-text input, or one fan-out ClaimVerdict as JSON. Each caller only
+# recalls entries of its own kind.
+REPORT = "report"
+CLAIM_VERDICT = "claim_verdict"
+
+# Banding finds every fingerprint within max_distance bits when there are
+# more bands than that (some band then has no differing bit). Bands are at
+# most 16 bits wide, so at least 4; at most 16, of 4 bits each.
+MIN_BANDS, MAX_BANDS = 4, 16
+MAX_DISTANCE = MAX_BANDS - 1
+
+
+def normalize_claim(text: str) -> str:
+    """Case-, punctuation- and number-format-insensitive form of a claim."""
+    text = unicodedata.normalize("NFKC", text).lower()
+    text = text.replace("n't", " not").replace("%", " percent")
+    text = _THOUSANDS.sub("", text)
+    words = []
+    for word in _WORD.findall(text):
+        if "." in word:
+            word = word.rstrip("0").rstrip(".")
+        words.append(word)
+    return " ".join(words)
+
+
+def _hash64(feature: str) -> int:
+    return int.from_bytes(hashlib.blake2b(feature.encode(), digest_size=8).digest(), "little")
+
+
+def simhash(normalized: str) -> int:
+    """64-bit SimHash over word unigrams and bigrams."""
+    words = normalized.split()
+    features = words + [f"{a} {b}" for a, b in zip(words, words[1:])]
+    if not features:
+        return 0
+    hashes = np.array([_hash64(f) for f in features], dtype=np.uint64)
+    bits = np.unpackbits(hashes.view(np.uint8).reshape(-1, 8), axis=1, bitorder="little")
+    weights = bits.sum(axis=0, dtype=np.int64) * 2 - len(features)
+    return int(np.packbits(weights > 0, bitorder="little").view(np.uint64)[0])
+
+
+def guard(normalized: str, kind: str) -> int:
+    """Fingerprint of what must match exactly: the kind, the numbers and the negations.
+
+    "330 metres" vs "530 metres", or "is" vs "is not", are a bit or two
+    apart in SimHash space but are different claims.
+    """
+    words = normalized.split()
+    key = f"{kind}|" + " ".join(_NUMBER.findall(normalized)) + "|" + " ".join(w for w in words if w in NEGATIONS)
+    return int.from_bytes(hashlib.blake2b(key.encode(), digest_size=8).digest(), "little", signed=True)
+
+
+def _to_signed(value: int) -> int:
+    return value - (1 << 64) if value >= 1 << 63 else value
+
+
+@dataclass
+class StoredVerdict:
+    claim: str
+    verdict: str
+    evidence: str = ""
+    stored_at: float = 0.0
+    distance: int = 0
+
+    def __str__(self) -> str:
+        return self.verdict
+
+
+class _BandIndex:
+    """LSH over 64-bit fingerprints: ``bands`` bands of ``64 // bands`` bits, each kept sorted.
+
+    Two fingerprints within Hamming distance ``bands - 1`` must agree
+    exactly on at least one band, so probing every band's bucket finds
+    every such neighbour. Each band is a CSR layout: row numbers sorted by
+    band value plus an offsets table (65537 entries for 16-bit bands), so
+    a probe is two array reads. Rows are columnar numpy arrays; new rows
+    sit in a small unsorted tail until it is merged.
+    """
+
+    merge_every = 4096
+
+    def __init__(self, bands: int = MIN_BANDS):
+        self.bands = bands
+        self.band_bits = 64 // bands
+        self.band_mask = (1 << self.band_bits) - 1
+        self.ids = np.zeros(0, dtype=np.int64)
+        self.fingerprints = np.zeros(0, dtype=np.uint64)
+        self.guards = np.zeros(0, dtype=np.int64)
+        self.stored_at = np.zeros(0, dtype=np.float64)
+        self._bands: List[Tuple[np.ndarray, np.ndarray]] = []
+        self._tail: List[Tuple[int, int, int, float]] = []
+        self._rebuild()
+
+    def __len__(self) -> int:
+        return len(self.ids) + len(self._tail)
+
+    def _rebuild(self):
+        self._bands = []
+        for band in range(self.bands):
+            shift, mask = np.uint64(band * self.band_bits), np.uint64(self.band_mask)
+            values = ((self.fingerprints >> shift) & mask).astype(np.uint16)
+            order = np.argsort(values, kind="stable").astype(np.int64)
+            offsets = np.zeros(self.band_mask + 2, dtype=np.int64)
+            np.cumsum(np.bincount(values, minlength=self.band_mask + 1), out=offsets[1:])
+            self._bands.append((offsets, order))
+
+    def extend(self, ids, fingerprints, guards, stored_at):
+        self.ids = np.concatenate([self.ids, np.asarray(ids, dtype=np.int64)])
+        self.fingerprints = np.concatenate([self.fingerprints, np.asarray(fingerprints, dtype=np.uint64)])
+        self.guards = np.concatenate([self.guards, np.asarray(guards, dtype=np.int64)])
+        self.stored_at = np.concatenate([self.stored_at, np.asarray(stored_at, dtype=np.float64)])
+        self._rebuild()
+
+    def add(self, row_id: int, fingerprint: int, guard_value: int, stored_at: float):
+        self._tail.append((row_id, fingerprint, guard_value, stored_at))
+        if len(self._tail) >= self.merge_every:
+            self.merge()
+
+    def merge(self):
+        if self._tail:
+            ids, fps, guards, times = zip(*self._tail)
+            self._tail = []
+            self.extend(ids, fps, guards, times)
+
+    def nearest(self, fingerprint: int, guard_value: int, max_distance: int,
+                not_before: float) -> Optional[Tuple[int, int]]:
+        """Closest ``(row_id, distance)`` with a matching guard, or None.
+
+        Ties go to the most recently stored row.
+        """
+        found = []
+        rows = []
+        for band, (offsets, order) in enumerate(self._bands):
+            value = (fingerprint >> (band * self.band_bits)) & self.band_mask
+            lo, hi = offsets[value], offsets[value + 1]
+            if hi > lo:
+                rows.append(order[lo:hi])
+        if rows:
+            rows = np.unique(np.concatenate(rows))
+            rows = rows[(self.guards[rows] == guard_value) & (self.stored_at[rows] >= not_before)]
+            for row in rows:
+                distance = (int(self.fingerprints[row]) ^ fingerprint).bit_count()
+                found.append((distance, -int(self.ids[row])))
+        for row_id, fp, guard_tail, stored_at in self._tail:
+            if guard_tail == guard_value and stored_at >= not_before:
+                found.append(((fp ^ fingerprint).bit_count(), -row_id))
+        found = [f for f in found if f[0] <= max_distance]
+        if not found:
+            return None
+        distance, neg_id = min(found)
+        return -neg_id, distance
+
+
+class VerdictStore:
+    """Memo of past verdicts keyed by near-duplicate claim text.
+
+    Claims are normalised, fingerprinted with SimHash and looked up in an
+    in-memory LSH index; a hit within ``max_distance`` bits whose kind,
+    numbers and negations match exactly, stored less than ``ttl`` seconds
+    ago, returns the earlier verdict and evidence. Rows persist in SQLite and
+    the index is rebuilt from them on start.
+
+    ``max_distance`` is clamped to ``MAX_DISTANCE`` and sets the number of
+    bands, so no neighbour within it is missed. Expired rows, and all but
+    the newest ``max_rows``, are deleted on start and whenever the index
+    outgrows ``max_rows`` by a tenth.
+    """
+
+    def __init__(self, path: Optional[Path] = None, ttl: Optional[float] = None,
+                 max_distance: int = 3, max_claim_chars: int = 1000, max_rows: int = 100_000):
+        self.path = Path(path) if path else default_cache_dir() / "verdicts.sqlite3"
+        self.ttl = ttl
+        if not 0 <= max_distance <= MAX_DISTANCE:
+            print(f"⚠️ Verdict max distance {max_distance} is out of range, using {MAX_DISTANCE}")
+        self.max_distance = min(max(max_distance, 0), MAX_DISTANCE)
+        self.bands = max(MIN_BANDS, self.max_distance + 1)
+        self.max_claim_chars = max_claim_chars
+        self.max_rows = max_rows
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._stats = {"hits": 0, "misses": 0, "writes": 0}
+        conn = self._connect()
+        with conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS verdicts ("
+                "id INTEGER PRIMARY KEY, fingerprint INTEGER NOT NULL, guard INTEGER NOT NULL, "
+                "claim TEXT NOT NULL, verdict TEXT NOT NULL, evidence TEXT NOT NULL, "
+                "stored_at REAL NOT NULL, kind TEXT NOT NULL DEFAULT '')"
+            )
+            columns = {row[1] for row in conn.execute("PRAGMA table_info(verdicts)")}
+            if "kind" not in columns:
+                # Rows from before kinds were recorded keep kind '' and, their
+                # guard lacking a kind, never match a lookup again.
+                conn.execute("ALTER TABLE verdicts ADD COLUMN kind TEXT NOT NULL DEFAULT ''")
+        self.index = _BandIndex(self.bands)
+        self._load()
+
+    def _load(self):
+        """Delete expired and surplus rows, then rebuild the index from the rest."""
+        conn = self._connect()
+        with conn:
+            if self.ttl is not None:
+                conn.execute("DELETE FROM verdicts WHERE stored_at < ?", (time.time() - self.ttl,))
+            conn.execute(
+                "DELETE FROM verdicts WHERE id NOT IN (SELECT id FROM verdicts ORDER BY id DESC LIMIT ?)",
+                (self.max_rows,),
+            )
+        index = _BandIndex(self.bands)
+        rows = conn.execute("SELECT id, fingerprint, guard, stored_at FROM verdicts").fetchall()
+        if rows:
+            ids, fps, guards, times = zip(*rows)
+            index.extend(ids, [fp & ((1 << 64) - 1) for fp in fps], guards, times)
+        self.index = index
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def _fingerprint(self, claim: str, kind: str) -> Optional[Tuple[int, int]]:
+        if not claim or len(claim) > self.max_claim_chars:
+            return None
+        normalized = normalize_claim(claim)
+        if not normalized:
+            return None
+        return simhash(normalized), guard(normalized, kind)
+
+    def lookup(self, claim: str, kind: str) -> Optional[StoredVerdict]:
+        """The stored ``kind`` verdict (``REPORT`` or ``CLAIM_VERDICT``) for a near-duplicate claim."""
+        keys = self._fingerprint(claim, kind)
+        if keys is None:
+            return None
+        not_before = time.time() - self.ttl if self.ttl is not None else float("-inf")
+        with self._lock:
+            match = self.index.nearest(keys[0], keys[1], self.max_distance, not_before)
+            self._stats["hits" if match else "misses"] += 1
+        if match is None:
+            return None
+        row = self._connect().execute(
+            "SELECT claim, verdict, evidence, stored_at FROM verdicts WHERE id = ? AND kind = ?", (match[0], kind)
+        ).fetchone()
+        if row is None:
+            return None
+        return StoredVerdict(claim=row[0], verdict=row[1], evidence=row[2], stored_at=row[3], distance=match[1])
+
+    def add(self, claim: str, verdict: str, kind: str, evidence: str = ""):
+        keys = self._fingerprint(claim, kind)
+        if keys is None:
+            return
+        now = time.time()
+        conn = self._connect()
+        with conn:
+            row_id = conn.execute(
+                "INSERT INTO verdicts (fingerprint, guard, claim, verdict, evidence, stored_at, kind) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (_to_signed(keys[0]), keys[1], claim, verdict, evidence, now, kind),
+            ).lastrowid
+        with self._lock:
+            self.index.add(row_id, keys[0], keys[1], now)
+            self._stats["writes"] += 1
+            if len(self.index) > self.max_rows + self.max_rows // 10:
+                self._load()
+
+    def __len__(self) -> int:
+        return len(self.index)
+
+    def stats(self):
+        with self._lock:
+            stats = dict(self._stats)
+        lookups = stats["hits"] + stats["misses"]
+        stats["hit_rate"] = round(stats["hits"] / lookups, 3) if lookups else 0.0
+        return stats
+
+
+_store: Optional[VerdictStore] = None
+_store_lock = threading.Lock()
+
+
+def verdict_store() -> Optional[VerdictStore]:
+    """Process-wide verdict memo, or None when ``FACT_CHECKER_VERDICT_STORE=0``."""
+    global _store
+    if os.getenv("FACT_CHECKER_VERDICT_STORE", "1") == "0":
+        return None
+    if _store is None:
+        with _store_lock:
+            if _store is None:
+                _store = VerdictStore(
+                    ttl=float(os.getenv("FACT_CHECKER_VERDICT_TTL", 7 * 24 * 3600)),
+                    max_distance=int(os.getenv("FACT_CHECKER_VERDICT_MAX_DISTANCE", 3)),
+                    max_rows=int(os.getenv("FACT_CHECKER_VERDICT_MAX_ROWS", 100_000)),
+                )
+    return _store
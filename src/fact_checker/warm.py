@@ -0,0 +1,152 @@
+import asyncio
+import threading
+import time
+from concurrent.futures import Future
+from itertools import chain
+from typing import Any, Dict, Iterable, Optional, Union
+
+from crewai import Crew
+
+from .crew import FactChecker
+from .models import FactCheckReport
+from .pipeline import chunk_threshold, fanout_enabled, is_long, run_chunked, run_fanout
+from .routing import TEXT, RoutedInput, prefetch
+from .tools.tracing import span
+from .verdict_store import REPORT, StoredVerdict, verdict_store
+
+
+class CrewTemplate:
+    """A FactChecker crew built once per process and cloned for every run.
+
+    Building the crew re-reads both YAML configs and instantiates every
+    agent, task, tool and LLM. The template does that once; each kickoff
+    runs on ``Crew.copy()``, which gives the run its own agents, tasks and
+    outputs. The tools are shared. Each agent's LLM is a shallow copy: a
+    new object per run (so counters such as ``fallbacks_used`` are the
+    run's own) whose attributes, such as a fallback chain, are still the
+    template's. Completions are cached process-wide either way.
+    The template crew itself is never kicked off, so its task descriptions
+    stay uninterpolated and concurrent runs cannot see each other's state.
+    """
+
+    def __init__(self):
+        self.checker = FactChecker()
+        self._crew = self.checker.crew()
+        self._lock = threading.Lock()
+
+    def new_crew(self) -> Crew:
+        with self._lock:
+            return self._crew.copy()
+
+    def prefetch(self, content: str) -> "Future[RoutedInput]":
+        return prefetch(content, self.checker.youtube_tool, self.checker.scraping_tool)
+
+    def _routed(self, inputs: Dict[str, Any]):
+        """Copy the crew while the input's video or page is being fetched."""
+        if 'input_kind' in inputs or 'input_content' not in inputs:
+            return self.new_crew(), inputs
+        pending = self.prefetch(inputs['input_content'])
+        crew = self.new_crew()
+        return crew, {**inputs, **pending.result().as_inputs()}
+
+    @staticmethod
+    def _claim(inputs: Dict[str, Any]) -> Optional[str]:
+        """The plain-text claim a run checks; fetched videos and pages are not memoized."""
+        if inputs.get('input_kind') == TEXT:
+            return inputs.get('input_source') or inputs.get('input_content')
+        return None
+
+    def _recall(self, inputs: Dict[str, Any]) -> Optional[StoredVerdict]:
+        store, claim = verdict_store(), self._claim(inputs)
+        if store is None or claim is None:
+            return None
+        stored = store.lookup(claim, REPORT)
+        if stored is not None:
+            age = (time.time() - stored.stored_at) / 3600
+            print(f"🗂️ Reusing verdict from {age:.1f}h ago for a matching claim (distance {stored.distance})")
+        return stored
+
+    def _remember(self, inputs: Dict[str, Any], result):
+        store, claim = verdict_store(), self._claim(inputs)
+        if store is not None and claim is not None:
+            store.add(claim, str(result), REPORT)
+
+    def kickoff(self, inputs: Dict[str, Any]):
+        crew, inputs = self._routed(inputs)
+        stored = self._recall(inputs)
+        if stored is not None:
+            return stored
+        result = crew.kickoff(inputs=inputs)
+        self._remember(inputs, result)
+        return result
+
+    async def kickoff_async(self, inputs: Dict[str, Any]):
+        crew, inputs = await asyncio.to_thread(self._routed, inputs)
+        stored = await asyncio.to_thread(self._recall, inputs)
+        if stored is not None:
+            return stored
+        result = await crew.kickoff_async(inputs=inputs)
+        await asyncio.to_thread(self._remember, inputs, result)
+        return result
+
+
+_template: Optional[CrewTemplate] = None
+_template_lock = threading.Lock()
+
+
+def get_template() -> CrewTemplate:
+    """Return the process-wide crew template, building it on first use."""
+    global _template
+    if _template is None:
+        with _template_lock:
+            if _template is None:
+                _template = CrewTemplate()
+    return _template
+
+
+def fact_check(content: Union[str, Iterable[str]]):
+    """Check one input end to end, choosing the chunked, fan-out or crew path.
+
+    A linked video or page is fetched while the template warms up, and
+    the path is picked on the size of the fetched text. The whole check
+    is one trace, rooted at a ``fact_check`` span.
+
+    ``content`` may also be a document's text in pieces, such as the pages
+    from ``documents.open_document``. Pieces are read only until the text
+    is long enough for the chunked path, which then segments the rest as
+    it is extracted, so a long PDF is never held whole. A short one is
+    checked as plain text.
+    """
+    if not isinstance(content, str):
+        parts, head, size = iter(content), [], 0
+        for part in parts:
+            head.append(part)
+            size += len(part) + 1
+            if size > chunk_threshold():
+                with span('fact_check', '', input_kind=TEXT) as traced:
+                    traced.set('path', 'chunked')
+                    return run_chunked(get_template().checker, chain(head, parts))
+        content = '\n'.join(head)
+    with span('fact_check', '', input_chars=len(content)) as traced:
+        pending = prefetch(content)
+        template = get_template()
+        routed = pending.result()
+        traced.set('input_kind', routed.kind)
+        if is_long(routed.text):
+            # Long documents/transcripts: parallel claim extraction per segment
+            traced.set('path', 'chunked')
+            return run_chunked(template.checker, routed.text)
+        if fanout_enabled():
+            # One concurrent verification per extracted claim
+            traced.set('path', 'fanout')
+            return run_fanout(template.checker, routed.render())
+        traced.set('path', 'crew')
+        return template.kickoff(inputs=routed.as_inputs())
+
+
+def result_payload(result) -> Dict[str, Any]:
+    """JSON-friendly form of a ``fact_check`` result."""
+    payload: Dict[str, Any] = {'report': str(result)}
+    if isinstance(result, FactCheckReport):
+        payload['verdicts'] = [v.model_dump() for v in result.verdicts]
+    return payload
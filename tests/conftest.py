@@ -0,0 +1,16 @@
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+
+@pytest.fixture
+def cache_dir(tmp_path, monkeypatch):
+    """Point the process-wide caches at an empty directory for one test."""
+    from fact_checker.tools import disk_cache
+
+    monkeypatch.setenv("FACT_CHECKER_CACHE_DIR", str(tmp_path))
+    monkeypatch.setattr(disk_cache, "_registry", {})
+    return tmp_path
@@ -0,0 +1,57 @@
+import json
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from fact_checker.batch import run_batch  # noqa: E402
+
+
+def write_lines(path, lines):
+    path.write_text("\n".join(lines) + "\n", encoding="utf-8")
+
+
+def read_records(path):
+    return [json.loads(line) for line in path.read_text(encoding="utf-8").splitlines()]
+
+
+def test_a_malformed_line_is_counted_and_the_batch_goes_on(tmp_path):
+    inputs, output = tmp_path / "claims.jsonl", tmp_path / "results.jsonl"
+    write_lines(inputs, [
+        '{"id": "a", "claim": "The Eiffel Tower is 330 metres tall."}',
+        '{"id": "b", "claim": "unterminated',
+        '42',
+        '"The Great Wall is visible from space."',
+    ])
+    stats = run_batch(str(inputs), str(output), concurrency=2, check=lambda content: f"checked: {content}")
+
+    assert stats.ok == 2 and stats.malformed == [2, 3]
+    assert sorted(r["id"] for r in read_records(output)) == ["4", "a"]
+    assert "2 malformed lines skipped: 2, 3" in stats.render()
+
+
+def test_a_rerun_resumes_after_completed_items_and_retries_errors(tmp_path):
+    inputs, output = tmp_path / "claims.jsonl", tmp_path / "results.jsonl"
+    write_lines(inputs, [f'{{"id": "c{n}", "claim": "Claim number {n}."}}' for n in range(6)])
+    checked = []
+
+    def flaky(content):
+        checked.append(content)
+        if "3" in content:
+            raise TimeoutError("provider timed out")
+        return f"checked: {content}"
+
+    first = run_batch(str(inputs), str(output), concurrency=3, check=flaky)
+    assert (first.ok, first.errors) == (5, 1)
+
+    # A crash mid-write leaves a torn last line behind.
+    with open(output, "a", encoding="utf-8") as f:
+        f.write('{"id": "c9", "status": "o')
+    checked.clear()
+    second = run_batch(str(inputs), str(output), concurrency=3, check=lambda content: flaky(content.replace("3", "three")))
+
+    assert checked == ["Claim number three."]
+    assert (second.ok, second.errors, second.skipped) == (1, 0, 5)
+    lines = output.read_text(encoding="utf-8").splitlines()
+    assert lines[6] == '{"id": "c9", "status": "o'
+    assert [r["status"] for r in map(json.loads, lines[:6] + lines[7:]) if r["id"] == "c3"] == ["error", "ok"]
@@ -0,0 +1,41 @@
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from fact_checker.context import DIVIDER, compact_context, count_tokens  # noqa: E402
+
+RESEARCH = "\n\n".join([
+    "The Eiffel Tower is 330 metres tall.",
+    "It was completed in 1889 for the World's Fair, per https://example.org/history.",
+    "Unrelated: the city's bakeries sold 2 million croissants last spring, "
+    "as https://example.org/bakeries reported.",
+])
+ANALYSIS = "Claim: the Eiffel Tower is 330 metres tall, and the official figures agree."
+
+
+def test_passages_restated_downstream_are_dropped_once():
+    compacted, dropped, trimmed = compact_context(RESEARCH + DIVIDER + ANALYSIS, budget=10000)
+    assert dropped == 1 and trimmed == 0
+    assert compacted.count("330 metres tall") == 1
+    assert "completed in 1889" in compacted
+
+
+def test_a_passage_with_different_numbers_is_not_a_duplicate():
+    compacted, dropped, _ = compact_context(
+        "The Eiffel Tower is 300 metres tall." + DIVIDER + "The Eiffel Tower is 330 metres tall.", budget=10000)
+    assert dropped == 0 and "300 metres" in compacted
+
+
+def test_over_budget_context_keeps_relevant_passages_and_their_sources():
+    context = RESEARCH + DIVIDER + ANALYSIS
+    compacted, _, trimmed = compact_context(context, budget=64, focus="When was the Eiffel Tower completed?")
+    assert trimmed == 1
+    assert "completed in 1889" in compacted and "croissants" not in compacted
+    assert compacted.endswith("Other sources seen upstream:\n- https://example.org/bakeries")
+    assert ANALYSIS in compacted and count_tokens(compacted) < count_tokens(context)
+
+
+def test_a_single_output_is_never_trimmed():
+    compacted, dropped, trimmed = compact_context(RESEARCH, budget=5)
+    assert (compacted, dropped, trimmed) == (RESEARCH, 0, 0)
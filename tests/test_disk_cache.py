@@ -0,0 +1,27 @@
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from fact_checker.tools.disk_cache import DiskCache  # noqa: E402
+
+
+def test_overwriting_a_key_under_a_size_cap_keeps_it(tmp_path):
+    cache = DiskCache("test", path=tmp_path / "cache.sqlite3", max_bytes=4096)
+    for i in range(50):
+        # Incompressible-ish values well under the cap, all different.
+        cache.put("key", os.urandom(600).hex() + str(i))
+    assert cache.get("key") is not None
+    assert cache.stats()["evictions"] == 0
+    blobs = cache._connect().execute("SELECT COUNT(*) FROM blobs").fetchone()[0]
+    assert blobs == 1
+    assert cache.size_bytes() <= 4096
+
+
+def test_shared_blob_survives_overwrite_of_one_key(tmp_path):
+    cache = DiskCache("test", path=tmp_path / "cache.sqlite3")
+    cache.put("a", "same text")
+    cache.put("b", "same text")
+    cache.put("a", "other text")
+    assert cache.get("b") == "same text"
+    assert cache.get("a") == "other text"
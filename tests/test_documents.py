@@ -0,0 +1,63 @@
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from fact_checker import documents  # noqa: E402
+
+
+class _Page:
+    def __init__(self, text):
+        self.text = text
+
+    def extract_text(self):
+        if self.text is None:
+            raise ValueError("bad content stream")
+        return self.text
+
+
+class _Reader:
+    def __init__(self, pages):
+        self.pages = pages
+
+
+def test_unreadable_pages_are_reported_not_lost(tmp_path, monkeypatch):
+    pages = [_Page("First page."), _Page(None), _Page("Third page.")]
+    monkeypatch.setattr(documents, "_pdf_reader", lambda source: _Reader(pages))
+    path = tmp_path / "report.pdf"
+    path.write_bytes(b"%PDF-1.4\n")
+
+    assert list(documents.iter_pdf_pages(path, workers=1)) == [(1, "First page."), (2, None), (3, "Third page.")]
+    document = documents.read_document(path, workers=1)
+    assert document.text == "First page.\nThird page."
+    assert document.unreadable == [2]
+    assert "skipped: 2." in document.unreadable_notice
+
+
+def test_asking_for_another_pool_size_leaves_the_first_pool_running(monkeypatch):
+    monkeypatch.setattr(documents, "_pools", {})
+    first = documents._get_pool(1)
+    pending = first.submit(max, 1, 2)
+    second = documents._get_pool(2)
+    try:
+        assert second is not first
+        assert pending.result(timeout=60) == 2
+        assert first.submit(max, 3, 4).result(timeout=60) == 4
+    finally:
+        first.shutdown()
+        second.shutdown()
+
+
+def test_opened_pdf_streams_the_same_text_within_budget(tmp_path, monkeypatch):
+    pages = [_Page(f"Page {n} text.") for n in range(1, 6)]
+    monkeypatch.setattr(documents, "_pdf_reader", lambda source: _Reader(pages))
+    monkeypatch.setenv("FACT_CHECKER_DOC_MAX_CHARS", "30")
+    path = tmp_path / "report.pdf"
+    path.write_bytes(b"%PDF-1.4\n")
+
+    document, parts = documents.open_document(path.read_bytes(), "report.pdf", workers=1)
+    assert document.text == "" and document.total_pages == 5
+    text = "\n".join(parts)
+    assert text == documents.read_document(path, workers=1).text == "Page 1 text.\nPage 2 text.\nPage"
+    assert document.truncated and document.chars == len(text) == 30
+    assert document.notice == "Only the first 3 of 5 pages were checked."
@@ -0,0 +1,41 @@
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from fact_checker.tools.evidence_index import EvidenceIndex  # noqa: E402
+
+PASSAGE = "The Eiffel Tower is 330 metres tall after a new antenna was added to its top in 2022."
+
+
+def test_passages_past_the_ttl_are_not_evidence(tmp_path):
+    index = EvidenceIndex(tmp_path, ttl=3600)
+    index.add("https://example.org/tower", PASSAGE)
+    assert [e.url for e in index.search("Eiffel Tower metres tall")] == ["https://example.org/tower"]
+
+    conn = index._connect()
+    with conn:
+        conn.execute("UPDATE passages SET added_at = added_at - 7200")
+    assert index.search("Eiffel Tower metres tall") == []
+    index.ttl = None
+    assert len(index.search("Eiffel Tower metres tall")) == 1
+
+
+def test_no_dense_fallback_without_an_embedding_model(tmp_path, monkeypatch):
+    from fact_checker.tools import vector_index
+
+    monkeypatch.delenv("FACT_CHECKER_EMBEDDING_MODEL", raising=False)
+    monkeypatch.setenv("FACT_CHECKER_CACHE_DIR", str(tmp_path))
+    assert vector_index.vector_index() is None
+
+
+def test_adding_a_passage_again_renews_it(tmp_path, monkeypatch):
+    import fact_checker.tools.evidence_index as module
+
+    index = EvidenceIndex(tmp_path, ttl=3600)
+    now = module.time.time()
+    index.add("https://example.org/tower", PASSAGE)
+    monkeypatch.setattr(module.time, "time", lambda: now + 7200)
+    assert index.search("Eiffel Tower metres tall") == []
+    assert index.add("https://example.org/tower", PASSAGE) == 0
+    assert [e.url for e in index.search("Eiffel Tower metres tall")] == ["https://example.org/tower"]
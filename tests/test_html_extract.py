@@ -0,0 +1,56 @@
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from fact_checker.tools.html_extract import (  # noqa: E402
+    extract_main_text, extract_text_lxml, extract_text_soup, extract_text_stream,
+)
+
+PAGE = (
+    "<html><head><title>Bridge</title><style>p { color: red }</style></head><body>"
+    "<nav class='menu'><a href='/'>Home</a> <a href='/news'>News</a></nav>"
+    "<article><h2>Opening day</h2>"
+    + "".join(f"<p>The bridge, opened in {1930 + n}, carried {n},000 cars a day, the council said.</p>"
+              for n in range(8))
+    + "</article><footer>Cookie settings and copyright notice</footer>"
+    "<script>var tracking = 'ignore me';</script></body></html>"
+).encode()
+
+
+def chunks(data, size=64):
+    for i in range(0, len(data), size):
+        yield data[i:i + size]
+
+
+def test_streamed_text_matches_the_soup_parser():
+    assert extract_text_stream(chunks(PAGE), max_chars=100000) == extract_text_soup(PAGE, max_chars=100000)
+
+
+def test_streaming_stops_reading_once_the_budget_is_full():
+    read = []
+
+    def counted():
+        for chunk in chunks(PAGE):
+            read.append(chunk)
+            yield chunk
+
+    text = extract_text_stream(counted(), max_chars=40)
+    assert text.endswith("...") and len(text) == 43
+    assert len(read) < len(list(chunks(PAGE)))
+
+
+def test_declared_charset_decodes_the_body():
+    body = "<p>Café à Paris</p>".encode("latin-1")
+    assert extract_text_stream([body], encoding="iso-8859-1") == "Café à Paris"
+
+
+def test_scripts_and_styles_are_dropped_and_blocks_kept_apart():
+    text = extract_text_lxml(PAGE, max_chars=100000)
+    assert "tracking" not in text and "color" not in text
+    assert "Opening day The bridge" in text
+
+def test_main_text_drops_navigation_and_footer():
+    text = extract_main_text(PAGE, max_chars=100000)
+    assert "opened in 1930" in text and "opened in 1937" in text
+    assert "Home" not in text and "Cookie" not in text
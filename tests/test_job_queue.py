@@ -0,0 +1,57 @@
+import os
+import sys
+import threading
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from fact_checker import service  # noqa: E402
+from fact_checker.service import QUEUED, RUNNING, JobQueue  # noqa: E402
+
+
+def test_a_job_is_claimed_once_across_processes(tmp_path):
+    path = tmp_path / "jobs.sqlite3"
+    queues = [JobQueue(path), JobQueue(path)]
+    for n in range(5):
+        queues[0].submit({"input_content": f"claim {n}"})
+    claimed, start = [], threading.Barrier(8)
+
+    def worker(queue):
+        start.wait()
+        while True:
+            job = queue.claim()
+            if job is None:
+                return
+            claimed.append(job["id"])
+
+    threads = [threading.Thread(target=worker, args=(queues[n % 2],)) for n in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(claimed) == 5 and len(set(claimed)) == 5
+
+
+def test_only_jobs_with_an_expired_lease_are_requeued(tmp_path, monkeypatch):
+    path = tmp_path / "jobs.sqlite3"
+    queue = JobQueue(path, lease=60)
+    job_id = queue.submit({"input_content": "The Moon is 384,400 km away."})
+    assert queue.claim()["id"] == job_id
+
+    # Another process starting up leaves the job alone while its lease holds.
+    JobQueue(path, lease=60)
+    assert queue.get(job_id)["status"] == RUNNING
+    assert queue.claim() is None
+
+    now = service.time.time()
+    monkeypatch.setattr(service.time, "time", lambda: now + 30)
+    queue.renew([job_id])
+    monkeypatch.setattr(service.time, "time", lambda: now + 75)
+    JobQueue(path, lease=60)
+    assert queue.get(job_id)["status"] == RUNNING
+
+    monkeypatch.setattr(service.time, "time", lambda: now + 120)
+    JobQueue(path, lease=60)
+    assert queue.get(job_id)["status"] == QUEUED
+    assert queue.claim()["id"] == job_id
+    assert queue.get(job_id)["attempts"] == 2
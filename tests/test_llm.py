@@ -0,0 +1,152 @@
+import os
+import sys
+
+import numpy as np
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from fact_checker import llm as llm_module  # noqa: E402
+from fact_checker.embeddings import Embedder, HashingEmbedder  # noqa: E402
+from fact_checker.llm import CachedLLM, FallbackLLM, LLMResponseCache, SemanticIndex, build_llm  # noqa: E402
+
+
+class Model(Embedder):
+    """Stands in for a sentence-transformers model: one fixed direction per text."""
+
+    def __init__(self, name, dim):
+        self.name, self.dim = name, dim
+
+    def embed(self, texts):
+        out = np.zeros((len(texts), self.dim), dtype=np.float32)
+        for row, text in enumerate(texts):
+            out[row, sum(map(ord, text)) % self.dim] = 1.0
+        return out
+
+
+def test_changing_the_embedding_model_drops_old_vectors(tmp_path):
+    path = tmp_path / "semantic.sqlite3"
+    old = SemanticIndex(path, embedder=HashingEmbedder(1024))
+    old.add("ns", "key", "Is the Eiffel Tower 330 metres tall?")
+
+    new = SemanticIndex(path, embedder=Model("all-MiniLM-L6-v2", 384))
+    assert new.nearest("ns", "Is the Eiffel Tower 330 metres tall?", 0.9) is None
+    new.add("ns", "key2", "Is the Eiffel Tower 330 metres tall?")
+    assert new.nearest("ns", "Is the Eiffel Tower 330 metres tall?", 0.9) == "key2"
+
+
+def test_a_failing_semantic_lookup_is_a_miss(cache_dir):
+    class Broken:
+        def nearest(self, *args):
+            raise ValueError("shapes (3,1024) and (384,) not aligned")
+
+    cache = LLMResponseCache()
+    cache._semantic = Broken()
+    assert cache.get("ns", "missing", "Is the Eiffel Tower 330 metres tall?", semantic_threshold=0.9) is None
+
+
+class Letters(Model):
+    """Embeds only the letters of a prompt, so case, punctuation and figures don't move it."""
+
+    def embed(self, texts):
+        return super().embed(["".join(c for c in text.lower() if c.isalpha()) for text in texts])
+
+
+@pytest.fixture
+def completions(cache_dir, monkeypatch):
+    """Stub out the provider call; returns the prompts that reached it."""
+    calls = []
+
+    def call(self, messages, tools=None, callbacks=None, available_functions=None, **kwargs):
+        calls.append(messages)
+        return f"answer {len(calls)}"
+
+    monkeypatch.setattr(llm_module.LLM, "call", call)
+    monkeypatch.setattr(llm_module, "_response_cache", None)
+    return calls
+
+
+def ask(model, text):
+    return model.call([{"role": "system", "content": "You check facts."}, {"role": "user", "content": text}])
+
+
+def test_exact_cache_answers_repeats_without_calling_the_model(completions):
+    model = CachedLLM(model="gpt-4o", temperature=0, cache_mode="exact")
+    assert ask(model, "Is the Eiffel Tower 330 metres tall?") == "answer 1"
+    assert ask(model, "Is the  Eiffel Tower 330 metres\ntall?") == "answer 1"
+    assert ask(model, "is the eiffel tower 330 metres tall") == "answer 2"
+    assert ask(CachedLLM(model="gpt-4o", temperature=0.7, cache_mode="exact"),
+               "Is the Eiffel Tower 330 metres tall?") == "answer 3"
+    assert len(completions) == 3
+
+
+def test_semantic_cache_reuses_rewordings_but_never_across_numbers(completions, monkeypatch):
+    monkeypatch.setattr(llm_module, "get_embedder", lambda: Letters("letters", 4096))
+    model = CachedLLM(model="gpt-4o", temperature=0, cache_mode="semantic", semantic_threshold=0.99)
+    assert ask(model, "Is the Eiffel Tower 330 metres tall?") == "answer 1"
+    assert ask(model, "is the eiffel tower 330 metres tall") == "answer 1"
+    assert ask(model, "Is the Eiffel Tower 530 metres tall?") == "answer 2"
+    assert len(completions) == 2
+
+
+def test_semantic_mode_is_exact_without_an_embedding_model(completions, monkeypatch):
+    monkeypatch.setattr(llm_module, "get_embedder", lambda: HashingEmbedder(1024))
+    model = CachedLLM(model="gpt-4o", temperature=0, cache_mode="semantic", semantic_threshold=0.5)
+    ask(model, "Is the Eiffel Tower 330 metres tall?")
+    assert ask(model, "is the eiffel tower 330 metres tall") == "answer 2"
+
+
+def test_calls_with_executable_functions_are_not_cached(completions):
+    model = CachedLLM(model="gpt-4o", temperature=0, cache_mode="exact")
+    for _ in range(2):
+        model.call("What time is it?", available_functions={"now": lambda: "noon"})
+    assert len(completions) == 2
+
+
+class APIConnectionError(Exception):
+    """Named like the provider client's error, which is what the fallback looks at."""
+
+
+class Tier(llm_module.LLM):
+    """A model that answers with its name, or raises ``error`` when given one."""
+
+    def __init__(self, model, error=None, log=None):
+        super().__init__(model=model)
+        self.error, self.log = error, log if log is not None else []
+
+    def call(self, messages, tools=None, callbacks=None, available_functions=None, **kwargs):
+        self.log.append((self.model, list(self.stop)))
+        if self.error is not None:
+            raise self.error
+        return self.model
+
+
+def test_fallback_tries_tiers_in_order_on_timeouts():
+    log = []
+    chain = FallbackLLM([Tier("fast", TimeoutError("slow"), log), Tier("backup", APIConnectionError(), log),
+                         Tier("steady", log=log), Tier("unused", log=log)])
+    chain.stop = ["Observation:"]
+    assert chain.call("Is the Moon 384,400 km away?") == "steady"
+    assert log == [("fast", ["Observation:"]), ("backup", ["Observation:"]), ("steady", ["Observation:"])]
+    assert chain.fallbacks_used == 2
+
+
+def test_fallback_raises_errors_that_another_tier_would_repeat():
+    log = []
+    chain = FallbackLLM([Tier("fast", ValueError("context length exceeded"), log), Tier("backup", log=log)])
+    with pytest.raises(ValueError):
+        chain.call("Is the Moon 384,400 km away?")
+    assert [model for model, _ in log] == ["fast"]
+
+
+def test_the_last_tier_raises_when_every_tier_times_out():
+    chain = FallbackLLM([Tier("fast", TimeoutError("slow")), Tier("backup", TimeoutError("slower"))])
+    with pytest.raises(TimeoutError, match="slower"):
+        chain.call("Is the Moon 384,400 km away?")
+
+
+def test_only_the_last_tier_keeps_client_retries():
+    chain = build_llm({"llm": "gpt-4o", "fallback_llms": ["gpt-4o-mini", "gpt-3.5-turbo"], "llm_timeout": 20})
+    assert [tier.model for tier in chain.chain] == ["gpt-4o", "gpt-4o-mini", "gpt-3.5-turbo"]
+    assert [tier.additional_params.get("max_retries") for tier in chain.chain] == [0, 0, None]
+    assert all(tier.timeout == 20 for tier in chain.chain)
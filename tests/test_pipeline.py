@@ -0,0 +1,82 @@
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from fact_checker.pipeline import iter_segments, split_segments  # noqa: E402
+
+PAGES = [f"Page {n} says the bridge opened in {1900 + n} and cost {n} million." * 20 for n in range(30)]
+
+
+def test_streamed_pages_segment_like_the_joined_text():
+    joined = "\n".join(PAGES)
+    assert list(iter_segments(PAGES, size=2000, overlap=200)) == split_segments(joined, size=2000, overlap=200)
+
+
+def test_words_at_page_edges_stay_apart():
+    assert list(iter_segments(["ends with word", "starts next page"])) == ["ends with word\nstarts next page"]
+
+
+class _Output:
+    def __init__(self, pydantic=None, raw=""):
+        self.pydantic, self.raw = pydantic, raw
+
+    def __str__(self):
+        return self.raw
+
+
+class _Crew:
+    def __init__(self, kickoff):
+        self.kickoff = kickoff
+
+
+class _Checker:
+    """Stands in for FactChecker: extraction returns the segment's first sentence."""
+
+    def __init__(self):
+        self.extracted, self.verified = [], []
+
+    def claim_extraction_crew(self):
+        from fact_checker.models import ClaimList
+
+        def kickoff(inputs):
+            self.extracted.append((inputs["segment_index"], inputs["segment_count"]))
+            return _Output(ClaimList(claims=[inputs["segment"].split(".")[0]]))
+        return _Crew(kickoff)
+
+    def merged_verification_crew(self):
+        def kickoff(inputs):
+            self.verified.append(inputs["claims"])
+            return _Output(raw="report")
+        return _Crew(kickoff)
+
+
+def test_run_chunked_reads_pages_lazily():
+    from fact_checker.pipeline import run_chunked
+
+    checker, read = _Checker(), []
+
+    def pages():
+        for page in PAGES:
+            read.append(page)
+            yield page
+
+    assert str(run_chunked(checker, pages(), max_workers=2, segment_chars=2000, overlap=200)) == "report"
+    assert len(read) == len(PAGES)
+    assert sorted(int(index) for index, _ in checker.extracted) == list(range(1, 21))
+    assert {count for _, count in checker.extracted} == {"several"}
+    assert len(checker.verified) == 1 and checker.verified[0].startswith("1. Page 0 says")
+
+
+def test_run_chunked_without_claims_skips_verification(monkeypatch):
+    from fact_checker.models import ClaimList, FactCheckReport
+    from fact_checker.pipeline import run_chunked
+
+    checker = _Checker()
+    monkeypatch.setattr(checker, "claim_extraction_crew", lambda: _Crew(lambda inputs: _Output(ClaimList())))
+
+    report = run_chunked(checker, PAGES, max_workers=2, segment_chars=2000, overlap=200)
+
+    assert isinstance(report, FactCheckReport) and report.verdicts == []
+    assert "no verifiable claims found" in str(report)
+    assert checker.verified == []
@@ -0,0 +1,37 @@
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from fact_checker.tools.relevance import bm25_scores, select_passages, tokenize  # noqa: E402
+
+FILLER = "The weather in the valley was mild and the harvest went on as usual that season. " * 6
+PAGE = (
+    "Town Herald, 3 May. " + FILLER
+    + "The Golden Gate Bridge is 2,737 metres long and opened in 1937. "
+    + FILLER + "Readers may also like our gardening column. " + FILLER
+)
+
+
+def test_bm25_prefers_documents_with_rarer_query_terms():
+    docs = [tokenize("bridge opened in 1937"), tokenize("bridge traffic"), tokenize("harvest season")]
+    scores = bm25_scores(tokenize("bridge 1937"), docs)
+    assert scores[0] > scores[1] > scores[2] == 0
+
+
+def test_numbers_are_kept_whole():
+    assert tokenize("It is 2,737.5 metres, not 330.") == ["2,737.5", "metres", "not", "330"]
+
+
+def test_the_relevant_passage_survives_a_tight_budget():
+    text = select_passages(PAGE, "How long is the Golden Gate Bridge?", budget=600)
+    assert "2,737 metres" in text
+    assert len(text) <= 600 + 10 and "..." in text
+
+
+def test_an_unrelated_claim_falls_back_to_the_page_start():
+    assert select_passages(PAGE, "zeppelin", budget=100) == PAGE[:100] + "..."
+
+
+def test_short_pages_are_returned_whole():
+    assert select_passages("Short page.", "anything", budget=100) == "Short page."
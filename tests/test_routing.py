@@ -0,0 +1,57 @@
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from fact_checker.routing import TEXT, URL, YOUTUBE, classify, route  # noqa: E402
+from fact_checker.tools.transcript_index import TranscriptIndex  # noqa: E402
+from fact_checker.tools.web_scraping_tool import ScrapeResult  # noqa: E402
+
+
+class Transcripts:
+    def __init__(self):
+        self.requested = []
+
+    def get_index(self, video_id):
+        self.requested.append(video_id)
+        return TranscriptIndex([{"text": "The tower is 330 metres tall.", "start": 0.0, "duration": 4.0}])
+
+
+class Pages:
+    def __init__(self, error=None):
+        self.error, self.requested = error, []
+
+    def scrape(self, url):
+        self.requested.append(url)
+        return ScrapeResult(url=url, error=self.error) if self.error else ScrapeResult(url=url, text="Page text")
+
+
+def test_only_input_that_is_a_link_is_routed():
+    assert classify(" https://youtu.be/dQw4w9WgXcQ ") == (YOUTUBE, "dQw4w9WgXcQ")
+    assert classify("https://www.youtube.com/watch?v=dQw4w9WgXcQ&t=42") == (YOUTUBE, "dQw4w9WgXcQ")
+    assert classify("example.com/news/bridge") == (URL, "https://example.com/news/bridge")
+    assert classify("http://example.com") == (URL, "http://example.com")
+    assert classify("Pi is 3.14") == (TEXT, None)
+    assert classify("3.14") == (TEXT, None)
+    assert classify("See https://example.com for the claim that pi is 3.14") == (TEXT, None)
+
+
+def test_a_video_link_is_fetched_before_the_crew_runs():
+    transcripts, pages = Transcripts(), Pages()
+    routed = route("https://youtu.be/dQw4w9WgXcQ", transcripts, pages)
+    assert transcripts.requested == ["dQw4w9WgXcQ"] and pages.requested == []
+    assert routed.fetched and "330 metres" in routed.text
+    assert routed.as_inputs()["input_content"].startswith("YouTube video transcript ALREADY EXTRACTED")
+
+
+def test_plain_text_is_passed_through_untouched():
+    transcripts, pages = Transcripts(), Pages()
+    routed = route("  The tower is 330 metres tall.\n", transcripts, pages)
+    assert routed.kind == TEXT and routed.render() == "  The tower is 330 metres tall.\n"
+    assert transcripts.requested == [] and pages.requested == []
+
+
+def test_a_failed_fetch_leaves_the_link_to_the_researcher():
+    routed = route("https://example.com/gone", Transcripts(), Pages(error="404 Client Error"))
+    assert not routed.fetched and routed.text == "https://example.com/gone"
+    assert "Automatic extraction failed: 404 Client Error" in routed.render()
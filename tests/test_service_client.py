@@ -0,0 +1,46 @@
+import json
+import os
+import sys
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from fact_checker.service import ServiceClient  # noqa: E402
+
+
+@pytest.fixture
+def server():
+    posts = []
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_POST(self):
+            self.rfile.read(int(self.headers["Content-Length"]))
+            posts.append(self.path)
+            self.send_response(503)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+
+        def log_message(self, *args):
+            pass
+
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=httpd.serve_forever, daemon=True).start()
+    yield f"http://127.0.0.1:{httpd.server_address[1]}", posts
+    httpd.shutdown()
+    httpd.server_close()
+
+
+def test_submit_is_not_replayed_after_a_server_error(server):
+    url, posts = server
+    with pytest.raises(Exception):
+        ServiceClient(url).submit("The Eiffel Tower is 330 metres tall.")
+    assert posts == ["/jobs"]
+
+
+def test_wait_with_no_time_left_raises_timeout(server):
+    url, _ = server
+    with pytest.raises(TimeoutError, match="not polled"):
+        ServiceClient(url).wait("0" * 32, timeout=0)
@@ -0,0 +1,38 @@
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from fact_checker.tools.transcript_index import TranscriptIndex, format_timestamp  # noqa: E402
+
+TOPICS = {3: "the tower is 330 metres tall", 4: "so 330 metres makes the tower tall",
+          40: "in passing the tower came up", 70: "the tower is 330 metres tall again"}
+SEGMENTS = [
+    {"text": TOPICS.get(n, f"small talk number {n}"), "start": 5.0 * n, "duration": 5.0}
+    for n in range(90)
+]
+
+
+def test_search_returns_dense_windows_in_time_order():
+    windows = TranscriptIndex(SEGMENTS).search("how tall is the tower in metres", k=2, window=20)
+    assert [w.start for w in windows] == sorted(w.start for w in windows)
+    assert any("330 metres" in w.text and w.start <= 15.0 < w.end for w in windows)
+    assert all("came up" not in w.text for w in windows)
+
+
+def test_search_respects_the_time_range():
+    windows = TranscriptIndex(SEGMENTS).search("tower metres", k=3, window=10, start=300)
+    assert [w.start for w in windows] == [345.0]
+
+
+def test_time_range_covers_segments_overlapping_it():
+    window = TranscriptIndex(SEGMENTS).time_range(17.0, 25.0)
+    assert (window.start, window.end) == (15.0, 25.0)
+    assert window.text == "the tower is 330 metres tall so 330 metres makes the tower tall"
+
+
+def test_windows_cover_the_whole_transcript_once():
+    index = TranscriptIndex(list(reversed(SEGMENTS)))
+    windows = index.windows(60)
+    assert " ".join(w.text for w in windows) == index.text.strip()
+    assert windows[1].render().startswith(f"[{format_timestamp(60)}-")
@@ -0,0 +1,56 @@
+import os
+import sys
+import threading
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from fact_checker.embeddings import Embedder  # noqa: E402
+from fact_checker.tools import vector_index as module  # noqa: E402
+from fact_checker.tools.vector_index import VectorIndex  # noqa: E402
+
+
+class Precomputed(Embedder):
+    name, dim = "synthetic-32", 32
+
+
+class CaughtUp:
+    """Evidence index with nothing left to embed."""
+
+    def passages_after(self, passage_id, limit):
+        return []
+
+
+def unit_rows(gen, count):
+    rows = gen.standard_normal((count, 32)).astype(np.float32)
+    return rows / np.linalg.norm(rows, axis=1, keepdims=True)
+
+
+def test_training_leaves_searches_and_appends_unblocked(tmp_path, monkeypatch):
+    gen = np.random.default_rng(0)
+    index = VectorIndex(tmp_path, embedder=Precomputed(), evidence=CaughtUp(), ivf_min_rows=400)
+    first = unit_rows(gen, 500)
+    late = unit_rows(gen, 20)
+    kmeans, during = module._kmeans, {}
+
+    def kmeans_with_traffic(*args, **kwargs):
+        # Runs on another thread, as agents' searches would; it must not wait for training.
+        def traffic():
+            during["nearest"] = index.nearest(first[7], k=1, nprobe=0)[0].tolist()
+            during["appended"] = index.append(np.arange(501, 521, dtype=np.int64), late)
+        worker = threading.Thread(target=traffic)
+        worker.start()
+        worker.join(timeout=10)
+        during["blocked"] = worker.is_alive()
+        return kmeans(*args, **kwargs)
+
+    monkeypatch.setattr(module, "_kmeans", kmeans_with_traffic)
+    index.append(np.arange(1, 501, dtype=np.int64), first)
+    index.sync()  # the background thread's call: training is due
+
+    assert during == {"nearest": [8], "appended": 20, "blocked": False}
+    assert index.stats()["ivf_lists"] > 0 and index.meta["ivf_rows"] == 500
+    assert (np.asarray(index.lists[:520]) >= 0).all()
+    assert index.nearest(late[3], k=1)[0].tolist() == [504]
+    assert index.nearest(first[42], k=1)[0].tolist() == [43]
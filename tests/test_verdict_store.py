@@ -0,0 +1,49 @@
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from fact_checker.verdict_store import CLAIM_VERDICT, REPORT, VerdictStore  # noqa: E402
+
+
+def test_entries_are_recalled_only_by_their_own_kind(tmp_path):
+    store = VerdictStore(tmp_path / "verdicts.sqlite3")
+    store.add("The Eiffel Tower is 330 metres tall.", '{"verdict": "TRUE"}', CLAIM_VERDICT)
+    assert store.lookup("the eiffel tower is 330 metres tall", REPORT) is None
+    assert store.lookup("the eiffel tower is 330 metres tall", CLAIM_VERDICT).verdict == '{"verdict": "TRUE"}'
+
+    store.add("The Eiffel Tower is 330 metres tall.", "## Report\nTRUE", REPORT)
+    reopened = VerdictStore(tmp_path / "verdicts.sqlite3")
+    assert reopened.lookup("The Eiffel Tower is 330 metres tall", REPORT).verdict == "## Report\nTRUE"
+
+
+def test_every_neighbour_within_max_distance_is_found(tmp_path):
+    from fact_checker.verdict_store import MAX_DISTANCE
+
+    store = VerdictStore(tmp_path / "verdicts.sqlite3", max_distance=7)
+    fingerprint = 0x0123456789ABCDEF
+    store.index.add(1, fingerprint, 0, 0.0)
+    store.index.merge()
+    # One flipped bit in each of seven of the eight bands.
+    flipped = fingerprint
+    for band in range(7):
+        flipped ^= 1 << (band * 8)
+    assert store.index.nearest(flipped, 0, store.max_distance, 0.0) == (1, 7)
+    assert VerdictStore(tmp_path / "other.sqlite3", max_distance=40).max_distance == MAX_DISTANCE
+
+
+def test_expired_and_surplus_rows_are_dropped(tmp_path):
+    path = tmp_path / "verdicts.sqlite3"
+    store = VerdictStore(path, max_rows=10)
+    for n in range(12):
+        store.add(f"The bridge opened in {1900 + n}.", "TRUE", REPORT)
+    assert len(store) == 10
+    assert store.lookup("The bridge opened in 1911.", REPORT) is not None
+
+    conn = store._connect()
+    with conn:
+        conn.execute("UPDATE verdicts SET stored_at = stored_at - 7200 WHERE claim LIKE '%1911%'")
+    reopened = VerdictStore(path, ttl=3600, max_rows=10)
+    assert len(reopened) == 9
+    assert reopened.lookup("The bridge opened in 1911.", REPORT) is None
+    assert reopened.lookup("The bridge opened in 1910.", REPORT) is not None
@@ -0,0 +1,63 @@
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from fact_checker.tools import web_scraping_tool  # noqa: E402
+from fact_checker.tools.web_scraping_tool import WebScrapingTool  # noqa: E402
+
+PAGE = b"<html><body><nav>Menu</nav><p>The bridge opened in 1932.</p></body></html>"
+
+
+class Response:
+    status_code = 200
+    headers = {"Content-Type": "text/html; charset=utf-8"}
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def raise_for_status(self):
+        pass
+
+    def iter_content(self, chunk_size):
+        yield PAGE
+
+
+class Session:
+    def __init__(self):
+        self.requests = []
+
+    def get(self, url, **kwargs):
+        self.requests.append(url)
+        return Response()
+
+
+def fake_session(monkeypatch):
+    session = Session()
+    monkeypatch.setattr(web_scraping_tool, "get_session", lambda: session)
+    monkeypatch.setattr(web_scraping_tool, "remember", lambda url, text: None)
+    return session
+
+
+def test_each_backend_has_its_own_cache_entries(cache_dir, monkeypatch):
+    session = fake_session(monkeypatch)
+    url = "https://example.com/bridge"
+
+    for backend in ("soup", "stream", "soup", "stream"):
+        assert "1932" in WebScrapingTool(backend=backend).scrape(url).text
+
+    assert session.requests == [url, url]
+
+
+def test_an_unavailable_backend_is_reported_once(cache_dir, monkeypatch, capsys):
+    fake_session(monkeypatch)
+    monkeypatch.setattr(web_scraping_tool, "_unavailable_backends", set())
+    tool = WebScrapingTool(backend="missing", use_cache=False)
+
+    for _ in range(3):
+        assert "1932" in tool.scrape("https://example.com/bridge").text
+
+    assert capsys.readouterr().out.count("Extraction backend 'missing' unavailable") == 1
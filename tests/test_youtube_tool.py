@@ -0,0 +1,37 @@
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from fact_checker.tools import youtube_tool  # noqa: E402
+from fact_checker.tools.youtube_tool import YouTubeTranscriptTool  # noqa: E402
+
+SEGMENTS = [{"text": f"In {2000 + n} the tower grew by {n} metres.", "start": 10.0 * n, "duration": 10.0}
+            for n in range(12)]
+
+
+def test_a_fetched_transcript_is_indexed_once_and_remembered_once(cache_dir, monkeypatch):
+    built, remembered, fetches = [], [], []
+
+    class CountingIndex(youtube_tool.TranscriptIndex):
+        def __init__(self, segments):
+            built.append(len(segments))
+            super().__init__(segments)
+
+    monkeypatch.setattr(youtube_tool, "TranscriptIndex", CountingIndex)
+    monkeypatch.setattr(youtube_tool, "remember", lambda url, text, source, passages: remembered.append(passages))
+    monkeypatch.setattr(youtube_tool, "_indexes", youtube_tool.OrderedDict())
+    monkeypatch.setattr(YouTubeTranscriptTool, "_fetch", lambda self, video_id: fetches.append(video_id) or (SEGMENTS, "en"))
+
+    tool = YouTubeTranscriptTool()
+    assert len(tool.get_index("abc123")) == 12
+    assert built == [12] and fetches == ["abc123"]
+    assert len(remembered) == 1 and remembered[0][0].startswith("[0:00:00")
+
+    youtube_tool._indexes.clear()
+    tool.get_index("abc123")  # from the transcript cache: not remembered again
+    assert fetches == ["abc123"] and len(remembered) == 1
+
+
+def test_fetch_locks_do_not_grow_with_videos():
+    assert len(youtube_tool._fetch_locks) == 64